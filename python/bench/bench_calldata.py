@@ -0,0 +1,85 @@
+# standard imports
+import sys
+import timeit
+import logging
+
+# external imports
+from chainlib.eth.contract import (
+    ABIContractEncoder,
+    ABIContractType,
+)
+
+# local imports
+from evm_tokenvote.calldata import encode
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+
+
+def abi_propose():
+    enc = ABIContractEncoder()
+    enc.method('propose')
+    enc.typ(ABIContractType.BYTES32)
+    enc.typ(ABIContractType.UINT256)
+    enc.typ_literal('uint24')
+    enc.bytes32(hash_of_foo)
+    enc.uint256(100)
+    enc.uintn(500000, 24)
+    return enc.get()
+
+
+def abi_vote_option():
+    enc = ABIContractEncoder()
+    enc.method('voteOption')
+    enc.typ(ABIContractType.UINT256)
+    enc.typ(ABIContractType.UINT256)
+    enc.uint256(2)
+    enc.uint256(1000)
+    return enc.get()
+
+
+def abi_finalize():
+    enc = ABIContractEncoder()
+    enc.method('finalize')
+    return enc.get()
+
+
+def template_propose():
+    return encode('propose(bytes32,uint256,uint24)', hash_of_foo, 100, 500000)
+
+
+def template_vote_option():
+    return encode('voteOption(uint256,uint256)', 2, 1000)
+
+
+def template_finalize():
+    return encode('finalize()')
+
+
+def bench(count=10000):
+    r = []
+    cases = [
+        ('propose', abi_propose, template_propose),
+        ('voteOption', abi_vote_option, template_vote_option),
+        ('finalize', abi_finalize, template_finalize),
+            ]
+    for (name, ref, fast) in cases:
+        assert ref() == fast()
+        t_ref = timeit.timeit(ref, number=count)
+        t_fast = timeit.timeit(fast, number=count)
+        r.append((name, count / t_ref, count / t_fast,))
+    return r
+
+
+def main():
+    count = 10000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    for (name, ops_ref, ops_fast) in bench(count):
+        print('{}\tencoder {:.0f} ops/s\ttemplate {:.0f} ops/s\tspeedup {:.1f}x'.format(name, ops_ref, ops_fast, ops_fast / ops_ref))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# standard imports
+import sys
+import time
+import logging
+
+# local imports
+from evm_tokenvote import Voter
+from evm_tokenvote.decode import (
+    decode_proposal,
+    decode_proposals,
+)
+from evm_tokenvote.unittest.encode import encode_proposal
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+
+
+def sample_proposal(option_count):
+    return encode_proposal(hash_of_foo, options=[hash_of_foo] * option_count, option_votes=list(range(option_count)), supply=10**24, total=10**22, block_deadline=1000, target_vote_ppm=500000, state=1)
+
+
+def bench(count=1000, option_count=10):
+    vs = [sample_proposal(option_count)] * count
+
+    t = time.perf_counter()
+    for v in vs:
+        Voter.parse_proposal(v)
+    t_ref = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for v in vs:
+        decode_proposal(v)
+    t_fast = time.perf_counter() - t
+
+    bs = [bytes.fromhex(v[2:]) for v in vs]
+    t = time.perf_counter()
+    decode_proposals(bs, serial=0)
+    t_batch = time.perf_counter() - t
+
+    return (count / t_ref, count / t_fast, count / t_batch,)
+
+
+def main():
+    count = 1000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    for option_count in [0, 10, 100]:
+        (ops_ref, ops_fast, ops_batch) = bench(count, option_count)
+        print('options {}\tparse_proposal {:.0f} ops/s\tdecode_proposal {:.0f} ops/s\tdecode_proposals (bytes) {:.0f} ops/s\tspeedup {:.1f}x'.format(option_count, ops_ref, ops_fast, ops_batch, ops_batch / ops_ref))
+
+
+if __name__ == '__main__':
+    main()
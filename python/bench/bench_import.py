@@ -0,0 +1,41 @@
+# standard imports
+import sys
+import time
+import subprocess
+
+cases = [
+    ('package', 'import evm_tokenvote'),
+    ('ProposalState', 'from evm_tokenvote import ProposalState'),
+    ('bytecode', 'import evm_tokenvote; evm_tokenvote.bytecode()'),
+    ('Voter', 'from evm_tokenvote import Voter'),
+    ('encode', 'from evm_tokenvote.calldata import encode; encode("vote(uint256)", 1)'),
+        ]
+
+
+def bench(count=20):
+    r = []
+    t_base = run('pass', count)
+    for (name, code) in cases:
+        r.append((name, run(code, count) - t_base,))
+    return (t_base, r,)
+
+
+def run(code, count):
+    t = time.perf_counter()
+    for i in range(count):
+        subprocess.run([sys.executable, '-c', code], check=True)
+    return (time.perf_counter() - t) / count
+
+
+def main():
+    count = 20
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    (t_base, r) = bench(count)
+    print('interpreter startup {:.1f} ms'.format(t_base * 1000))
+    for (name, t) in r:
+        print('{}\t{:.1f} ms'.format(name, t * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# standard imports
+import sys
+import json
+import time
+import logging
+import argparse
+
+# external imports
+from chainlib.eth.nonce import RPCNonceOracle
+from eth_erc20 import ERC20
+
+# local imports
+from evm_tokenvote import Voter
+from evm_tokenvote.decode import decode_proposal
+from evm_tokenvote.stream import iterate_options
+from evm_tokenvote.unittest.gas import TestEvmVoteGas
+from evm_tokenvote.unittest.base import hash_of_foo
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+
+def int_list(v):
+    return [int(x) for x in v.split(',')]
+
+
+class GasCase(TestEvmVoteGas):
+
+    def runTest(self):
+        pass
+
+
+def option_descriptions(count):
+    return [(i + 1).to_bytes(32, 'big').hex() for i in range(count)]
+
+
+def timed(fn, count):
+    t = time.time()
+    for i in range(count):
+        fn()
+    return (time.time() - t) / count
+
+
+# Proposals with large option sets are created with proposeMulti and addOptions in chunks that fit in a block.
+# Gas of a vote should not depend on the number of options, nor on the index of the option voted for.
+# Reads compare getProposal, which returns all options at once, to the paginated option iterator.
+def bench_options(t, option_count, chunk_size, page_size, rounds, value=1000):
+    voter_address = t.publish_voter()
+    voters = t.ensure_voters(2, value)
+    options = option_descriptions(option_count)
+    params = {
+        'options': option_count,
+            }
+
+    nonce_oracle = RPCNonceOracle(t.ivan, conn=t.conn)
+    c = Voter(t.chain_spec, signer=t.signer, nonce_oracle=nonce_oracle)
+    block_wait = int(option_count / chunk_size) + 10
+    t.transact('proposeMulti', c.propose(voter_address, t.ivan, hash_of_foo, block_wait, options=options[:chunk_size]), **params)
+    for i in range(chunk_size, option_count, chunk_size):
+        t.transact('addOptions', c.add_options(voter_address, t.ivan, 0, options[i:i+chunk_size]), **params)
+
+    for (i, option) in [(0, 0,), (1, option_count - 1,)]:
+        v = voters[i]
+        nonce_oracle = RPCNonceOracle(v, conn=t.conn)
+        token = ERC20(t.chain_spec, signer=t.signer, nonce_oracle=nonce_oracle)
+        t.transact(None, token.approve(t.address, v, voter_address, value))
+        voter = Voter(t.chain_spec, signer=t.signer, nonce_oracle=nonce_oracle)
+        t.transact('voteOption', voter.vote(voter_address, v, value, option=option), option=option, **params)
+
+    def read_proposal():
+        o = c.get_proposal(voter_address, 0, sender_address=t.accounts[0])
+        decode_proposal(t.rpc.do(o))
+
+    def read_options():
+        for v in iterate_options(t.rpc, t.chain_spec, voter_address, 0, page_size=page_size, sender_address=t.accounts[0]):
+            pass
+
+    def read_page():
+        o = c.get_options(voter_address, 0, 0, page_size, sender_address=t.accounts[0])
+        t.rpc.do(o)
+
+    gas = {}
+    for v in t.gas_profile.records:
+        if v.params.get('options') != option_count:
+            continue
+        k = v.operation
+        if v.operation == 'voteOption':
+            k = 'vote_first' if v.params['option'] == 0 else 'vote_last'
+        gas[k] = gas.get(k, 0) + v.gas
+
+    return {
+        'options': option_count,
+        'create_txs': len(range(0, option_count, chunk_size)),
+        'create_gas': gas.get('proposeMulti', 0) + gas.get('addOptions', 0),
+        'vote_first_gas': gas['vote_first'],
+        'vote_last_gas': gas['vote_last'],
+        'read_proposal_s': timed(read_proposal, rounds),
+        'read_options_s': timed(read_options, rounds),
+        'read_page_s': timed(read_page, rounds),
+            }
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Gas and read latency of Voter contract proposals by number of options')
+    argparser.add_argument('--options', type=int_list, default=[10, 1000, 10000], help='Comma-separated option counts')
+    argparser.add_argument('--chunk', type=int, default=50, help='Options added per transaction')
+    argparser.add_argument('--page', type=int, default=1000, help='Options read per call')
+    argparser.add_argument('--rounds', type=int, default=3, help='Rounds per read measurement')
+    argparser.add_argument('--json', action='store_true', help='Output results as JSON')
+    args = argparser.parse_args(sys.argv[1:])
+
+    t = GasCase('runTest')
+    t.setUp()
+    r = []
+    for v in args.options:
+        r.append(bench_options(t, v, args.chunk, args.page, args.rounds))
+
+    if args.json:
+        print(json.dumps(r))
+        return
+
+    print('options\tcreate txs\tcreate gas\tvote first\tvote last\tgetProposal\toption stream\toption page')
+    for v in r:
+        print('{}\t{}\t{}\t{}\t{}\t{:.4f}s\t{:.4f}s\t{:.4f}s'.format(
+            v['options'],
+            v['create_txs'],
+            v['create_gas'],
+            v['vote_first_gas'],
+            v['vote_last_gas'],
+            v['read_proposal_s'],
+            v['read_options_s'],
+            v['read_page_s'],
+            ))
+
+
+if __name__ == '__main__':
+    main()
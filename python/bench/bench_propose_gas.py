@@ -0,0 +1,68 @@
+# standard imports
+import sys
+import json
+import logging
+import argparse
+
+# local imports
+from evm_tokenvote.unittest.gas import (
+    TestEvmVoteGas,
+    GasProfile,
+)
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+
+def int_list(v):
+    return [int(x) for x in v.split(',')]
+
+
+class GasCase(TestEvmVoteGas):
+
+    def runTest(self):
+        pass
+
+
+def total(profile, operations, option_count):
+    r = 0
+    for v in profile.records:
+        if v.operation in operations and v.params.get('options') == option_count:
+            r += v.gas
+    return r
+
+
+# Compares creating a proposal with propose followed by one addOption per option, to a single proposeMulti.
+def main():
+    argparser = argparse.ArgumentParser(description='Compare gas of proposal creation with per-option transactions and with proposeMulti, by number of options')
+    argparser.add_argument('--options', type=int_list, default=[1, 4, 16, 64], help='Comma-separated option counts')
+    argparser.add_argument('--json', action='store_true', help='Output results as JSON')
+    args = argparser.parse_args(sys.argv[1:])
+
+    t = GasCase('runTest')
+    t.setUp()
+    single = t.profile_sweep(option_counts=args.options)
+    t.gas_profile = GasProfile()
+    multi = t.profile_sweep(option_counts=args.options, multi=True)
+
+    r = []
+    for v in args.options:
+        r.append({
+            'options': v,
+            'per_option': total(single, ['propose', 'addOption'], v),
+            'per_option_txs': v + 1,
+            'multi': total(multi, ['proposeMulti'], v),
+            'multi_txs': 1,
+                })
+
+    if args.json:
+        print(json.dumps(r))
+        return
+
+    print('options\tpropose+addOption\tproposeMulti\tsaved')
+    for v in r:
+        print('{}\t{} ({} txs)\t{}\t{}'.format(v['options'], v['per_option'], v['per_option_txs'], v['multi'], v['per_option'] - v['multi']))
+
+
+if __name__ == '__main__':
+    main()
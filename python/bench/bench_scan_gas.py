@@ -0,0 +1,59 @@
+# standard imports
+import sys
+import json
+import logging
+import argparse
+
+# local imports
+from evm_tokenvote.unittest.gas import TestEvmVoteGas
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+
+def int_list(v):
+    return [int(x) for x in v.split(',')]
+
+
+class GasCase(TestEvmVoteGas):
+
+    def runTest(self):
+        pass
+
+
+# The leading option is tracked on each vote, so the vote carries a constant overhead and scan is a single call.
+# This shows both sides of that trade-off as the number of options grows.
+def main():
+    argparser = argparse.ArgumentParser(description='Compare gas of votes and scan of Voter contract by number of options')
+    argparser.add_argument('--options', type=int_list, default=[1, 4, 16, 64], help='Comma-separated option counts')
+    argparser.add_argument('--voters', type=int, default=4, help='Number of voters per round')
+    argparser.add_argument('--json', action='store_true', help='Output results as JSON')
+    args = argparser.parse_args(sys.argv[1:])
+
+    t = GasCase('runTest')
+    t.setUp()
+    profile = t.profile_sweep(option_counts=args.options, voter_counts=[args.voters])
+
+    vote = dict(profile.curve('voteOption', 'options', voters=args.voters))
+    scan = dict(profile.curve('scan', 'options', voters=args.voters))
+    r = []
+    for v in args.options:
+        r.append({
+            'options': v,
+            'voters': args.voters,
+            'vote': vote[v],
+            'scan': scan[v],
+            'round': (vote[v] * args.voters) + scan[v],
+                })
+
+    if args.json:
+        print(json.dumps(r))
+        return
+
+    print('options\tvote\tscan\tvotes+scan')
+    for v in r:
+        print('{}\t{}\t{}\t{}'.format(v['options'], v['vote'], v['scan'], v['round']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+# standard imports
+import sys
+import os
+import json
+import time
+import timeit
+import platform
+import logging
+import argparse
+
+# local imports
+from evm_tokenvote import Voter
+from evm_tokenvote.calldata import (
+    encode,
+    templates,
+)
+from evm_tokenvote.decode import decode_proposal
+from evm_tokenvote.unittest.encode import encode_proposal
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+hash_of_bar = 'fcde2b2edba56bf408601fb721fe9b5c338d10ee429ea04fae5511b68fbf8fb9'
+some_address = '185cbce7650ff7ad3b587e26b2877d95568805e3'
+
+sample_values = {
+    'bytes32': hash_of_foo,
+    'address': some_address,
+    'bool': True,
+        }
+
+
+def sample_arg(typ):
+    if typ[-2:] == '[]':
+        return [sample_arg(typ[:-2])] * 3
+    if typ[:4] == 'uint':
+        return 42
+    return sample_values[typ]
+
+
+def sample_proposal(option_count):
+    return encode_proposal(hash_of_foo, options=[hash_of_foo] * option_count, option_votes=list(range(option_count)), supply=10**24, total=10**22, block_deadline=1000, target_vote_ppm=500000, state=1)
+
+
+def ops(fn, count):
+    return count / timeit.timeit(fn, number=count)
+
+
+def bench_micro(count=10000):
+    r = {}
+    for (signature, o) in templates().items():
+        args = [sample_arg(typ) for typ in o.types]
+        r['encode ' + signature] = {
+            'ops': ops(lambda: encode(signature, *args), count),
+                }
+    for option_count in [0, 10, 100]:
+        v = sample_proposal(option_count)
+        r['parse_proposal options={}'.format(option_count)] = {
+            'ops': ops(lambda: Voter.parse_proposal(v), int(count / 10)),
+                }
+        r['decode_proposal options={}'.format(option_count)] = {
+            'ops': ops(lambda: decode_proposal(v), int(count / 10)),
+                }
+    return r
+
+
+def setup_case(cls):
+    class Case(cls):
+        def runTest(self):
+            pass
+    o = Case('runTest')
+    o.setUp()
+    return o
+
+
+def bench_mid(count=100):
+    from evm_tokenvote.unittest import TestEvmVoteProposal
+
+    t = setup_case(TestEvmVoteProposal)
+    c = Voter(t.chain_spec)
+    calls = {
+        'getProposal': lambda: c.parse_proposal(t.rpc.do(c.get_proposal(t.voter_address, 0))),
+        'getCurrentProposal': lambda: c.parse_proposal(t.rpc.do(c.current_proposal(t.voter_address))),
+        'optionCount': lambda: int(t.rpc.do(c.option_count(t.voter_address, 0)), 16),
+        'blockWaitLimit': lambda: int(t.rpc.do(c.block_wait_limit(t.voter_address)), 16),
+            }
+    r = {}
+    for (name, fn) in calls.items():
+        r['eth_call ' + name] = {
+            'ops': ops(fn, count),
+                }
+    return r
+
+
+def bench_e2e(voter_count=4, option_count=3):
+    from chainlib.eth.nonce import RPCNonceOracle
+    from chainlib.eth.tx import receipt
+    from eth_erc20 import ERC20
+    from evm_tokenvote.unittest import TestEvmVote
+
+    t = setup_case(TestEvmVote)
+    voters = t.accounts[1:1+voter_count]
+    if len(voters) < voter_count:
+        raise ValueError('only {} accounts available for voting'.format(len(voters)))
+    value = int(t.initial_supply / (voter_count * 2))
+
+    nonce_oracle = RPCNonceOracle(t.accounts[0], conn=t.conn)
+    c = ERC20(t.chain_spec, signer=t.signer, nonce_oracle=nonce_oracle)
+    for v in voters:
+        (tx_hash, o) = c.transfer(t.address, t.accounts[0], v, value)
+        t.rpc.do(o)
+
+    steps = {}
+
+    def step(name, txs):
+        tt = time.perf_counter()
+        gas = []
+        for fn in txs:
+            (tx_hash, o) = fn()
+            t.rpc.do(o)
+            r = t.rpc.do(receipt(tx_hash))
+            if r['status'] != 1:
+                raise RuntimeError('{} transaction {} failed'.format(name, tx_hash))
+            gas.append(r['gas_used'])
+        elapsed = time.perf_counter() - tt
+        steps[name] = {
+            'txs': len(txs),
+            'elapsed': elapsed,
+            'tx_per_second': len(txs) / elapsed,
+            'gas': sum(gas),
+            'gas_per_tx': int(sum(gas) / len(gas)),
+                }
+
+    total = time.perf_counter()
+    proposer = Voter(t.chain_spec, signer=t.signer, nonce_oracle=RPCNonceOracle(t.ivan, conn=t.conn))
+    txs = [lambda: proposer.propose(t.voter_address, t.ivan, hash_of_foo, 100)]
+    for i in range(option_count):
+        txs.append(lambda: proposer.add_option(t.voter_address, t.ivan, 0, hash_of_bar))
+    step('propose', txs)
+
+    txs = []
+    for i, v in enumerate(voters):
+        option = None
+        if option_count > 0:
+            option = i % option_count
+        nonce_oracle = RPCNonceOracle(v, conn=t.conn)
+        token = ERC20(t.chain_spec, signer=t.signer, nonce_oracle=nonce_oracle)
+        voter = Voter(t.chain_spec, signer=t.signer, nonce_oracle=nonce_oracle)
+        txs.append(lambda token=token, v=v: token.approve(t.address, v, t.voter_address, value))
+        txs.append(lambda voter=voter, v=v, option=option: voter.vote(t.voter_address, v, value, option=option))
+    step('vote', txs)
+
+    t.backend.mine_blocks(100)
+    step('scan', [lambda: proposer.scan(t.voter_address, t.ivan, 0, option_count)])
+    step('finalize', [lambda: proposer.finalize_vote(t.voter_address, t.ivan)])
+
+    txs = []
+    for v in voters:
+        voter = Voter(t.chain_spec, signer=t.signer, nonce_oracle=RPCNonceOracle(v, conn=t.conn))
+        txs.append(lambda voter=voter, v=v: voter.withdraw(t.voter_address, v))
+    step('withdraw', txs)
+
+    total = time.perf_counter() - total
+    tx_count = sum([v['txs'] for v in steps.values()])
+    return {
+        'e2e voters={} options={}'.format(voter_count, option_count): {
+            'elapsed': total,
+            'txs': tx_count,
+            'tx_per_second': tx_count / total,
+            'steps': steps,
+                },
+            }
+
+
+def version():
+    try:
+        from importlib.metadata import version
+        return version('evm_tokenvote')
+    except Exception:
+        return None
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Run evm_tokenvote benchmarks, and output results as JSON')
+    argparser.add_argument('-l', '--level', type=str, action='append', choices=['micro', 'mid', 'e2e'], help='Benchmark level to run, may be repeated. Default is all levels.')
+    argparser.add_argument('-n', '--count', type=int, default=10000, help='Iterations for microbenchmarks')
+    argparser.add_argument('--voters', type=int, default=4, help='Number of voters in end-to-end run')
+    argparser.add_argument('--options', type=int, default=3, help='Number of options in end-to-end run')
+    argparser.add_argument('-o', '--output', type=str, help='Write results to file instead of stdout')
+    args = argparser.parse_args(sys.argv[1:])
+
+    levels = args.level
+    if levels == None:
+        levels = ['micro', 'mid', 'e2e']
+
+    results = {}
+    if 'micro' in levels:
+        results['micro'] = bench_micro(args.count)
+    if 'mid' in levels:
+        results['mid'] = bench_mid(max(1, int(args.count / 100)))
+    if 'e2e' in levels:
+        results['e2e'] = bench_e2e(args.voters, args.options)
+
+    o = {
+        'version': version(),
+        'python': platform.python_version(),
+        'time': int(time.time()),
+        'results': results,
+            }
+    s = json.dumps(o, indent=2)
+    if args.output != None:
+        f = open(args.output, 'w')
+        f.write(s)
+        f.close()
+    else:
+        print(s)
+
+
+if __name__ == '__main__':
+    main()
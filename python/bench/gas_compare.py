@@ -0,0 +1,50 @@
+# standard imports
+import sys
+import json
+import argparse
+
+
+def load(path):
+    f = open(path, 'r')
+    o = json.load(f)
+    f.close()
+    r = {}
+    for v in o['records']:
+        v = dict(v)
+        operation = v.pop('operation')
+        gas = v.pop('gas')
+        k = (operation, tuple(sorted(v.items())),)
+        r[k] = max(r.get(k, 0), gas)
+    return r
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Compare two gas profiles written by gas_profile.py --format json, e.g. before and after a contract change')
+    argparser.add_argument('--operation', type=str, action='append', help='Only compare this operation, may be repeated')
+    argparser.add_argument('before', type=str, help='Gas profile before change')
+    argparser.add_argument('after', type=str, help='Gas profile after change')
+    args = argparser.parse_args(sys.argv[1:])
+
+    before = load(args.before)
+    after = load(args.after)
+
+    print('operation\tparams\tbefore\tafter\tdelta\tpercent')
+    for k in sorted(before.keys(), key=str):
+        if k not in after:
+            continue
+        (operation, params) = k
+        if args.operation != None and operation not in args.operation:
+            continue
+        delta = after[k] - before[k]
+        print('{}\t{}\t{}\t{}\t{:+}\t{:+.1f}%'.format(
+            operation,
+            ' '.join(['{}={}'.format(pk, pv) for (pk, pv) in params]),
+            before[k],
+            after[k],
+            delta,
+            (delta * 100) / before[k],
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# standard imports
+import sys
+import logging
+import argparse
+
+# local imports
+from evm_tokenvote.unittest.gas import TestEvmVoteGas
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+
+def int_list(v):
+    return [int(x) for x in v.split(',')]
+
+
+def budget(v):
+    (k, v) = v.split('=', 1)
+    return (k, int(v),)
+
+
+class GasCase(TestEvmVoteGas):
+
+    def runTest(self):
+        pass
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Profile gas usage of Voter contract operations as a function of scale')
+    argparser.add_argument('--options', type=int_list, default=[0, 4, 16], help='Comma-separated option counts')
+    argparser.add_argument('--voters', type=int_list, default=[1, 4, 16], help='Comma-separated voter counts')
+    argparser.add_argument('--registry', action='store_true', help='Also profile with voter and proposer registries')
+    argparser.add_argument('--multi', action='store_true', help='Create proposals with options in a single proposeMulti transaction')
+    argparser.add_argument('--budget', type=budget, action='append', default=[], help='Gas budget for operation, as operation=gas. May be repeated.')
+    argparser.add_argument('--format', type=str, choices=['text', 'json', 'csv'], default='text', help='Output format')
+    args = argparser.parse_args(sys.argv[1:])
+
+    registry = [False]
+    if args.registry:
+        registry.append(True)
+
+    GasCase.budgets = dict(args.budget)
+    t = GasCase('runTest')
+    t.setUp()
+    profile = t.profile_sweep(option_counts=args.options, voter_counts=args.voters, registry=registry, multi=args.multi)
+
+    if args.format == 'json':
+        print(profile.to_json())
+    elif args.format == 'csv':
+        sys.stdout.write(profile.to_csv())
+    else:
+        for operation in profile.operations():
+            for use_registry in registry:
+                for param in ['options', 'voters']:
+                    fixed = {'registry': use_registry}
+                    if param == 'options':
+                        fixed['voters'] = args.voters[0]
+                    else:
+                        fixed['options'] = args.options[0]
+                    curve = profile.curve(operation, param, **fixed)
+                    print('{}\tby {}\t{}\t{}'.format(operation, param, ' '.join(['{}={}'.format(k, v) for (k, v) in fixed.items()]), ' '.join(['{}:{}'.format(x, y) for (x, y) in curve])))
+
+    over = profile.over_budget()
+    for v in over:
+        sys.stderr.write('over budget ({}): {}\n'.format(profile.budgets[v.operation], v))
+    if len(over) > 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,27 @@
-from .voter import Voter
-from .voter import Proposal
-from .voter import ProposalState
-from .voter import bytecode
-from .voter import create
-from .voter import args
+# Submodules are imported on first attribute access, so that callers that only need proposal state or contract artifacts do not pay for loading the transaction machinery.
+import importlib
+
+__lazy = {
+    'Voter': 'voter',
+    'create': 'voter',
+    'args': 'voter',
+    'Proposal': 'proposal',
+    'ProposalState': 'proposal',
+    'bytecode': 'data',
+    'ProposalTable': 'table',
+        }
+
+__all__ = list(__lazy.keys())
+
+
+def __getattr__(k):
+    m = __lazy.get(k)
+    if m == None:
+        raise AttributeError('module {} has no attribute {}'.format(__name__, k))
+    v = getattr(importlib.import_module('.' + m, __name__), k)
+    globals()[k] = v
+    return v
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
@@ -0,0 +1,326 @@
+# standard imports
+import asyncio
+import json
+import base64
+import logging
+import ssl
+from urllib.parse import urlparse
+
+# external imports
+from chainlib.eth.constant import ZERO_ADDRESS
+from chainlib.connection import error_parser
+from chainlib.jsonrpc import (
+    jsonrpc_result,
+    IntSequenceGenerator,
+)
+from chainlib.error import RPCException
+
+# local imports
+from evm_tokenvote.voter import Voter
+
+logg = logging.getLogger(__name__)
+
+
+class AsyncJSONRPCHTTPConnection:
+    """Asyncio JSON-RPC client over HTTP/1.1, keeping a pool of persistent connections.
+
+    Requests issued concurrently, e.g. with asyncio.gather, are collected until the event loop is next idle, and sent together as JSON-RPC batches of at most batch_size requests. At most concurrency HTTP requests are in flight at any time. Each HTTP request uses an idle pooled connection if available, and opens a new one otherwise.
+
+    Pooled connections belong to the event loop they were opened in. If the connection is used from a different event loop, e.g. in a later call to asyncio.run, the pool is started anew.
+
+    :param url: JSON-RPC endpoint
+    :type url: str
+    :param concurrency: Maximum number of concurrent HTTP requests
+    :type concurrency: int
+    :param batch_size: Maximum number of JSON-RPC requests per HTTP request. If 1, requests are not batched.
+    :type batch_size: int
+    :param timeout: Timeout per request, in seconds
+    :type timeout: float
+    :param basic: Basic auth credentials as (user, password)
+    :type basic: tuple
+    :param error_parser: Error parser used to translate error responses
+    :type error_parser: chainlib.jsonrpc.ErrorParser
+    """
+    def __init__(self, url, concurrency=16, batch_size=100, timeout=30.0, basic=None, error_parser=error_parser):
+        if concurrency < 1 or batch_size < 1:
+            raise ValueError('concurrency and batch size must be positive')
+        u = urlparse(url)
+        if u.scheme not in ['http', 'https']:
+            raise ValueError('unsupported scheme {}'.format(u.scheme))
+        self.host = u.hostname
+        self.port = u.port
+        self.ssl = None
+        if u.scheme == 'https':
+            self.ssl = ssl.create_default_context()
+            if self.port == None:
+                self.port = 443
+        elif self.port == None:
+            self.port = 80
+        self.path = u.path
+        if self.path == '':
+            self.path = '/'
+        if u.query != '':
+            self.path += '?' + u.query
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.error_parser = error_parser
+        self.headers = 'Host: {}\r\nContent-Type: application/json\r\nConnection: keep-alive\r\n'.format(u.netloc)
+        if basic != None:
+            v = '{}:{}'.format(basic[0], basic[1]).encode('utf-8')
+            self.headers += 'Authorization: Basic {}\r\n'.format(base64.b64encode(v).decode('utf-8'))
+        self.loop = None
+        self.semaphore = None
+        self.idle = []
+        self.pending = []
+        self.sending = set()
+        self.opened = 0
+
+
+    def __bind(self):
+        loop = asyncio.get_running_loop()
+        if loop != self.loop:
+            if self.loop != None:
+                logg.debug('(async HTTP) event loop changed, dropping {} idle connections'.format(len(self.idle)))
+            # streams and the semaphore can only be used in the loop they were created in.
+            self.loop = loop
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+            self.idle = []
+            self.pending = []
+            self.sending = set()
+        return loop
+
+
+    async def __open(self):
+        if len(self.idle) > 0:
+            return self.idle.pop()
+        self.opened += 1
+        logg.debug('(async HTTP) open connection {} to {}:{}'.format(self.opened, self.host, self.port))
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+
+    async def __request(self, stream, data):
+        (reader, writer) = stream
+        head = 'POST {} HTTP/1.1\r\n{}Content-Length: {}\r\n\r\n'.format(self.path, self.headers, len(data))
+        writer.write(head.encode('ascii') + data)
+        await writer.drain()
+
+        status = await reader.readline()
+        if len(status) == 0:
+            raise ConnectionResetError('connection closed by server')
+        status = status.decode('ascii').split(' ', 2)
+        headers = {}
+        while True:
+            v = await reader.readline()
+            if v in [b'\r\n', b'\n', b'']:
+                break
+            (k, v) = v.decode('latin-1').split(':', 1)
+            headers[k.strip().lower()] = v.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = b''
+            while True:
+                l = int((await reader.readline()).split(b';')[0], 16)
+                if l == 0:
+                    await reader.readline()
+                    break
+                body += await reader.readexactly(l)
+                await reader.readline()
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            headers['connection'] = 'close'
+
+        if int(status[1]) != 200:
+            raise RPCException('HTTP status {} from {}:{}'.format(status[1], self.host, self.port))
+        keep = headers.get('connection', '').lower() != 'close'
+        return (body, keep,)
+
+
+    async def __post(self, data):
+        async with self.semaphore:
+            stream = await self.__open()
+            try:
+                try:
+                    (body, keep) = await asyncio.wait_for(self.__request(stream, data), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    stream[1].close()
+                    # a pooled connection may have been closed by the server while idle.
+                    logg.debug('(async HTTP) retry on new connection after {}'.format(e))
+                    stream = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+                    self.opened += 1
+                    (body, keep) = await asyncio.wait_for(self.__request(stream, data), self.timeout)
+            except BaseException as e:
+                stream[1].close()
+                raise e
+            if keep:
+                self.idle.append(stream)
+            else:
+                stream[1].close()
+        return body
+
+
+    async def __send(self, requests):
+        if len(requests) == 1:
+            data = requests[0][0]
+        else:
+            data = [v[0] for v in requests]
+        logg.debug('(async HTTP) send {} requests'.format(len(requests)))
+        try:
+            body = await self.__post(json.dumps(data).encode('utf-8'))
+            r = json.loads(body)
+        except asyncio.CancelledError as e:
+            for (o, future) in requests:
+                future.cancel()
+            raise e
+        except Exception as e:
+            for (o, future) in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not isinstance(r, list):
+            r = [r]
+        results = {}
+        for v in r:
+            results[v.get('id')] = v
+        for (o, future) in requests:
+            if future.done():
+                continue
+            v = results.get(o['id'])
+            if v == None:
+                future.set_exception(ValueError('RPC id mismatch; sent {} received {}'.format(o['id'], list(results.keys()))))
+                continue
+            try:
+                future.set_result(jsonrpc_result(v, self.error_parser))
+            except Exception as e:
+                future.set_exception(e)
+
+
+    def __dispatch(self, requests):
+        task = self.loop.create_task(self.__send(requests))
+        self.sending.add(task)
+        task.add_done_callback(self.sending.discard)
+
+
+    def __flush(self):
+        pending = self.pending
+        self.pending = []
+        requests = []
+        ids = set()
+        for (o, future) in pending:
+            # ids must be unique within a batch, for responses to be matched to requests.
+            if len(requests) == self.batch_size or o['id'] in ids:
+                self.__dispatch(requests)
+                requests = []
+                ids = set()
+            requests.append((o, future,))
+            ids.add(o['id'])
+        if len(requests) > 0:
+            self.__dispatch(requests)
+
+
+    async def do(self, o):
+        """Execute a single JSON-RPC request.
+
+        The request is sent in a batch with the other requests issued before the event loop is next idle.
+
+        :param o: JSON-RPC request object
+        :type o: dict
+        :raises chainlib.error.RPCException: Request returned an error
+        :raises ValueError: Response id does not match request
+        :rtype: any
+        :returns: Result value
+        """
+        loop = self.__bind()
+        logg.debug('(async HTTP) queue {}'.format(o))
+        future = loop.create_future()
+        if len(self.pending) == 0:
+            loop.call_soon(self.__flush)
+        self.pending.append((o, future,))
+        return await future
+
+
+    async def close(self):
+        if self.loop != asyncio.get_running_loop():
+            self.idle = []
+            return
+        while len(self.idle) > 0:
+            (reader, writer) = self.idle.pop()
+            writer.close()
+            await writer.wait_closed()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+class AsyncVoter:
+    """Asyncio client for Voter contract read methods.
+
+    Requests are built with the evm_tokenvote.Voter encoders, and results parsed with evm_tokenvote.Voter.parse_proposal. Calls may be issued concurrently, e.g. with asyncio.gather, and are then sent in batches by the connection.
+
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param conn: Asynchronous RPC connection
+    :type conn: evm_tokenvote.aio.AsyncJSONRPCHTTPConnection
+    :param sender_address: Sender address for calls
+    :type sender_address: str
+    """
+    def __init__(self, chain_spec, conn, sender_address=ZERO_ADDRESS):
+        self.voter = Voter(chain_spec)
+        self.conn = conn
+        self.sender_address = sender_address
+        self.id_generator = IntSequenceGenerator()
+
+
+    async def get_proposal(self, contract_address, proposal_idx):
+        o = self.voter.get_proposal(contract_address, proposal_idx, sender_address=self.sender_address, id_generator=self.id_generator)
+        r = await self.conn.do(o)
+        return self.voter.parse_proposal(r, serial=proposal_idx)
+
+
+    async def get_proposals(self, contract_address, proposal_idxs):
+        """Get several proposals concurrently.
+
+        :param proposal_idxs: Proposal indices
+        :type proposal_idxs: list of int
+        :rtype: list of evm_tokenvote.Proposal
+        :returns: Proposals, in order of proposal_idxs
+        """
+        return await asyncio.gather(*[self.get_proposal(contract_address, v) for v in proposal_idxs])
+
+
+    async def current_proposal(self, contract_address):
+        o = self.voter.current_proposal(contract_address, sender_address=self.sender_address, id_generator=self.id_generator)
+        r = await self.conn.do(o)
+        return self.voter.parse_proposal(r)
+
+
+    async def proposal_count(self, contract_address):
+        o = self.voter.proposal_count(contract_address, sender_address=self.sender_address, id_generator=self.id_generator)
+        r = await self.conn.do(o)
+        return int(r, 16)
+
+
+    async def option_count(self, contract_address, proposal_idx):
+        o = self.voter.option_count(contract_address, proposal_idx, sender_address=self.sender_address, id_generator=self.id_generator)
+        r = await self.conn.do(o)
+        return int(r, 16)
+
+
+    async def vote_count(self, contract_address, proposal_idx, option_idx=0):
+        o = self.voter.vote_count(contract_address, proposal_idx, option_idx=option_idx, sender_address=self.sender_address, id_generator=self.id_generator)
+        r = await self.conn.do(o)
+        return int(r, 16)
+
+
+    async def block_wait_limit(self, contract_address):
+        o = self.voter.block_wait_limit(contract_address, sender_address=self.sender_address, id_generator=self.id_generator)
+        r = await self.conn.do(o)
+        return int(r, 16)
@@ -0,0 +1,150 @@
+# standard imports
+import ssl
+import json
+import logging
+from urllib.request import (
+    Request,
+    HTTPSHandler,
+    build_opener,
+)
+from urllib.error import URLError
+
+# external imports
+from chainlib.connection import (
+    JSONRPCHTTPConnection,
+    PreemptiveBasicAuthHandler,
+    error_parser,
+)
+from chainlib.jsonrpc import jsonrpc_result
+from chainlib.error import RPCException
+
+logg = logging.getLogger(__name__)
+
+
+class JSONRPCBatch:
+    """Collects JSON-RPC requests to be sent as a single batch.
+
+    Over HTTP connections the batch is sent as one JSON-RPC batch array in a single round trip, with the same host identity verification, auth object and basic auth credentials as the connection itself uses. Other connection types execute the requests one by one.
+
+    Responses are matched to requests by id, so every request added must have a unique id within the batch.
+
+    :param error_parser: Error parser used to translate error responses
+    :type error_parser: chainlib.jsonrpc.ErrorParser
+    """
+    def __init__(self, error_parser=error_parser):
+        self.error_parser = error_parser
+        self.requests = []
+        self.ids = {}
+        self.results = {}
+
+
+    def __len__(self):
+        return len(self.requests)
+
+
+    def add(self, o):
+        """Add a request to the batch.
+
+        :param o: JSON-RPC request object
+        :type o: dict
+        :raises ValueError: Request id already in batch
+        :rtype: str or int
+        :returns: Request id
+        """
+        if o['id'] in self.ids:
+            raise ValueError('duplicate request id {} in batch'.format(o['id']))
+        self.ids[o['id']] = len(self.requests)
+        self.requests.append(o)
+        return o['id']
+
+
+    def do(self, conn):
+        """Execute all requests in the batch.
+
+        Results for individual requests are retrieved with result().
+
+        :param conn: RPC connection
+        :type conn: chainlib.connection.RPCConnection
+        :raises ValueError: Response is missing or has unknown id
+        :rtype: int
+        :returns: Number of requests executed
+        """
+        if len(self.requests) == 0:
+            return 0
+        if isinstance(conn, JSONRPCHTTPConnection):
+            self.__do_http(conn)
+        else:
+            for o in self.requests:
+                try:
+                    self.results[o['id']] = conn.do(o)
+                except RPCException as e:
+                    self.results[o['id']] = e
+        return len(self.requests)
+
+
+    # chainlib.connection.JSONRPCHTTPConnection.do only accepts a single request and response, so the request is set up here in the same way.
+    def __do_http(self, conn):
+        handlers = []
+        if not conn.verify_identity:
+            ssl_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            ssl_ctx.check_hostname = False
+            ssl_ctx.verify_mode = ssl.CERT_NONE
+            handlers.append(HTTPSHandler(context=ssl_ctx))
+        if conn.basic != None:
+            handler = PreemptiveBasicAuthHandler()
+            handler.add_password(
+                    realm=None,
+                    uri=conn.location,
+                    user=conn.basic[0],
+                    passwd=conn.basic[1],
+                    )
+            handlers.append(handler)
+        opener = build_opener(*handlers)
+
+        req = Request(
+                conn.location,
+                method='POST',
+                )
+        req.add_header('Content-Type', 'application/json')
+        if conn.auth != None:
+            p = conn.auth.urllib_header()
+            req.add_header(p[0], p[1])
+        data = json.dumps(self.requests)
+        logg.debug('(HTTP) send batch of {}'.format(len(self.requests)))
+
+        try:
+            r = opener.open(
+                req,
+                data=data.encode('utf-8'),
+                timeout=conn.timeout,
+                )
+        except URLError as e:
+            raise RPCException(e)
+
+        result = json.loads(r.read())
+        if not isinstance(result, list):
+            result = [result]
+        for v in result:
+            if v.get('id') not in self.ids:
+                raise ValueError('RPC id mismatch; unknown id {} in batch response'.format(v.get('id')))
+            try:
+                self.results[v['id']] = jsonrpc_result(v, self.error_parser)
+            except RPCException as e:
+                self.results[v['id']] = e
+        if len(self.results) != len(self.requests):
+            raise ValueError('RPC batch response incomplete; sent {} received {}'.format(len(self.requests), len(self.results)))
+
+
+    def result(self, request_id):
+        """Get the result of a request in an executed batch.
+
+        :param request_id: Request id
+        :type request_id: str or int
+        :raises chainlib.error.RPCException: The request returned an error
+        :rtype: any
+        :returns: Result value
+        """
+        r = self.results[request_id]
+        if isinstance(r, Exception):
+            raise r
+        return r
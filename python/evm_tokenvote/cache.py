@@ -0,0 +1,255 @@
+# standard imports
+import logging
+import sqlite3
+import time
+import collections
+
+# external imports
+from chainlib.eth.block import block_latest
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.proposal import ProposalState
+from evm_tokenvote.calldata import template
+from evm_tokenvote.decode import (
+    to_buffer,
+    word,
+)
+
+logg = logging.getLogger(__name__)
+
+
+def block_height(v):
+    """Parse the block parameter of a call as a block height.
+
+    :param v: Block parameter
+    :type v: str
+    :rtype: int
+    :returns: Block height, or None if the parameter is a block tag or a block hash object
+    """
+    if not isinstance(v, str):
+        return None
+    try:
+        return int(strip_0x(v), 16)
+    except ValueError:
+        return None
+
+
+def proposal_is_immutable(v):
+    """Check whether a getProposal response can no longer change.
+
+    A proposal is immutable once it is finalized and its votes are scanned. Finalization alone is not enough, since scan may still be called after finalization, and sets the scanned flag in the response.
+
+    :param v: getProposal response
+    :type v: str
+    :rtype: bool
+    """
+    b = to_buffer(v)
+    state = word(b, word(b, 0) + 288)
+    final = ProposalState.FINAL | ProposalState.SCANNED
+    return state & final == final
+
+
+class ReadCache:
+    """Cache for immutable contract call results, with LRU eviction in memory and an optional sqlite disk tier.
+
+    Entries are keyed on contract address, call data and block height. An entry stored without a block height is valid for any height at or above the block it was read at.
+
+    :param size: Maximum number of entries kept in memory
+    :type size: int
+    :param path: Path to sqlite database. If not set, entries are only kept in memory.
+    :type path: str
+    """
+    def __init__(self, size=4096, path=None):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.db = None
+        if path != None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("""
+CREATE TABLE IF NOT EXISTS call_cache (
+    contract TEXT NOT NULL,
+    data TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    since INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (contract, data, height)
+)""")
+            self.db.commit()
+        self.hits = 0
+        self.misses = 0
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    def __memory_get(self, k):
+        v = self.entries.get(k)
+        if v != None:
+            self.entries.move_to_end(k)
+        return v
+
+
+    def __memory_put(self, k, v):
+        self.entries[k] = v
+        self.entries.move_to_end(k)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+    def __get(self, k):
+        v = self.__memory_get(k)
+        if v == None and self.db != None:
+            r = self.db.execute('SELECT since, result FROM call_cache WHERE contract = ? AND data = ? AND height = ?', k).fetchone()
+            if r != None:
+                v = (r[0], r[1],)
+                self.__memory_put(k, v)
+        return v
+
+
+    def get(self, contract_address, data, height=None):
+        """Get a cached call result.
+
+        :param contract_address: Contract address
+        :type contract_address: str
+        :param data: Call data
+        :type data: str
+        :param height: Block height of the call, or None for latest
+        :type height: int
+        :rtype: str
+        :returns: Call result, or None if not in cache
+        """
+        contract_address = strip_0x(contract_address).lower()
+        data = strip_0x(data).lower()
+        v = None
+        if height != None:
+            v = self.__get((contract_address, data, height,))
+        if v == None:
+            v = self.__get((contract_address, data, -1,))
+            if v != None and height != None and height < v[0]:
+                v = None
+        if v == None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return v[1]
+
+
+    def put(self, contract_address, data, result, height=None, since=0):
+        """Add a call result to the cache.
+
+        :param contract_address: Contract address
+        :type contract_address: str
+        :param data: Call data
+        :type data: str
+        :param result: Call result
+        :type result: str
+        :param height: Block height the result is valid for. If None, the result is valid for all heights from since.
+        :type height: int
+        :param since: Lowest block height the result is valid for, if height is None
+        :type since: int
+        """
+        contract_address = strip_0x(contract_address).lower()
+        data = strip_0x(data).lower()
+        if height == None:
+            k = (contract_address, data, -1,)
+        else:
+            k = (contract_address, data, height,)
+            since = height
+        self.__memory_put(k, (since, result,))
+        if self.db != None:
+            with self.db:
+                self.db.execute('INSERT OR REPLACE INTO call_cache VALUES (?, ?, ?, ?, ?)', k + (since, result,))
+
+
+    def close(self):
+        if self.db != None:
+            self.db.close()
+
+
+class CachedRPCConnection:
+    """Wraps an RPC connection, serving immutable contract call results from a evm_tokenvote.cache.ReadCache.
+
+    A call result is immutable if either:
+
+    - the call is pinned to a block at least confirmations blocks below the current head, or
+    - the result is recognized as final by the predicate registered for the call's method selector. By default, getProposal results for finalized and scanned proposals are final.
+
+    Calls that are not immutable, and all other requests, are passed through to the wrapped connection. So are calls made at a block tag other than latest, like pending or finalized.
+
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param cache: Call result cache
+    :type cache: evm_tokenvote.cache.ReadCache
+    :param confirmations: Number of blocks below head a block is considered immutable
+    :type confirmations: int
+    :param head_ttl: Number of seconds to reuse a queried head block height
+    :type head_ttl: float
+    """
+    def __init__(self, conn, cache=None, confirmations=12, head_ttl=1.0):
+        self.conn = conn
+        self.cache = cache
+        if self.cache == None:
+            self.cache = ReadCache()
+        self.confirmations = confirmations
+        self.head_ttl = head_ttl
+        self.head_height = None
+        self.head_time = 0
+        self.final = {
+            template('getProposal(uint256)').selector: proposal_is_immutable,
+                }
+
+
+    def add_final(self, signature, fn):
+        """Register a predicate recognizing final results of a contract method.
+
+        :param signature: Method signature, e.g. "getProposal(uint256)"
+        :type signature: str
+        :param fn: Predicate receiving the call result
+        :type fn: function
+        """
+        self.final[template(signature).selector] = fn
+
+
+    def head(self, refresh=False):
+        now = time.monotonic()
+        if refresh or self.head_height == None or now - self.head_time > self.head_ttl:
+            r = self.conn.do(block_latest())
+            if isinstance(r, str):
+                r = int(strip_0x(r), 16)
+            self.head_height = r
+            self.head_time = now
+        return self.head_height
+
+
+    def do(self, o, *args, **kwargs):
+        if o['method'] != 'eth_call':
+            return self.conn.do(o, *args, **kwargs)
+
+        tx = o['params'][0]
+        height = None
+        if len(o['params']) > 1:
+            v = o['params'][1]
+            if v != 'latest':
+                height = block_height(v)
+                if height == None:
+                    return self.conn.do(o, *args, **kwargs)
+        r = self.cache.get(tx['to'], tx['data'], height=height)
+        if r != None:
+            return r
+
+        r = self.conn.do(o, *args, **kwargs)
+
+        if height != None and height <= self.head() - self.confirmations:
+            self.cache.put(tx['to'], tx['data'], r, height=height)
+            return r
+
+        fn = self.final.get(strip_0x(tx['data'])[:8])
+        if fn != None and fn(r):
+            since = height
+            if since == None:
+                # the call was executed at or below the current head, so the result is valid from there on.
+                since = self.head(refresh=True)
+            self.cache.put(tx['to'], tx['data'], r, since=since)
+        return r
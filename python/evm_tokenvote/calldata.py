@@ -0,0 +1,219 @@
+# standard imports
+import re
+import sys
+import logging
+
+# external imports
+from hexathon import strip_0x
+from chainlib.hash import keccak256_string_to_hex
+
+# local imports
+from evm_tokenvote.data import abi as data_abi
+
+logg = logging.getLogger(__name__)
+
+re_signature = r'^([a-zA-Z0-9_]+)\((.*)\)$'
+
+__templates = None
+
+
+def pack_uint(v):
+    return int(v).to_bytes(32, 'big').hex()
+
+
+def pack_bool(v):
+    if bool(v):
+        return '0' * 63 + '1'
+    return '0' * 64
+
+
+def pack_bytes32(v):
+    if isinstance(v, bytes):
+        if len(v) > 32:
+            raise ValueError('value too long ({})'.format(len(v)))
+        return v.rjust(32, b'\x00').hex()
+    v = strip_0x(v)
+    if len(v) > 64:
+        raise ValueError('value too long ({})'.format(len(v)))
+    return v.rjust(64, '0')
+
+
+def pack_address(v):
+    v = strip_0x(v)
+    if len(v) != 40:
+        raise ValueError('value wrong size; expected 40, got {}'.format(len(v)))
+    return v.rjust(64, '0')
+
+
+def packer(typ):
+    if typ[:4] == 'uint':
+        return pack_uint
+    elif typ == 'bytes32':
+        return pack_bytes32
+    elif typ == 'address':
+        return pack_address
+    elif typ == 'bool':
+        return pack_bool
+    raise NotImplementedError('no calldata packer for type {}'.format(typ))
+
+
+class CalldataTemplate:
+    """Precomputed method selector and argument packers for a single contract method.
+
+    Only static types, and dynamic arrays of static types, are supported.
+
+    :param name: Method name
+    :type name: str
+    :param types: Solidity argument types
+    :type types: list of str
+    :param selector: Precomputed method selector, in hex. If not set, it is calculated from the signature.
+    :type selector: str
+    """
+    def __init__(self, name, types, selector=None):
+        self.name = name
+        self.types = types
+        self.signature = '{}({})'.format(name, ','.join(types))
+        self.selector = selector
+        if self.selector == None:
+            self.selector = keccak256_string_to_hex(self.signature)[:8]
+        self.packers = []
+        self.arrays = []
+        for typ in types:
+            if typ[-2:] == '[]':
+                self.packers.append(packer(typ[:-2]))
+                self.arrays.append(True)
+            else:
+                self.packers.append(packer(typ))
+                self.arrays.append(False)
+        self.dynamic = True in self.arrays
+        self.head_size = len(types) * 32
+
+
+    def encode(self, *args):
+        """Encode call arguments.
+
+        :rtype: str
+        :returns: Method selector followed by ABI encoded arguments, in hex
+        """
+        if len(args) != len(self.packers):
+            raise ValueError('{} expects {} arguments, got {}'.format(self.signature, len(self.packers), len(args)))
+        if not self.dynamic:
+            return self.selector + ''.join([self.packers[i](args[i]) for i in range(len(args))])
+
+        head = []
+        tail = []
+        tail_size = 0
+        for i in range(len(args)):
+            if self.arrays[i]:
+                head.append(pack_uint(self.head_size + tail_size))
+                tail.append(pack_uint(len(args[i])))
+                for v in args[i]:
+                    tail.append(self.packers[i](v))
+                tail_size += (len(args[i]) + 1) * 32
+            else:
+                head.append(self.packers[i](args[i]))
+        return self.selector + ''.join(head) + ''.join(tail)
+
+
+def template_from_signature(signature):
+    m = re.match(re_signature, signature)
+    if m == None:
+        raise ValueError('invalid method signature {}'.format(signature))
+    types = []
+    if m[2] != '':
+        types = m[2].split(',')
+    return CalldataTemplate(m[1], types)
+
+
+def abi_signatures(abi):
+    """Extract method names and argument types from a contract ABI.
+
+    :param abi: Contract ABI
+    :type abi: list
+    :rtype: list of tuple
+    :returns: Method name and argument types, for each function
+    """
+    r = []
+    for v in abi:
+        if v['type'] != 'function':
+            continue
+        r.append((v['name'], tuple([x['type'] for x in v['inputs']]),))
+    return r
+
+
+def generate_selectors(abi):
+    """Generate the source of a python module holding the method selector table of a contract ABI.
+
+    The module is written to evm_tokenvote/data/selectors.py when the contract is installed, so that calldata templates can be loaded without parsing the ABI or hashing signatures at runtime.
+
+    :param abi: Contract ABI
+    :type abi: list
+    :rtype: str
+    :returns: Python source
+    """
+    s = '# generated by evm_tokenvote.calldata from Voter.json, do not edit.\n'
+    s += 'selectors = {\n'
+    for (name, types) in abi_signatures(abi):
+        o = CalldataTemplate(name, list(types))
+        s += '    {}: ({}, {}, {}),\n'.format(repr(o.signature), repr(name), repr(types), repr(o.selector))
+    s += '        }\n'
+    return s
+
+
+def templates():
+    """Load calldata templates for all methods in the Voter contract ABI.
+
+    The generated selector table is used if present, otherwise the ABI is parsed. The templates are only generated once per process.
+
+    :rtype: dict
+    :returns: Calldata templates, keyed by method signature
+    """
+    global __templates
+    if __templates == None:
+        r = {}
+        try:
+            from evm_tokenvote.data.selectors import selectors
+            for (name, types, selector) in selectors.values():
+                o = CalldataTemplate(name, list(types), selector=selector)
+                r[o.signature] = o
+        except ImportError:
+            logg.debug('no generated selector table, parsing abi')
+            for (name, types) in abi_signatures(data_abi()):
+                o = CalldataTemplate(name, list(types))
+                r[o.signature] = o
+        __templates = r
+        logg.debug('loaded {} calldata templates'.format(len(r)))
+    return __templates
+
+
+def template(signature):
+    """Retrieve the calldata template for a method signature.
+
+    Signatures not present in the contract ABI are parsed and cached on first use.
+
+    :param signature: Method signature, e.g. "vote(uint256)"
+    :type signature: str
+    :rtype: evm_tokenvote.calldata.CalldataTemplate
+    :returns: Calldata template
+    """
+    r = templates()
+    o = r.get(signature)
+    if o == None:
+        o = template_from_signature(signature)
+        r[o.signature] = o
+    return o
+
+
+def encode(signature, *args):
+    """Encode calldata for a contract method.
+
+    :param signature: Method signature, e.g. "vote(uint256)"
+    :type signature: str
+    :rtype: str
+    :returns: ABI encoded contract input data, in hex
+    """
+    return template(signature).encode(*args)
+
+
+if __name__ == '__main__':
+    sys.stdout.write(generate_selectors(data_abi()))
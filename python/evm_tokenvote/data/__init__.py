@@ -1,3 +1,39 @@
 import os
+import json
 
 data_dir = os.path.realpath(os.path.dirname(__file__))
+
+__abi = None
+__bytecode = None
+
+
+def abi():
+    """Load the Voter contract ABI.
+
+    The file is only read once per process.
+
+    :rtype: list
+    :returns: Contract ABI
+    """
+    global __abi
+    if __abi == None:
+        f = open(os.path.join(data_dir, 'Voter.json'), 'r')
+        __abi = json.load(f)
+        f.close()
+    return __abi
+
+
+def bytecode(version=None, **kwargs):
+    """Load the Voter contract bytecode.
+
+    The file is only read once per process.
+
+    :rtype: str
+    :returns: Contract bytecode, in hex
+    """
+    global __bytecode
+    if __bytecode == None:
+        f = open(os.path.join(data_dir, 'Voter.bin'), 'r')
+        __bytecode = f.read()
+        f.close()
+    return __bytecode
@@ -0,0 +1,21 @@
+# generated by evm_tokenvote.calldata from Voter.json, do not edit.
+selectors = {
+    'addOption(uint256,bytes32)': ('addOption', ('uint256', 'bytes32'), '86d39cbc'),
+    'balanceOf(address)': ('balanceOf', ('address',), '70a08231'),
+    'blockWaitLimit()': ('blockWaitLimit', (), 'ad35e283'),
+    'finalize()': ('finalize', (), '4bb278f3'),
+    'getCurrentProposal()': ('getCurrentProposal', (), '41ec6870'),
+    'getOption(uint256,uint256)': ('getOption', ('uint256', 'uint256'), '1ce30927'),
+    'getProposal(uint256)': ('getProposal', ('uint256',), 'c7f758a8'),
+    'optionCount(uint256)': ('optionCount', ('uint256',), '84385191'),
+    'propose(bytes32,uint256,uint24)': ('propose', ('bytes32', 'uint256', 'uint24'), 'e99a943e'),
+    'proposeInternal(bytes32,bytes32,uint256,uint24)': ('proposeInternal', ('bytes32', 'bytes32', 'uint256', 'uint24'), '28e7a520'),
+    'scan(uint256,uint8)': ('scan', ('uint256', 'uint8'), '8bb52213'),
+    'token()': ('token', (), 'fc0c546a'),
+    'vote(uint256)': ('vote', ('uint256',), '0121b93f'),
+    'voteCancel(uint256)': ('voteCancel', ('uint256',), '826d9873'),
+    'voteCount(uint256,uint256)': ('voteCount', ('uint256', 'uint256'), 'ba329414'),
+    'voteOption(uint256,uint256)': ('voteOption', ('uint256', 'uint256'), '509bd337'),
+    'withdraw(uint256)': ('withdraw', ('uint256',), '2e1a7d4d'),
+    'withdraw()': ('withdraw', (), '3ccfd60b'),
+        }
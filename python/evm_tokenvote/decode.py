@@ -0,0 +1,163 @@
+# standard imports
+import logging
+import functools
+
+# external imports
+from hexathon import strip_0x
+from chainlib.eth.address import to_checksum_address
+
+# local imports
+from evm_tokenvote.proposal import Proposal
+
+logg = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1024)
+def checksum_address(v):
+    return to_checksum_address(v)
+
+
+def to_buffer(v):
+    if isinstance(v, str):
+        v = bytes.fromhex(strip_0x(v))
+    return memoryview(v)
+
+
+def word(b, offset):
+    return int.from_bytes(b[offset:offset+32], 'big')
+
+
+def decode_proposal_at(b, base, serial=None):
+    """Decode an ABI encoded Proposal struct directly from a binary buffer.
+
+    :param b: Response data
+    :type b: memoryview
+    :param base: Byte offset of the struct in the buffer
+    :type base: int
+    :param serial: Proposal index to record in the result
+    :type serial: int
+    :rtype: evm_tokenvote.Proposal
+    :returns: Decoded proposal
+    """
+    description = b[base:base+32].hex()
+    options_offset = base + word(b, base + 32)
+    option_votes_offset = base + word(b, base + 64)
+
+    options = []
+    count = word(b, options_offset)
+    for i in range(count):
+        options_offset += 32
+        options.append(b[options_offset:options_offset+32].hex())
+
+    option_votes = []
+    count = word(b, option_votes_offset)
+    for i in range(count):
+        option_votes_offset += 32
+        option_votes.append(word(b, option_votes_offset))
+
+    return Proposal(description,
+                    cancel_votes=word(b, base + 96),
+                    supply=word(b, base + 128),
+                    total=word(b, base + 160),
+                    block_deadline=word(b, base + 192),
+                    target_vote_ppm=word(b, base + 224),
+                    proposer=checksum_address(b[base+268:base+288].hex()),
+                    state=word(b, base + 288),
+                    lead=word(b, base + 320),
+                    serial=serial,
+                    options=options,
+                    option_votes=option_votes,
+                    )
+
+
+def decode_proposal(v, serial=None):
+    """Decode a getProposal or getCurrentProposal response.
+
+    Produces the same result as evm_tokenvote.Voter.parse_proposal, without intermediate hex string slicing.
+
+    :param v: Response data, as hex or bytes
+    :type v: str, bytes or memoryview
+    :param serial: Proposal index to record in the result
+    :type serial: int
+    :rtype: evm_tokenvote.Proposal
+    :returns: Decoded proposal
+    """
+    b = to_buffer(v)
+    return decode_proposal_at(b, word(b, 0), serial=serial)
+
+
+def decode_proposals(vs, serial=None):
+    """Decode a list of getProposal responses.
+
+    :param vs: Response data items, as hex or bytes
+    :type vs: list
+    :param serial: If set, proposal index of the first item. Consecutive items will be given consecutive indices.
+    :type serial: int
+    :rtype: list of evm_tokenvote.Proposal
+    :returns: Decoded proposals
+    """
+    r = []
+    for v in vs:
+        r.append(decode_proposal(v, serial=serial))
+        if serial != None:
+            serial += 1
+    return r
+
+
+def decode_proposal_page(v, serial=None):
+    """Decode a getProposals response.
+
+    :param v: Response data, as hex or bytes
+    :type v: str, bytes or memoryview
+    :param serial: If set, proposal index of the first proposal in the page.
+    :type serial: int
+    :rtype: list of evm_tokenvote.Proposal
+    :returns: Decoded proposals
+    """
+    b = to_buffer(v)
+    cursor = word(b, 0)
+    count = word(b, cursor)
+    cursor += 32
+    r = []
+    for i in range(count):
+        base = cursor + word(b, cursor + (i * 32))
+        r.append(decode_proposal_at(b, base, serial=serial))
+        if serial != None:
+            serial += 1
+    return r
+
+
+def decode_options(v):
+    """Decode a getOptions response.
+
+    :param v: Response data, as hex or bytes
+    :type v: str, bytes or memoryview
+    :rtype: list of str
+    :returns: Option descriptions, in hex
+    """
+    b = to_buffer(v)
+    cursor = word(b, 0)
+    count = word(b, cursor)
+    r = []
+    for i in range(count):
+        cursor += 32
+        r.append(b[cursor:cursor+32].hex())
+    return r
+
+
+def decode_vote_counts(v):
+    """Decode a voteCounts response.
+
+    :param v: Response data, as hex or bytes
+    :type v: str, bytes or memoryview
+    :rtype: list of int
+    :returns: Option vote counts
+    """
+    b = to_buffer(v)
+    cursor = word(b, 0)
+    count = word(b, cursor)
+    r = []
+    for i in range(count):
+        cursor += 32
+        r.append(word(b, cursor))
+    return r
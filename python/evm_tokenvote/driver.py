@@ -0,0 +1,211 @@
+# standard imports
+import time
+import logging
+
+# external imports
+from chainlib.eth.block import (
+    block_latest,
+    block_by_number,
+    Block,
+)
+from chainlib.eth.tx import (
+    receipt,
+    TxFormat,
+    TxResult,
+)
+from chainlib.eth.gas import OverrideGasOracle
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.status import Status
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.voter import Voter
+from evm_tokenvote.proposal import ProposalState
+
+logg = logging.getLogger(__name__)
+
+
+def to_int(v):
+    if isinstance(v, str):
+        return int(strip_0x(v), 16)
+    return int(v)
+
+
+class DriverResult:
+    """Transactions sent by a driver, and the gas they used.
+
+    :param txs: Number of transactions sent
+    :type txs: int
+    :param gas: Total gas used by the transactions
+    :type gas: int
+    """
+
+    __slots__ = ('txs', 'gas')
+
+    def __init__(self, txs=0, gas=0):
+        self.txs = txs
+        self.gas = gas
+
+
+    def __str__(self):
+        return 'txs {} gas {}'.format(self.txs, self.gas)
+
+
+class VoterDriver:
+    """Sends contract operations of variable cost in transactions sized to a fraction of the block gas limit, using gas estimates.
+
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param signer: Signer holding the key of the sender
+    :type signer: funga.eth.signer.EIP155Signer
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param sender_address: Address to send transactions from
+    :type sender_address: str
+    :param gas_fraction: Fraction of the block gas limit a single transaction may use
+    :type gas_fraction: float
+    :param receipt_timeout: Seconds to wait for a receipt
+    :type receipt_timeout: float
+    :param receipt_poll_interval: Seconds between receipt polls
+    :type receipt_poll_interval: float
+    """
+    def __init__(self, chain_spec, conn, signer, contract_address, sender_address, gas_fraction=0.5, receipt_timeout=60.0, receipt_poll_interval=1.0):
+        if gas_fraction <= 0 or gas_fraction > 1:
+            raise ValueError('gas fraction must be in (0, 1]')
+        self.chain_spec = chain_spec
+        self.conn = conn
+        self.signer = signer
+        self.contract_address = contract_address
+        self.sender_address = sender_address
+        self.gas_fraction = gas_fraction
+        self.receipt_timeout = receipt_timeout
+        self.receipt_poll_interval = receipt_poll_interval
+        self.nonce_oracle = RPCNonceOracle(sender_address, conn=conn)
+        self.voter = Voter(chain_spec)
+
+
+    def gas_budget(self):
+        o = block_latest()
+        r = self.conn.do(o)
+        o = block_by_number(to_int(r), include_tx=False)
+        r = self.conn.do(o)
+        block = Block(r)
+        return int(to_int(block.fee_limit) * self.gas_fraction)
+
+
+    def estimate(self, tx):
+        o = self.voter.estimate_gas(tx)
+        r = self.conn.do(o)
+        return to_int(r)
+
+
+    def send(self, build, gas, result):
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=self.nonce_oracle, gas_oracle=OverrideGasOracle(limit=gas, conn=self.conn))
+        (tx_hash, o) = build(c, TxFormat.JSONRPC)
+        self.conn.do(o)
+
+        deadline = time.monotonic() + self.receipt_timeout
+        o = receipt(tx_hash)
+        while True:
+            r = self.conn.do(o)
+            if r != None:
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError('timeout waiting for receipt of {}'.format(tx_hash))
+            time.sleep(self.receipt_poll_interval)
+
+        rcpt = TxResult(r)
+        result.txs += 1
+        result.gas += rcpt.fee_cost
+        if rcpt.status != Status.SUCCESS:
+            raise RuntimeError('transaction {} reverted'.format(tx_hash))
+        return rcpt
+
+
+    def scanned(self, proposal_idx):
+        o = self.voter.get_proposal(self.contract_address, proposal_idx, sender_address=self.sender_address)
+        r = self.conn.do(o)
+        proposal = self.voter.parse_proposal(r)
+        return proposal.state & ProposalState.SCANNED > 0
+
+
+    def scan(self, proposal_idx, option_count=0, max_txs=256):
+        """Send scan transactions for a proposal until it is marked as scanned.
+
+        The gas of each scan call is estimated, and checked against the gas budget before it is sent.
+
+        :param proposal_idx: Proposal index
+        :type proposal_idx: int
+        :param option_count: Count to pass to scan. Deprecated, it is ignored by the contract.
+        :type option_count: int
+        :param max_txs: Give up after this many transactions
+        :type max_txs: int
+        :raises ValueError: A scan call does not fit in the gas budget
+        :raises RuntimeError: Proposal not scanned after max_txs transactions
+        :rtype: evm_tokenvote.driver.DriverResult
+        :returns: Transactions sent and gas used
+        """
+        result = DriverResult()
+        budget = self.gas_budget()
+
+        def build(c, tx_format):
+            return c.scan(self.contract_address, self.sender_address, proposal_idx, option_count, tx_format=tx_format)
+
+        while not self.scanned(proposal_idx):
+            if result.txs == max_txs:
+                raise RuntimeError('proposal {} not scanned after {} transactions'.format(proposal_idx, result.txs))
+            gas = self.estimate(build(self.voter, TxFormat.DICT))
+            if gas > budget:
+                raise ValueError('scan needs {} gas, budget is {}'.format(gas, budget))
+            self.send(build, gas, result)
+        logg.debug('scanned proposal {} {}'.format(proposal_idx, result))
+        return result
+
+
+    def add_options(self, proposal_idx, descriptions):
+        """Add options to a proposal with addOptions, in chunks that fit in the gas budget.
+
+        The chunk size is derived from the difference between gas estimates for adding one and two options, and each chunk is checked against an estimate before it is sent.
+
+        :param proposal_idx: Proposal index
+        :type proposal_idx: int
+        :param descriptions: Option descriptions, in hex
+        :type descriptions: list of str
+        :raises ValueError: A single option does not fit in the gas budget
+        :rtype: evm_tokenvote.driver.DriverResult
+        :returns: Transactions sent and gas used
+        """
+        result = DriverResult()
+        budget = self.gas_budget()
+
+        def builder(chunk):
+            def build(c, tx_format):
+                return c.add_options(self.contract_address, self.sender_address, proposal_idx, chunk, tx_format=tx_format)
+            return build
+
+        def estimate(chunk):
+            return self.estimate(builder(chunk)(self.voter, TxFormat.DICT))
+
+        if len(descriptions) == 0:
+            return result
+        gas_one = estimate(descriptions[:1])
+        if gas_one > budget:
+            raise ValueError('adding an option needs {} gas, budget is {}'.format(gas_one, budget))
+        gas_step = estimate(descriptions[:2]) - gas_one
+        if gas_step <= 0:
+            gas_step = gas_one
+        size = 1 + int((budget - gas_one) / gas_step)
+
+        cursor = 0
+        while cursor < len(descriptions):
+            chunk = descriptions[cursor:cursor+size]
+            gas = estimate(chunk)
+            while gas > budget and len(chunk) > 1:
+                chunk = chunk[:max(1, len(chunk) - 1 - int((gas - budget) / gas_step))]
+                gas = estimate(chunk)
+            self.send(builder(chunk), gas, result)
+            cursor += len(chunk)
+        logg.debug('added {} options to proposal {} {}'.format(len(descriptions), proposal_idx, result))
+        return result
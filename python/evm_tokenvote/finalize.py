@@ -0,0 +1,53 @@
+# standard imports
+import logging
+
+# external imports
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.voter import Voter
+
+logg = logging.getLogger(__name__)
+
+
+def finalize_many_count(chain_spec, conn, contract_address, sender_address, gas_limit, id_generator=None):
+    """Choose how many proposals to finalize in a single finalizeMany transaction within a gas limit.
+
+    The cost of finalizing one more proposal is taken from the difference between the gas estimates for one and two proposals, and the count is then checked against an estimate for the count itself. If there is no more than one proposal to finalize, the estimates are equal and the count is 1.
+
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param sender_address: Address the transaction will be sent from
+    :type sender_address: str
+    :param gas_limit: Maximum gas to spend in the transaction
+    :type gas_limit: int
+    :rtype: tuple
+    :returns: Number of proposals to pass as max, and the gas estimate for it. The count is 0 if not even a single proposal fits in the gas limit.
+    """
+    c = Voter(chain_spec)
+
+    def estimate(count):
+        o = c.estimate_finalize_many(contract_address, sender_address, count, id_generator=id_generator)
+        r = conn.do(o)
+        return int(strip_0x(r), 16)
+
+    gas_one = estimate(1)
+    if gas_one > gas_limit:
+        return (0, gas_one,)
+    gas_step = estimate(2) - gas_one
+    if gas_step <= 0:
+        return (1, gas_one,)
+
+    count = 1 + int((gas_limit - gas_one) / gas_step)
+    gas = estimate(count)
+    # proposals may differ in cost, e.g. internals proposals, so back off until the estimate fits.
+    while gas > gas_limit and count > 1:
+        count -= max(1, int((gas - gas_limit) / gas_step))
+        count = max(count, 1)
+        gas = estimate(count)
+    logg.debug('finalize many count {} gas {} limit {}'.format(count, gas, gas_limit))
+    return (count, gas,)
@@ -0,0 +1,474 @@
+# standard imports
+import logging
+import sqlite3
+import time
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+# external imports
+from chainlib.jsonrpc import JSONRPCRequest
+from chainlib.hash import keccak256_string_to_hex
+from chainlib.eth.block import block_latest
+from chainlib.error import RPCException
+from hexathon import (
+    add_0x,
+    strip_0x,
+)
+
+logg = logging.getLogger(__name__)
+
+topic_proposal_added = add_0x(keccak256_string_to_hex('ProposalAdded(uint256,uint256,uint256)'))
+topic_proposal_completed = add_0x(keccak256_string_to_hex('ProposalCompleted(uint256,bool,bool,uint256)'))
+
+# substrings of error messages used by rpc providers when a log query is too large.
+log_limit_errors = [
+    'more than',
+    'too many',
+    'limit exceeded',
+    'response size',
+    'range is too large',
+]
+
+
+def to_int(v):
+    if isinstance(v, int):
+        return v
+    return int(strip_0x(v), 16)
+
+
+def logs(contract_address, from_block, to_block, topics=None, id_generator=None):
+    """Build an eth_getLogs query for a block range of a single contract.
+
+    :param contract_address: Contract address
+    :type contract_address: str
+    :param from_block: First block of range
+    :type from_block: int
+    :param to_block: Last block of range (inclusive)
+    :type to_block: int
+    :param topics: Topic filter
+    :type topics: list
+    :rtype: dict
+    :returns: JSON-RPC query object
+    """
+    j = JSONRPCRequest(id_generator)
+    o = j.template()
+    o['method'] = 'eth_getLogs'
+    f = {
+        'address': add_0x(contract_address),
+        'fromBlock': hex(from_block),
+        'toBlock': hex(to_block),
+        }
+    if topics != None:
+        f['topics'] = topics
+    o['params'].append(f)
+    return j.finalize(o)
+
+
+def is_log_limit_error(e):
+    s = str(e).lower()
+    for v in log_limit_errors:
+        if v in s:
+            return True
+    return False
+
+
+def fetch_events(conn, contract_address, from_block, to_block):
+    """Fetch and decode proposal events in a block range.
+
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param from_block: First block of range
+    :type from_block: int
+    :param to_block: Last block of range (inclusive)
+    :type to_block: int
+    :rtype: list
+    :returns: Decoded events, in order
+    """
+    o = logs(contract_address, from_block, to_block, topics=[[topic_proposal_added, topic_proposal_completed]])
+    r = conn.do(o)
+    events = []
+    for v in r:
+        e = decode_log(v)
+        if e != None:
+            events.append(e)
+    return events
+
+
+def fetch_events_split(conn, contract_address, from_block, to_block, min_range=1):
+    """Fetch and decode proposal events in a block range, splitting the range in half whenever the rpc provider refuses a query as too large.
+
+    :param min_range: Smallest block range to split
+    :type min_range: int
+    :rtype: list
+    :returns: Decoded events, in order
+    """
+    try:
+        return fetch_events(conn, contract_address, from_block, to_block)
+    except RPCException as e:
+        if not is_log_limit_error(e) or to_block - from_block + 1 <= min_range:
+            raise e
+    mid = from_block + int((to_block - from_block) / 2)
+    logg.debug('log query {}-{} too large, splitting at {}'.format(from_block, to_block, mid))
+    r = fetch_events_split(conn, contract_address, from_block, mid, min_range=min_range)
+    r += fetch_events_split(conn, contract_address, mid + 1, to_block, min_range=min_range)
+    return r
+
+
+class ProposalAdded:
+
+    __slots__ = ('proposal_idx', 'block_deadline', 'target_vote_ppm', 'block_number', 'tx_hash', 'log_index')
+
+    def __init__(self, proposal_idx, block_deadline, target_vote_ppm, block_number=None, tx_hash=None, log_index=None):
+        self.proposal_idx = proposal_idx
+        self.block_deadline = block_deadline
+        self.target_vote_ppm = target_vote_ppm
+        self.block_number = block_number
+        self.tx_hash = tx_hash
+        self.log_index = log_index
+
+
+    def __str__(self):
+        return 'proposal {} added block {} deadline {}'.format(self.proposal_idx, self.block_number, self.block_deadline)
+
+
+class ProposalCompleted:
+
+    __slots__ = ('proposal_idx', 'cancelled', 'insufficient', 'total_vote', 'block_number', 'tx_hash', 'log_index')
+
+    def __init__(self, proposal_idx, cancelled, insufficient, total_vote, block_number=None, tx_hash=None, log_index=None):
+        self.proposal_idx = proposal_idx
+        self.cancelled = cancelled
+        self.insufficient = insufficient
+        self.total_vote = total_vote
+        self.block_number = block_number
+        self.tx_hash = tx_hash
+        self.log_index = log_index
+
+
+    def __str__(self):
+        return 'proposal {} completed block {} total vote {}'.format(self.proposal_idx, self.block_number, self.total_vote)
+
+
+def decode_log(v):
+    """Decode a ProposalAdded or ProposalCompleted log entry.
+
+    :param v: Log entry, as returned by eth_getLogs
+    :type v: dict
+    :rtype: evm_tokenvote.indexer.ProposalAdded, evm_tokenvote.indexer.ProposalCompleted or None
+    :returns: Decoded event, or None if log is not a proposal event
+    """
+    topics = v['topics']
+    topic = add_0x(topics[0].lower())
+    block_number = to_int(v['blockNumber'])
+    log_index = to_int(v['logIndex'])
+    if topic == topic_proposal_added:
+        return ProposalAdded(to_int(topics[3]), to_int(topics[1]), to_int(topics[2]), block_number=block_number, tx_hash=v['transactionHash'], log_index=log_index)
+    elif topic == topic_proposal_completed:
+        return ProposalCompleted(to_int(topics[1]), to_int(topics[2]) > 0, to_int(topics[3]) > 0, to_int(v['data']), block_number=block_number, tx_hash=v['transactionHash'], log_index=log_index)
+    return None
+
+
+class ProposalStore:
+    """SQLite store for proposal events, with a per-contract checkpoint of the last indexed block.
+
+    :param path: Database file path, or ":memory:"
+    :type path: str
+    """
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+CREATE TABLE IF NOT EXISTS proposal_added (
+    contract TEXT NOT NULL,
+    proposal_idx INTEGER NOT NULL,
+    block_deadline INTEGER NOT NULL,
+    target_vote_ppm INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    PRIMARY KEY (contract, block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS proposal_completed (
+    contract TEXT NOT NULL,
+    proposal_idx INTEGER NOT NULL,
+    cancelled INTEGER NOT NULL,
+    insufficient INTEGER NOT NULL,
+    total_vote TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    PRIMARY KEY (contract, block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    contract TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+""")
+        self.db.commit()
+
+
+    def close(self):
+        self.db.close()
+
+
+    def checkpoint(self, contract_address):
+        """Get the last fully indexed block for a contract.
+
+        :rtype: int
+        :returns: Block number, or None if contract has not been indexed
+        """
+        r = self.db.execute('SELECT block_number FROM checkpoint WHERE contract = ?', (contract_address.lower(),)).fetchone()
+        if r == None:
+            return None
+        return r[0]
+
+
+    def add(self, contract_address, events, checkpoint):
+        """Store events and advance the checkpoint in a single transaction.
+
+        :param contract_address: Contract address
+        :type contract_address: str
+        :param events: Decoded events
+        :type events: list
+        :param checkpoint: Last block covered by the events
+        :type checkpoint: int
+        """
+        contract_address = contract_address.lower()
+        with self.db:
+            for v in events:
+                if isinstance(v, ProposalAdded):
+                    self.db.execute('INSERT OR REPLACE INTO proposal_added VALUES (?, ?, ?, ?, ?, ?, ?)', (contract_address, v.proposal_idx, v.block_deadline, v.target_vote_ppm, v.block_number, v.tx_hash, v.log_index))
+                elif isinstance(v, ProposalCompleted):
+                    self.db.execute('INSERT OR REPLACE INTO proposal_completed VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (contract_address, v.proposal_idx, int(v.cancelled), int(v.insufficient), str(v.total_vote), v.block_number, v.tx_hash, v.log_index))
+            self.db.execute('INSERT OR REPLACE INTO checkpoint VALUES (?, ?)', (contract_address, checkpoint))
+
+
+    def rollback(self, contract_address, block_number):
+        """Remove all events at or above the given block, and move the checkpoint below it.
+
+        :param contract_address: Contract address
+        :type contract_address: str
+        :param block_number: First block to remove
+        :type block_number: int
+        """
+        contract_address = contract_address.lower()
+        with self.db:
+            self.db.execute('DELETE FROM proposal_added WHERE contract = ? AND block_number >= ?', (contract_address, block_number))
+            self.db.execute('DELETE FROM proposal_completed WHERE contract = ? AND block_number >= ?', (contract_address, block_number))
+            self.db.execute('UPDATE checkpoint SET block_number = ? WHERE contract = ? AND block_number >= ?', (block_number - 1, contract_address, block_number))
+
+
+    def added(self, contract_address):
+        r = []
+        for v in self.db.execute('SELECT proposal_idx, block_deadline, target_vote_ppm, block_number, tx_hash, log_index FROM proposal_added WHERE contract = ? ORDER BY block_number, log_index', (contract_address.lower(),)):
+            r.append(ProposalAdded(v[0], v[1], v[2], block_number=v[3], tx_hash=v[4], log_index=v[5]))
+        return r
+
+
+    def completed(self, contract_address):
+        r = []
+        for v in self.db.execute('SELECT proposal_idx, cancelled, insufficient, total_vote, block_number, tx_hash, log_index FROM proposal_completed WHERE contract = ? ORDER BY block_number, log_index', (contract_address.lower(),)):
+            r.append(ProposalCompleted(v[0], v[1] > 0, v[2] > 0, int(v[3]), block_number=v[4], tx_hash=v[5], log_index=v[6]))
+        return r
+
+
+class ProposalIndexer:
+    """Incrementally indexes ProposalAdded and ProposalCompleted events of a Voter contract.
+
+    Logs are fetched in block ranges of adaptive size. The range is halved when the rpc provider refuses a query as too large, and doubled after a query returns few results.
+
+    On each sync, the last reorg_depth blocks before the checkpoint are rolled back and indexed again.
+
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param store: Event store
+    :type store: evm_tokenvote.indexer.ProposalStore
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param start_block: Block to start indexing from if no checkpoint exists, e.g. the deployment block
+    :type start_block: int
+    :param reorg_depth: Number of blocks below the checkpoint to index again on each sync
+    :type reorg_depth: int
+    """
+    def __init__(self, conn, store, contract_address, start_block=0, reorg_depth=12, chunk_size=1000, min_chunk_size=1, max_chunk_size=100000, target_results=1000):
+        self.conn = conn
+        self.store = store
+        self.contract_address = contract_address
+        self.start_block = start_block
+        self.reorg_depth = reorg_depth
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_results = target_results
+
+
+    def head(self):
+        o = block_latest()
+        r = self.conn.do(o)
+        return to_int(r)
+
+
+    def fetch(self, from_block, to_block):
+        """Fetch and decode proposal events in a block range.
+
+        :param from_block: First block of range
+        :type from_block: int
+        :param to_block: Last block of range (inclusive)
+        :type to_block: int
+        :rtype: list
+        :returns: Decoded events, in order
+        """
+        return fetch_events(self.conn, self.contract_address, from_block, to_block)
+
+
+    def resume_block(self):
+        """Get the block the next sync will start from.
+
+        :rtype: int
+        :returns: Block number
+        """
+        checkpoint = self.store.checkpoint(self.contract_address)
+        if checkpoint == None:
+            return self.start_block
+        return max(self.start_block, checkpoint + 1 - self.reorg_depth)
+
+
+    def sync(self, to_block=None):
+        """Index events from the checkpoint up to the given block.
+
+        :param to_block: Last block to index. If not set, the current block height is used.
+        :type to_block: int
+        :rtype: int
+        :returns: Number of events stored
+        """
+        if to_block == None:
+            to_block = self.head()
+        cursor = self.resume_block()
+        self.store.rollback(self.contract_address, cursor)
+
+        c = 0
+        while cursor <= to_block:
+            end = min(cursor + self.chunk_size - 1, to_block)
+            try:
+                events = self.fetch(cursor, end)
+            except RPCException as e:
+                if not is_log_limit_error(e) or self.chunk_size <= self.min_chunk_size:
+                    raise e
+                self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+                logg.debug('log query {}-{} too large, chunk size now {}'.format(cursor, end, self.chunk_size))
+                continue
+            self.store.add(self.contract_address, events, end)
+            c += len(events)
+            if len(events) < self.target_results / 2:
+                self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+            logg.debug('indexed {} proposal events in blocks {}-{}'.format(len(events), cursor, end))
+            cursor = end + 1
+        return c
+
+
+class BackfillStats:
+
+    __slots__ = ('blocks', 'shards', 'events', 'elapsed')
+
+    def __init__(self):
+        self.blocks = 0
+        self.shards = 0
+        self.events = 0
+        self.elapsed = 0.0
+
+
+    def blocks_per_second(self):
+        if self.elapsed == 0:
+            return 0.0
+        return self.blocks / self.elapsed
+
+
+    def __str__(self):
+        return 'backfilled {} blocks in {} shards, {} events, {:.1f} blocks/s'.format(self.blocks, self.shards, self.events, self.blocks_per_second())
+
+
+class ProposalBackfill:
+    """Indexes the history of a Voter contract by fetching block range shards concurrently.
+
+    Shards are fetched in a thread pool, with at most max_pending shards in flight. Shard results are written to the store strictly in block order, advancing the checkpoint after each shard, so an interrupted backfill can be resumed with evm_tokenvote.indexer.ProposalIndexer.
+
+    The connection must be safe to use from several threads.
+
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param store: Event store
+    :type store: evm_tokenvote.indexer.ProposalStore
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param shard_size: Number of blocks per shard
+    :type shard_size: int
+    :param workers: Number of concurrent shard fetches
+    :type workers: int
+    :param max_pending: Number of shards fetched ahead of the store. Defaults to twice the number of workers.
+    :type max_pending: int
+    """
+    def __init__(self, conn, store, contract_address, shard_size=10000, workers=4, max_pending=0, min_shard_size=1):
+        if shard_size < 1 or workers < 1:
+            raise ValueError('shard size and workers must be positive')
+        self.conn = conn
+        self.store = store
+        self.contract_address = contract_address
+        self.shard_size = shard_size
+        self.workers = workers
+        self.max_pending = max_pending
+        if self.max_pending < 1:
+            self.max_pending = workers * 2
+        self.min_shard_size = min_shard_size
+
+
+    def shards(self, start_block, end_block):
+        cursor = start_block
+        while cursor <= end_block:
+            end = min(cursor + self.shard_size - 1, end_block)
+            yield (cursor, end,)
+            cursor = end + 1
+
+
+    def fetch(self, from_block, to_block):
+        return fetch_events_split(self.conn, self.contract_address, from_block, to_block, min_range=self.min_shard_size)
+
+
+    def run(self, start_block, end_block=None):
+        """Index all events in a block range.
+
+        :param start_block: First block of range, e.g. the deployment block
+        :type start_block: int
+        :param end_block: Last block of range. If not set, the current block height is used.
+        :type end_block: int
+        :rtype: evm_tokenvote.indexer.BackfillStats
+        :returns: Backfill statistics
+        """
+        if end_block == None:
+            end_block = to_int(self.conn.do(block_latest()))
+        stats = BackfillStats()
+        t = time.monotonic()
+        self.store.rollback(self.contract_address, start_block)
+        pending = collections.deque()
+        shards = self.shards(start_block, end_block)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for shard in shards:
+                pending.append((shard, executor.submit(self.fetch, shard[0], shard[1]),))
+                if len(pending) < self.max_pending:
+                    continue
+                self.__store(pending.popleft(), stats)
+            while len(pending) > 0:
+                self.__store(pending.popleft(), stats)
+        stats.elapsed = time.monotonic() - t
+        logg.info(str(stats))
+        return stats
+
+
+    def __store(self, v, stats):
+        ((from_block, to_block), future) = v
+        events = future.result()
+        self.store.add(self.contract_address, events, to_block)
+        stats.blocks += to_block - from_block + 1
+        stats.shards += 1
+        stats.events += len(events)
+        logg.debug('backfilled {} proposal events in blocks {}-{}'.format(len(events), from_block, to_block))
@@ -0,0 +1,335 @@
+# standard imports
+import time
+import logging
+
+# external imports
+from chainlib.eth.block import block_latest
+from chainlib.eth.nonce import (
+    nonce as nonce_query,
+    OverrideNonceOracle,
+)
+from chainlib.eth.tx import (
+    receipt,
+    TxResult,
+)
+from chainlib.status import Status
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.voter import Voter
+from evm_tokenvote.proposal import ProposalState
+
+logg = logging.getLogger(__name__)
+
+
+def to_int(v):
+    if isinstance(v, str):
+        return int(strip_0x(v), 16)
+    return int(v)
+
+
+class FinalizeLatency:
+    """Time from a proposal becoming final-able to its finalization.
+
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param proposal_idx: Proposal index
+    :type proposal_idx: int
+    :param block_deadline: Deadline block of the proposal
+    :type block_deadline: int
+    :param block_number: Block the finalize transaction was included in
+    :type block_number: int
+    :param seconds: Seconds from when the keeper first saw the proposal completed, to the finalize receipt
+    :type seconds: float
+    """
+
+    __slots__ = ('contract_address', 'proposal_idx', 'block_deadline', 'block_number', 'seconds')
+
+    def __init__(self, contract_address, proposal_idx, block_deadline, block_number, seconds):
+        self.contract_address = contract_address
+        self.proposal_idx = proposal_idx
+        self.block_deadline = block_deadline
+        self.block_number = block_number
+        self.seconds = seconds
+
+
+    def blocks(self):
+        return max(0, self.block_number - self.block_deadline)
+
+
+    def __str__(self):
+        return '{} proposal {} finalized after {} blocks, {:.3f}s'.format(self.contract_address, self.proposal_idx, self.blocks(), self.seconds)
+
+
+class KeeperMetrics:
+    """Counters and finalization latencies of a keeper.
+    """
+    def __init__(self):
+        self.ticks = 0
+        self.txs = 0
+        self.failed = 0
+        self.stuck = 0
+        self.latencies = []
+
+
+    def finalized(self):
+        return len(self.latencies)
+
+
+    def mean_blocks(self):
+        if len(self.latencies) == 0:
+            return 0.0
+        return sum([v.blocks() for v in self.latencies]) / len(self.latencies)
+
+
+    def max_blocks(self):
+        if len(self.latencies) == 0:
+            return 0
+        return max([v.blocks() for v in self.latencies])
+
+
+    def mean_seconds(self):
+        if len(self.latencies) == 0:
+            return 0.0
+        return sum([v.seconds for v in self.latencies]) / len(self.latencies)
+
+
+    def __str__(self):
+        return '{} ticks {} txs {} failed {} stuck {} finalized, latency mean {:.1f} max {} blocks, mean {:.3f}s'.format(self.ticks, self.txs, self.failed, self.stuck, self.finalized(), self.mean_blocks(), self.max_blocks(), self.mean_seconds())
+
+
+class KeeperTarget:
+    """Keeper state for a single Voter contract.
+
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    """
+
+    __slots__ = ('contract_address', 'cursor', 'wake', 'seen', 'stuck')
+
+    def __init__(self, contract_address):
+        self.contract_address = contract_address
+        # index of the proposal the contract is expected to finalize next.
+        self.cursor = 0
+        # block height at which to check the contract again.
+        self.wake = 0
+        # time the proposal at the cursor was first seen completed.
+        self.seen = None
+        # index of a proposal that can never be finalized, blocking the contract.
+        self.stuck = None
+
+
+class Keeper:
+    """Scans and finalizes proposals of a set of Voter contracts as soon as they complete.
+
+    Each contract is checked at a scheduled block height: the deadline of its current proposal, or after recheck_blocks if it has no proposal waiting, or if the proposal may complete early by reaching its target vote. Contracts that are not due are not queried.
+
+    A proposal that was cancelled by vote and has passed its deadline before being finalized can no longer be finalized, and the contract cannot move on to later proposals. Such a contract is marked as stuck, counted in the metrics, and no longer checked.
+
+    The keeper keeps the nonce of the sender locally, and only queries the network for it on start and after a failed send.
+
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param signer: Signer holding the key of the sender
+    :type signer: funga.eth.signer.EIP155Signer
+    :param sender_address: Address to send transactions from
+    :type sender_address: str
+    :param contract_addresses: Voter contracts to keep
+    :type contract_addresses: list of str
+    :param gas_oracle: Gas oracle for the transactions
+    :type gas_oracle: chainlib.eth.gas.RPCGasOracle
+    :param recheck_blocks: Maximum blocks between checks of a contract
+    :type recheck_blocks: int
+    :param block_time: Expected seconds per block, used to sleep until the next scheduled check
+    :type block_time: float
+    :param receipt_timeout: Seconds to wait for a receipt
+    :type receipt_timeout: float
+    :param receipt_poll_interval: Seconds between receipt polls
+    :type receipt_poll_interval: float
+    """
+    def __init__(self, chain_spec, conn, signer, sender_address, contract_addresses, gas_oracle=None, recheck_blocks=10, block_time=12.0, receipt_timeout=60.0, receipt_poll_interval=1.0):
+        self.chain_spec = chain_spec
+        self.conn = conn
+        self.signer = signer
+        self.sender_address = sender_address
+        self.gas_oracle = gas_oracle
+        self.recheck_blocks = recheck_blocks
+        self.block_time = block_time
+        self.receipt_timeout = receipt_timeout
+        self.receipt_poll_interval = receipt_poll_interval
+        self.targets = []
+        for v in contract_addresses:
+            self.add(v)
+        self.nonce = None
+        self.voter = Voter(chain_spec)
+        self.metrics = KeeperMetrics()
+        self.running = False
+
+
+    def add(self, contract_address, cursor=0):
+        """Add a Voter contract to keep.
+
+        :param cursor: Index of the first proposal that may not have been finalized. Proposals before it are skipped.
+        :type cursor: int
+        """
+        o = KeeperTarget(contract_address)
+        o.cursor = cursor
+        self.targets.append(o)
+        return o
+
+
+    def height(self):
+        o = block_latest()
+        r = self.conn.do(o)
+        return to_int(r)
+
+
+    def next_wake(self):
+        """Lowest block height at which a contract is due to be checked.
+
+        :rtype: int
+        """
+        wakes = [v.wake for v in self.targets if v.stuck == None]
+        if len(wakes) == 0:
+            return None
+        return min(wakes)
+
+
+    def sync_nonce(self):
+        o = nonce_query(self.sender_address)
+        r = self.conn.do(o)
+        self.nonce = to_int(r)
+        logg.debug('keeper nonce for {} is {}'.format(self.sender_address, self.nonce))
+
+
+    def send(self, build):
+        if self.nonce == None:
+            self.sync_nonce()
+        nonce_oracle = OverrideNonceOracle(self.sender_address, self.nonce)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle, gas_oracle=self.gas_oracle)
+        (tx_hash, o) = build(c)
+        try:
+            self.conn.do(o)
+        except Exception as e:
+            # the local nonce may be out of sync with the network, e.g. if the sender is also used elsewhere.
+            self.nonce = None
+            self.metrics.failed += 1
+            raise e
+        self.nonce += 1
+        self.metrics.txs += 1
+        return tx_hash
+
+
+    def wait(self, tx_hash):
+        deadline = time.monotonic() + self.receipt_timeout
+        o = receipt(tx_hash)
+        while True:
+            r = self.conn.do(o)
+            if r != None:
+                return TxResult(r)
+            if time.monotonic() > deadline:
+                raise TimeoutError('timeout waiting for receipt of {}'.format(tx_hash))
+            time.sleep(self.receipt_poll_interval)
+
+
+    def process(self, target, height):
+        """Finalize all completed proposals of a contract, in order, and schedule its next check.
+
+        :rtype: int
+        :returns: Number of proposals finalized
+        """
+        finalized = 0
+        o = self.voter.proposal_count(target.contract_address, sender_address=self.sender_address)
+        count = to_int(self.conn.do(o))
+        while target.cursor < count:
+            o = self.voter.get_proposal(target.contract_address, target.cursor, sender_address=self.sender_address)
+            proposal = self.voter.parse_proposal(self.conn.do(o))
+            if proposal.state & ProposalState.FINAL > 0:
+                target.cursor += 1
+                target.seen = None
+                continue
+
+            if proposal.state & ProposalState.IMMEDIATE == 0 and proposal.block_deadline > height:
+                target.wake = min(proposal.block_deadline, height + self.recheck_blocks)
+                return finalized
+
+            idx = target.cursor
+            # finalize reverts for a cancelled proposal once its deadline has passed, so it would never succeed.
+            if proposal.state & ProposalState.CANCELLED > 0 and proposal.block_deadline <= height:
+                logg.error('keeper cannot finalize {} proposal {}, it was cancelled and its deadline {} has passed'.format(target.contract_address, idx, proposal.block_deadline))
+                target.stuck = idx
+                self.metrics.stuck += 1
+                return finalized
+
+            if target.seen == None:
+                target.seen = time.monotonic()
+
+            try:
+                if proposal.state & ProposalState.SCANNED == 0:
+                    self.send(lambda c: c.scan(target.contract_address, self.sender_address, idx, 0))
+                # the scan receipt is not waited for; finalize does not depend on it.
+                finalize_hash = self.send(lambda c: c.finalize_vote(target.contract_address, self.sender_address))
+                r = self.wait(finalize_hash)
+            except Exception as e:
+                logg.error('keeper could not finalize {} proposal {}: {}'.format(target.contract_address, idx, e))
+                target.wake = height + 1
+                return finalized
+            if r.status != Status.SUCCESS:
+                logg.error('keeper finalize of {} proposal {} reverted in {}'.format(target.contract_address, idx, finalize_hash))
+                self.metrics.failed += 1
+                target.wake = height + self.recheck_blocks
+                return finalized
+
+            latency = FinalizeLatency(target.contract_address, idx, proposal.block_deadline, to_int(r.src['block_number']), time.monotonic() - target.seen)
+            self.metrics.latencies.append(latency)
+            logg.info('keeper {}'.format(latency))
+            finalized += 1
+            target.cursor += 1
+            target.seen = None
+
+        # no proposal waiting.
+        target.wake = height + self.recheck_blocks
+        return finalized
+
+
+    def tick(self, height=None):
+        """Check the contracts that are due at the given block height.
+
+        :param height: Block height, or None to use the latest block
+        :type height: int
+        :rtype: int
+        :returns: Number of proposals finalized
+        """
+        if height == None:
+            height = self.height()
+        self.metrics.ticks += 1
+        finalized = 0
+        for v in self.targets:
+            if v.stuck != None or v.wake > height:
+                continue
+            finalized += self.process(v, height)
+        return finalized
+
+
+    def run(self, max_sleep=60.0):
+        """Check contracts as they become due, until stop is called.
+
+        Between checks, the keeper sleeps for the expected time until the next scheduled block height.
+        """
+        self.running = True
+        while self.running:
+            height = self.height()
+            wake = self.next_wake()
+            if wake != None and wake <= height:
+                self.tick(height=height)
+                continue
+            delay = max_sleep
+            if wake != None:
+                delay = min(max_sleep, (wake - height) * self.block_time)
+            time.sleep(delay)
+
+
+    def stop(self):
+        self.running = False
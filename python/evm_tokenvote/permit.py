@@ -0,0 +1,186 @@
+# standard imports
+import os
+import logging
+
+# external imports
+from chainlib.hash import keccak256
+from chainlib.eth.constant import ZERO_ADDRESS
+from chainlib.eth.contract import ABIContractEncoder
+from chainlib.eth.jsonrpc import to_blockheight_param
+from chainlib.eth.tx import (
+    TxFactory,
+    TxFormat,
+)
+from chainlib.jsonrpc import JSONRPCRequest
+from chainlib.block import BlockSpec
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.calldata import (
+    encode,
+    pack_uint,
+    pack_address,
+)
+from evm_tokenvote.data import data_dir
+
+logg = logging.getLogger(__name__)
+
+permit_typehash = keccak256('Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)')
+
+
+def permit_struct_hash(owner, spender, value, nonce, deadline):
+    """Calculate the EIP-712 struct hash of an EIP-2612 permit.
+
+    :rtype: bytes
+    :returns: Struct hash
+    """
+    v = permit_typehash.hex() + pack_address(owner) + pack_address(spender) + pack_uint(value) + pack_uint(nonce) + pack_uint(deadline)
+    return keccak256(bytes.fromhex(v))
+
+
+def permit_digest(domain_separator, owner, spender, value, nonce, deadline):
+    """Calculate the EIP-712 digest an EIP-2612 permit signature is made over.
+
+    :param domain_separator: EIP-712 domain separator of the token contract
+    :type domain_separator: bytes
+    :rtype: bytes
+    :returns: Digest
+    """
+    return keccak256(b'\x19\x01' + domain_separator + permit_struct_hash(owner, spender, value, nonce, deadline))
+
+
+class Permit:
+    """Signed EIP-2612 permit, allowing spender to transfer value from owner until deadline.
+
+    :param v: Signature recovery byte, 27 or 28
+    :type v: int
+    :param r: Signature r value
+    :type r: bytes
+    :param s: Signature s value
+    :type s: bytes
+    """
+
+    __slots__ = ('owner', 'spender', 'value', 'nonce', 'deadline', 'v', 'r', 's')
+
+    def __init__(self, owner, spender, value, nonce, deadline, v, r, s):
+        self.owner = owner
+        self.spender = spender
+        self.value = value
+        self.nonce = nonce
+        self.deadline = deadline
+        self.v = v
+        self.r = r
+        self.s = s
+
+
+    def __str__(self):
+        return 'permit {} -> {} value {} nonce {} deadline {}'.format(self.owner, self.spender, self.value, self.nonce, self.deadline)
+
+
+def sign_permit(signer, domain_separator, owner, spender, value, nonce, deadline):
+    """Sign an EIP-2612 permit.
+
+    :param signer: Signer holding the key of owner
+    :type signer: funga.eth.signer.EIP155Signer
+    :param domain_separator: EIP-712 domain separator of the token contract
+    :type domain_separator: bytes
+    :param owner: Token owner, i.e. the voter
+    :type owner: str
+    :param spender: Spender, i.e. the Voter contract
+    :type spender: str
+    :param value: Token value allowed
+    :type value: int
+    :param nonce: Current permit nonce of owner in token contract
+    :type nonce: int
+    :param deadline: Timestamp after which the permit is invalid
+    :type deadline: int
+    :rtype: evm_tokenvote.permit.Permit
+    :returns: Signed permit
+    """
+    z = signer.sign_typed_message(owner, domain_separator, permit_struct_hash(owner, spender, value, nonce, deadline))
+    return Permit(owner, spender, value, nonce, deadline, z[64] + 27, z[:32], z[32:64])
+
+
+class PermitToken(TxFactory):
+    """Interface to the permit methods of an EIP-2612 token, and deployment of the minimal permit token used in tests.
+    """
+
+    __bytecode = None
+
+    def constructor(self, sender_address, supply, tx_format=TxFormat.JSONRPC):
+        code = PermitToken.bytecode()
+        enc = ABIContractEncoder()
+        enc.uint256(supply)
+        enc.uint256(self.chain_spec.chain_id())
+        code += enc.get()
+        tx = self.template(sender_address, None, use_nonce=True)
+        tx = self.set_code(tx, code)
+        return self.finalize(tx, tx_format)
+
+
+    @staticmethod
+    def gas(code=None):
+        return 2000000
+
+
+    @staticmethod
+    def bytecode():
+        if PermitToken.__bytecode == None:
+            fp = os.path.join(data_dir, 'PermitToken.bin')
+            if not os.path.exists(fp):
+                raise FileNotFoundError('{} is missing, build it with make -C solidity install'.format(fp))
+            f = open(fp, 'r')
+            PermitToken.__bytecode = f.read()
+            f.close()
+        return PermitToken.__bytecode
+
+
+    def permit(self, contract_address, sender_address, permit, tx_format=TxFormat.JSONRPC, id_generator=None):
+        """Submit a signed permit to the token.
+
+        Any account may submit the permit, not only its owner.
+
+        :param permit: Signed permit
+        :type permit: evm_tokenvote.permit.Permit
+        """
+        data = '0x' + encode('permit(address,address,uint256,uint256,uint8,bytes32,bytes32)', permit.owner, permit.spender, permit.value, permit.deadline, permit.v, permit.r, permit.s)
+        tx = self.template(sender_address, contract_address, use_nonce=True)
+        tx = self.set_code(tx, data)
+        tx = self.finalize(tx, tx_format, id_generator=id_generator)
+        return tx
+
+
+    def domain_separator(self, contract_address, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_call'
+        data = '0x' + encode('DOMAIN_SEPARATOR()')
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        o['params'].append(self.normalize(tx))
+        o['params'].append(to_blockheight_param(height))
+        o = j.finalize(o)
+        return o
+
+
+    def nonces(self, contract_address, owner_address, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_call'
+        data = '0x' + encode('nonces(address)', owner_address)
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        o['params'].append(self.normalize(tx))
+        o['params'].append(to_blockheight_param(height))
+        o = j.finalize(o)
+        return o
+
+
+    @classmethod
+    def parse_domain_separator(self, v):
+        return bytes.fromhex(strip_0x(v))
+
+
+    @classmethod
+    def parse_nonces(self, v):
+        return int(strip_0x(v), 16)
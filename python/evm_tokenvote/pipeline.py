@@ -0,0 +1,444 @@
+# standard imports
+import os
+import logging
+import time
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+# external imports
+from chainlib.eth.nonce import (
+    nonce as nonce_query,
+    OverrideNonceOracle,
+)
+from chainlib.eth.tx import (
+    TxFormat,
+    raw,
+    receipt,
+    TxResult,
+)
+from chainlib.jsonrpc import IntSequenceGenerator
+from chainlib.status import Status
+from eth_erc20 import ERC20
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.voter import Voter
+from evm_tokenvote.batch import JSONRPCBatch
+
+logg = logging.getLogger(__name__)
+
+
+class VoteOrder:
+    """A vote to be cast on behalf of an account.
+
+    :param account: Voting account
+    :type account: str
+    :param value: Token value to vote with
+    :type value: int
+    :param option: Option index, or None to vote without option
+    :type option: int
+    :param cancel: Vote to cancel the proposal instead
+    :type cancel: bool
+    :param approve: Sign a token approval for the vote value before the vote
+    :type approve: bool
+    :param rollover: Vote with escrow rolled over from a finalized proposal. No token approval is signed.
+    :type rollover: bool
+    """
+
+    __slots__ = ('account', 'value', 'option', 'cancel', 'approve', 'rollover')
+
+    def __init__(self, account, value, option=None, cancel=False, approve=True, rollover=False):
+        if rollover and cancel:
+            raise ValueError('cancel votes cannot use rollover')
+        self.account = account
+        self.value = value
+        self.option = option
+        self.cancel = cancel
+        self.approve = approve and not rollover
+        self.rollover = rollover
+
+
+class VoteResult:
+
+    __slots__ = ('order', 'nonce', 'tx_hashes', 'receipts', 'stage', 'error')
+
+    def __init__(self, order):
+        self.order = order
+        self.nonce = None
+        self.tx_hashes = []
+        self.receipts = []
+        self.stage = None
+        self.error = None
+
+
+    def ok(self):
+        if self.error != None or len(self.receipts) != len(self.tx_hashes):
+            return False
+        for v in self.receipts:
+            if v == None or v.status != Status.SUCCESS:
+                return False
+        return True
+
+
+    def fail(self, stage, error):
+        self.stage = stage
+        self.error = error
+        logg.debug('vote for {} failed in stage {}: {}'.format(self.order.account, stage, error))
+
+
+class StageStats:
+
+    __slots__ = ('count', 'failed', 'elapsed')
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+
+    def __str__(self):
+        return '{} ok {} failed in {:.3f}s'.format(self.count - self.failed, self.failed, self.elapsed)
+
+
+class PipelineStats:
+
+    stages = ['nonce', 'sign', 'send', 'receipt']
+
+    def __init__(self):
+        self.stage = {}
+        for v in self.stages:
+            self.stage[v] = StageStats()
+        self.txs = 0
+        self.elapsed = 0.0
+
+
+    def txs_per_second(self):
+        if self.elapsed == 0:
+            return 0.0
+        return self.txs / self.elapsed
+
+
+    def __str__(self):
+        s = '{} txs in {:.3f}s, {:.1f} txs/s'.format(self.txs, self.elapsed, self.txs_per_second())
+        for v in self.stages:
+            s += '; {} {}'.format(v, self.stage[v])
+        return s
+
+
+def sign_vote_order(chain_spec, signer, token_address, voter_address, order, nonce, gas_oracle=None):
+    """Sign the transactions for a single vote order, starting at the given nonce.
+
+    Module level function, so that it can be dispatched to a process pool.
+
+    :rtype: list of tuple
+    :returns: Transaction hash and signed transaction, in nonce order
+    """
+    nonce_oracle = OverrideNonceOracle(order.account, nonce)
+    r = []
+    if order.approve:
+        c = ERC20(chain_spec, signer=signer, nonce_oracle=nonce_oracle, gas_oracle=gas_oracle)
+        r.append(c.approve(token_address, order.account, voter_address, order.value, tx_format=TxFormat.RLP_SIGNED))
+    c = Voter(chain_spec, signer=signer, nonce_oracle=nonce_oracle, gas_oracle=gas_oracle)
+    if order.cancel:
+        r.append(c.vote_cancel(voter_address, order.account, order.value, tx_format=TxFormat.RLP_SIGNED))
+    elif order.rollover:
+        r.append(c.vote_rollover(voter_address, order.account, order.value, option=order.option, tx_format=TxFormat.RLP_SIGNED))
+    else:
+        r.append(c.vote(voter_address, order.account, order.value, option=order.option, tx_format=TxFormat.RLP_SIGNED))
+    return r
+
+
+class VotePipeline:
+    """Casts votes for many accounts, in four stages.
+
+    1. Next nonces of all accounts are fetched in JSON-RPC batches.
+    2. The approve and vote transactions of each account are signed in an executor. Signing is bound by the interpreter lock, so by default a concurrent.futures.ProcessPoolExecutor is used if there is more than one CPU and the signer and gas oracle can be pickled. Otherwise transactions are signed in the calling thread.
+    3. Signed transactions are sent in JSON-RPC batches, in rounds holding at most one transaction per account. At most max_in_flight transactions are sent before their receipts are collected.
+    4. Receipts are fetched in JSON-RPC batches, polling until all are available or receipt_timeout is reached.
+
+    A failure only affects the account it occurs for. If a transaction of an account fails to be signed or sent, its nonce is not used, and the later transactions of the account are not sent, as they would be stuck behind the nonce gap.
+
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param signer: Transaction signer holding the keys of all voting accounts
+    :type signer: funga.eth.signer.EIP155Signer
+    :param token_address: Vote token address
+    :type token_address: str
+    :param voter_address: Voter contract address
+    :type voter_address: str
+    :param batch_size: Maximum number of requests per JSON-RPC batch
+    :type batch_size: int
+    :param max_in_flight: Maximum number of sent transactions awaiting receipts
+    :type max_in_flight: int
+    :param executor: Executor to sign transactions in, instead of the default
+    :type executor: concurrent.futures.Executor
+    """
+    def __init__(self, chain_spec, conn, signer, token_address, voter_address, gas_oracle=None, executor=None, batch_size=100, max_in_flight=500, receipt_timeout=60.0, receipt_poll_interval=1.0):
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError('batch size and max in flight must be positive')
+        self.chain_spec = chain_spec
+        self.conn = conn
+        self.signer = signer
+        self.token_address = token_address
+        self.voter_address = voter_address
+        self.gas_oracle = gas_oracle
+        self.executor = executor
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.receipt_timeout = receipt_timeout
+        self.receipt_poll_interval = receipt_poll_interval
+        self.id_generator = IntSequenceGenerator()
+
+
+    def __batches(self, items):
+        for i in range(0, len(items), self.batch_size):
+            yield items[i:i+self.batch_size]
+
+
+    def nonces(self, results, stats):
+        """Fetch the next nonce of each account.
+
+        Accounts appearing in several orders get consecutive nonce ranges.
+        """
+        t = time.monotonic()
+        accounts = []
+        for v in results:
+            if v.order.account not in accounts:
+                accounts.append(v.order.account)
+        nonces = {}
+        errors = {}
+        for accounts_batch in self.__batches(accounts):
+            batch = JSONRPCBatch()
+            ids = {}
+            for v in accounts_batch:
+                ids[v] = batch.add(nonce_query(v, id_generator=self.id_generator))
+            batch.do(self.conn)
+            for v in accounts_batch:
+                try:
+                    nonces[v] = int(strip_0x(batch.result(ids[v])), 16)
+                except Exception as e:
+                    errors[v] = e
+
+        for v in results:
+            stats.count += 1
+            account = v.order.account
+            if account in errors:
+                v.fail('nonce', errors[account])
+                stats.failed += 1
+                continue
+            v.nonce = nonces[account]
+            nonces[account] += 1
+            if v.order.approve:
+                nonces[account] += 1
+        stats.elapsed += time.monotonic() - t
+
+
+    def default_executor(self):
+        """Create the executor to sign transactions in, if none was given.
+
+        :rtype: concurrent.futures.Executor
+        :returns: Process pool, or None to sign in the calling thread
+        """
+        cpus = os.cpu_count()
+        if cpus == None or cpus < 2:
+            return None
+        try:
+            pickle.dumps((self.signer, self.gas_oracle,))
+        except Exception as e:
+            logg.debug('signing in calling thread, signer or gas oracle cannot be pickled: {}'.format(e))
+            return None
+        return ProcessPoolExecutor(max_workers=cpus)
+
+
+    def sign(self, results, stats, blocked=None):
+        """Sign the transactions of all orders that have a nonce.
+
+        :param blocked: Lowest unused nonce by account, after a failure. Orders with a later nonce are dropped, and orders that fail to be signed are added.
+        :type blocked: dict
+        :rtype: list of tuple
+        :returns: Vote result and signed transactions, in order of input
+        """
+        t = time.monotonic()
+        if blocked == None:
+            blocked = {}
+        executor = self.executor
+        if executor == None:
+            executor = self.default_executor()
+        futures = []
+        for v in results:
+            if v.error != None:
+                continue
+            args = (self.chain_spec, self.signer, self.token_address, self.voter_address, v.order, v.nonce,)
+            if executor == None:
+                futures.append((v, None, args,))
+            else:
+                futures.append((v, executor.submit(sign_vote_order, *args, gas_oracle=self.gas_oracle), args,))
+        pending = []
+        for (v, future, args) in futures:
+            stats.count += 1
+            try:
+                if future == None:
+                    txs = sign_vote_order(*args, gas_oracle=self.gas_oracle)
+                else:
+                    txs = future.result()
+            except Exception as e:
+                v.fail('sign', e)
+                stats.failed += 1
+                account = v.order.account
+                blocked[account] = min(v.nonce, blocked.get(account, v.nonce))
+                continue
+            pending.append((v, txs,))
+
+        signed = []
+        for (v, txs) in pending:
+            nonce = blocked.get(v.order.account)
+            if nonce != None and v.nonce > nonce:
+                v.fail('sign', 'nonce {} of {} failed, later nonce {} would not be reached'.format(nonce, v.order.account, v.nonce))
+                stats.failed += 1
+                continue
+            signed.append((v, txs,))
+        if executor != None and self.executor == None:
+            executor.shutdown()
+        stats.elapsed += time.monotonic() - t
+        return signed
+
+
+    def send(self, signed, stats, blocked=None):
+        """Send signed transactions.
+
+        Each round sends the next transaction of every account, so that a transaction is only sent after the transactions before it in nonce order were accepted.
+
+        :param blocked: Lowest unused nonce by account, after a failure. Transactions with a later nonce are not sent, and transactions that fail to be sent are added.
+        :type blocked: dict
+        :rtype: list of tuple
+        :returns: Vote result and transaction hash of each sent transaction
+        """
+        t = time.monotonic()
+        if blocked == None:
+            blocked = {}
+        queues = {}
+        for (v, vtxs) in signed:
+            queue = queues.setdefault(v.order.account, [])
+            for i, tx in enumerate(vtxs):
+                queue.append((v, tx, v.nonce + i,))
+        sent = []
+        while len(queues) > 0:
+            txs = []
+            for account in list(queues.keys()):
+                queue = queues[account]
+                (v, tx, nonce) = queue.pop(0)
+                if len(queue) == 0:
+                    del queues[account]
+                if nonce > blocked.get(account, nonce):
+                    # an earlier nonce of the account was not used, and this transaction would wait for it.
+                    stats.count += 1
+                    stats.failed += 1
+                    if v.error == None:
+                        v.fail('send', 'nonce {} of {} failed, later nonce {} would not be reached'.format(blocked[account], account, nonce))
+                    continue
+                txs.append((v, tx, nonce,))
+
+            for txs_batch in self.__batches(txs):
+                batch = JSONRPCBatch()
+                ids = []
+                for (v, tx, nonce) in txs_batch:
+                    ids.append(batch.add(raw(tx[1], id_generator=self.id_generator)))
+                batch.do(self.conn)
+                for i, (v, tx, nonce) in enumerate(txs_batch):
+                    stats.count += 1
+                    try:
+                        batch.result(ids[i])
+                    except Exception as e:
+                        v.fail('send', e)
+                        stats.failed += 1
+                        account = v.order.account
+                        blocked[account] = min(nonce, blocked.get(account, nonce))
+                        continue
+                    v.tx_hashes.append(tx[0])
+                    sent.append((v, tx[0],))
+        stats.elapsed += time.monotonic() - t
+        return sent
+
+
+    def receipts(self, sent, stats):
+        t = time.monotonic()
+        pending = list(sent)
+        deadline = time.monotonic() + self.receipt_timeout
+        while True:
+            missing = []
+            for sent_batch in self.__batches(pending):
+                batch = JSONRPCBatch()
+                ids = []
+                for (v, tx_hash) in sent_batch:
+                    ids.append(batch.add(receipt(tx_hash, id_generator=self.id_generator)))
+                batch.do(self.conn)
+                for i, (v, tx_hash) in enumerate(sent_batch):
+                    try:
+                        r = batch.result(ids[i])
+                    except Exception as e:
+                        stats.count += 1
+                        stats.failed += 1
+                        v.fail('receipt', e)
+                        continue
+                    if r == None:
+                        missing.append((v, tx_hash,))
+                        continue
+                    stats.count += 1
+                    r = TxResult(r)
+                    v.receipts.append(r)
+                    if r.status != Status.SUCCESS:
+                        stats.failed += 1
+                        if v.error == None:
+                            v.fail('receipt', 'transaction {} reverted'.format(tx_hash))
+            pending = missing
+            if len(pending) == 0:
+                break
+            if time.monotonic() > deadline:
+                for (v, tx_hash) in pending:
+                    stats.count += 1
+                    stats.failed += 1
+                    v.fail('receipt', 'timeout waiting for receipt of {}'.format(tx_hash))
+                break
+            time.sleep(self.receipt_poll_interval)
+        stats.elapsed += time.monotonic() - t
+
+
+    def run(self, orders):
+        """Cast all votes.
+
+        :param orders: Vote orders
+        :type orders: list of evm_tokenvote.pipeline.VoteOrder
+        :rtype: tuple
+        :returns: List of evm_tokenvote.pipeline.VoteResult in order of input, and evm_tokenvote.pipeline.PipelineStats
+        """
+        stats = PipelineStats()
+        t = time.monotonic()
+        results = [VoteResult(v) for v in orders]
+        # lowest nonce by account that failed to be signed or sent, and so remains unused.
+        blocked = {}
+
+        self.nonces(results, stats.stage['nonce'])
+        signed = self.sign(results, stats.stage['sign'], blocked)
+
+        # orders are sent in windows of max_in_flight transactions, and the receipts of a window are collected before the next is sent.
+        window = []
+        window_txs = 0
+        for v in signed:
+            window.append(v)
+            window_txs += len(v[1])
+            if window_txs >= self.max_in_flight:
+                sent = self.send(window, stats.stage['send'], blocked)
+                self.receipts(sent, stats.stage['receipt'])
+                window = []
+                window_txs = 0
+        if len(window) > 0:
+            sent = self.send(window, stats.stage['send'], blocked)
+            self.receipts(sent, stats.stage['receipt'])
+
+        for v in results:
+            stats.txs += len(v.receipts)
+        stats.elapsed = time.monotonic() - t
+        logg.info(str(stats))
+        return (results, stats,)
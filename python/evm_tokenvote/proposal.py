@@ -0,0 +1,51 @@
+# standard imports
+import enum
+
+
+class ProposalState(enum.IntFlag):
+    INIT = 1
+    FINAL = 2
+    SCANNED = 4
+    INSUFFICIENT = 8
+    TIED = 16
+    SUPPLYCHANGE = 32
+    IMMEDIATE = 64
+    CANCELLED = 128
+
+
+class Proposal:
+
+    __slots__ = (
+        'description_digest',
+        'supply',
+        'total',
+        'block_deadline',
+        'target_vote_ppm',
+        'cancel_votes',
+        'proposer',
+        'state',
+        'lead',
+        'serial',
+        'options',
+        'option_votes',
+            )
+   
+    def __init__(self, description_digest, *args, **kwargs):
+        self.description_digest = description_digest
+        self.supply = kwargs.get('supply')
+        self.total = kwargs.get('total')
+        self.block_deadline = kwargs.get('block_deadline')
+        self.target_vote_ppm = kwargs.get('target_vote_ppm')
+        self.cancel_votes = kwargs.get('cancel_votes')
+        self.proposer = kwargs.get('proposer')
+        self.state = kwargs.get('state')
+        if self.state != None:
+            self.state = ProposalState(self.state)
+        self.lead = kwargs.get('lead')
+        self.serial = kwargs.get('serial')
+        self.options = kwargs.get('options')
+        self.option_votes = kwargs.get('option_votes')
+
+
+    def __str__(self):
+        return "proposal description {} total {} supply {}".format(self.description_digest, self.total, self.supply)
@@ -0,0 +1,113 @@
+# standard imports
+import logging
+
+# external imports
+from chainlib.eth.constant import ZERO_ADDRESS
+from chainlib.jsonrpc import IntSequenceGenerator
+from chainlib.error import RPCException
+
+# local imports
+from evm_tokenvote.voter import Voter
+from evm_tokenvote.decode import decode_proposal
+from evm_tokenvote.batch import JSONRPCBatch
+
+logg = logging.getLogger(__name__)
+
+
+class ProposalSnapshot:
+    """View of a proposal together with the contract state it is voted in.
+
+    :param proposal: The proposal
+    :type proposal: evm_tokenvote.Proposal
+    :param option_count: Number of options in the proposal
+    :type option_count: int
+    :param current: The proposal currently being voted on, or None if no proposal is active
+    :type current: evm_tokenvote.Proposal
+    :param block_wait_limit: Maximum blocks wait allowed for new proposals (0 if no limit)
+    :type block_wait_limit: int
+    """
+    def __init__(self, proposal, option_count=0, current=None, block_wait_limit=0):
+        self.proposal = proposal
+        self.option_count = option_count
+        self.current = current
+        self.block_wait_limit = block_wait_limit
+
+
+    def __str__(self):
+        return 'snapshot {} options {} current {}'.format(self.proposal, self.option_count, self.current)
+
+
+class SnapshotReader:
+    """Reads proposal snapshots using JSON-RPC batches.
+
+    All contract calls for one or several snapshots are sent in a single batch. Option descriptions, option votes and the option count are decoded from the getProposal response, so a snapshot costs one round trip and one call per proposal regardless of the number of options.
+
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    """
+    def __init__(self, chain_spec, conn, sender_address=ZERO_ADDRESS):
+        self.voter = Voter(chain_spec)
+        self.conn = conn
+        self.sender_address = sender_address
+        self.id_generator = IntSequenceGenerator()
+
+
+    def __add_proposal(self, batch, contract_address, proposal_idx):
+        return batch.add(self.voter.get_proposal(contract_address, proposal_idx, sender_address=self.sender_address, id_generator=self.id_generator))
+
+
+    def __add_contract(self, batch, contract_address):
+        return (
+            batch.add(self.voter.current_proposal(contract_address, sender_address=self.sender_address, id_generator=self.id_generator)),
+            batch.add(self.voter.block_wait_limit(contract_address, sender_address=self.sender_address, id_generator=self.id_generator)),
+                )
+
+
+    def __contract_state(self, batch, ids):
+        current = None
+        try:
+            current = decode_proposal(batch.result(ids[0]))
+        except RPCException as e:
+            logg.debug('no current proposal: {}'.format(e))
+        block_wait_limit = int(batch.result(ids[1]), 16)
+        return (current, block_wait_limit,)
+
+
+    def read(self, contract_address, proposal_idx):
+        """Read a single proposal snapshot.
+
+        :param contract_address: Voter contract address
+        :type contract_address: str
+        :param proposal_idx: Proposal index
+        :type proposal_idx: int
+        :rtype: evm_tokenvote.snapshot.ProposalSnapshot
+        :returns: Snapshot
+        """
+        return self.read_many(contract_address, [proposal_idx])[0]
+
+
+    def read_many(self, contract_address, proposal_idxs):
+        """Read snapshots for several proposals of the same contract in one batch.
+
+        :param contract_address: Voter contract address
+        :type contract_address: str
+        :param proposal_idxs: Proposal indices
+        :type proposal_idxs: list of int
+        :rtype: list of evm_tokenvote.snapshot.ProposalSnapshot
+        :returns: Snapshots, in the order of the given indices
+        """
+        batch = JSONRPCBatch()
+        contract_ids = self.__add_contract(batch, contract_address)
+        proposal_ids = []
+        for proposal_idx in proposal_idxs:
+            proposal_ids.append(self.__add_proposal(batch, contract_address, proposal_idx))
+        batch.do(self.conn)
+
+        (current, block_wait_limit) = self.__contract_state(batch, contract_ids)
+        r = []
+        for i, proposal_idx in enumerate(proposal_idxs):
+            proposal = decode_proposal(batch.result(proposal_ids[i]), serial=proposal_idx)
+            r.append(ProposalSnapshot(proposal, option_count=len(proposal.options), current=current, block_wait_limit=block_wait_limit))
+        return r
@@ -0,0 +1,117 @@
+# standard imports
+import logging
+
+# external imports
+from chainlib.eth.constant import ZERO_ADDRESS
+from chainlib.jsonrpc import IntSequenceGenerator
+
+# local imports
+from evm_tokenvote.voter import Voter
+from evm_tokenvote.decode import (
+    decode_proposal_page,
+    decode_options,
+    decode_vote_counts,
+)
+from evm_tokenvote.batch import JSONRPCBatch
+
+logg = logging.getLogger(__name__)
+
+
+def iterate_proposals(conn, chain_spec, contract_address, start=0, page_size=100, prefetch=1, sender_address=ZERO_ADDRESS):
+    """Stream proposals from a Voter contract, in order of index.
+
+    Proposals are read with getProposals in pages of page_size. Each round trip requests prefetch consecutive pages in one JSON-RPC batch.
+
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param start: Index of first proposal to read
+    :type start: int
+    :param page_size: Number of proposals to request per call
+    :type page_size: int
+    :param prefetch: Number of pages to request per round trip
+    :type prefetch: int
+    :rtype: generator of evm_tokenvote.Proposal
+    """
+    if page_size < 1 or prefetch < 1:
+        raise ValueError('page size and prefetch must be positive')
+    c = Voter(chain_spec)
+    id_generator = IntSequenceGenerator()
+    cursor = start
+    while True:
+        batch = JSONRPCBatch()
+        ids = []
+        for i in range(prefetch):
+            o = c.get_proposals(contract_address, cursor + (i * page_size), page_size, sender_address=sender_address, id_generator=id_generator)
+            ids.append(batch.add(o))
+        batch.do(conn)
+        logg.debug('requested {} proposal pages from {}'.format(prefetch, cursor))
+
+        for i in range(prefetch):
+            page = decode_proposal_page(batch.result(ids[i]), serial=cursor + (i * page_size))
+            for proposal in page:
+                yield proposal
+            if len(page) < page_size:
+                return
+        cursor += prefetch * page_size
+
+
+def iterate_options(conn, chain_spec, contract_address, proposal_idx, start=0, page_size=1000, prefetch=1, votes=True, sender_address=ZERO_ADDRESS):
+    """Stream the options of a proposal, in order of option index.
+
+    Options are read with getOptions, and vote counts with voteCounts, in pages of page_size. Each round trip requests prefetch consecutive pages in one JSON-RPC batch. Unlike getProposal, the response size does not grow with the number of options.
+
+    :param conn: RPC connection
+    :type conn: chainlib.connection.RPCConnection
+    :param chain_spec: Chain spec
+    :type chain_spec: chainlib.chain.ChainSpec
+    :param contract_address: Voter contract address
+    :type contract_address: str
+    :param proposal_idx: Proposal index
+    :type proposal_idx: int
+    :param start: Index of first option to read
+    :type start: int
+    :param page_size: Number of options to request per call
+    :type page_size: int
+    :param prefetch: Number of pages to request per round trip
+    :type prefetch: int
+    :param votes: If False, vote counts are not read, and the vote count of each option is None
+    :type votes: bool
+    :rtype: generator of tuple
+    :returns: Option index, option description in hex, and vote count
+    """
+    if page_size < 1 or prefetch < 1:
+        raise ValueError('page size and prefetch must be positive')
+    c = Voter(chain_spec)
+    id_generator = IntSequenceGenerator()
+    cursor = start
+    while True:
+        batch = JSONRPCBatch()
+        ids = []
+        for i in range(prefetch):
+            offset = cursor + (i * page_size)
+            o = c.get_options(contract_address, proposal_idx, offset, page_size, sender_address=sender_address, id_generator=id_generator)
+            option_id = batch.add(o)
+            vote_id = None
+            if votes:
+                o = c.vote_counts(contract_address, proposal_idx, offset, page_size, sender_address=sender_address, id_generator=id_generator)
+                vote_id = batch.add(o)
+            ids.append((option_id, vote_id,))
+        batch.do(conn)
+        logg.debug('requested {} option pages from {} of proposal {}'.format(prefetch, cursor, proposal_idx))
+
+        for i in range(prefetch):
+            offset = cursor + (i * page_size)
+            options = decode_options(batch.result(ids[i][0]))
+            if votes:
+                vote_counts = decode_vote_counts(batch.result(ids[i][1]))
+            else:
+                vote_counts = [None] * len(options)
+            for j in range(len(options)):
+                yield (offset + j, options[j], vote_counts[j],)
+            if len(options) < page_size:
+                return
+        cursor += prefetch * page_size
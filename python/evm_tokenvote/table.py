@@ -0,0 +1,195 @@
+# standard imports
+import logging
+from array import array
+
+# external imports
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.proposal import (
+    Proposal,
+    ProposalState,
+)
+from evm_tokenvote.decode import (
+    to_buffer,
+    word,
+    checksum_address,
+)
+
+logg = logging.getLogger(__name__)
+
+
+class ProposalTable:
+    """Columnar store for many proposals.
+
+    Small scalar fields are kept in typed arrays. Token amounts are 256 bit values, and are kept as consecutive 32 byte big-endian words in a bytearray.
+
+    Options are not stored.
+
+    Filter methods return an array of row indices, and can be chained by passing the result of one filter as the rows argument of the next.
+    """
+    def __init__(self):
+        self.serial = array('q')
+        self.description_digest = bytearray()
+        self.proposer = bytearray()
+        self.supply = bytearray()
+        self.total = bytearray()
+        self.cancel_votes = bytearray()
+        self.block_deadline = array('Q')
+        self.target_vote_ppm = array('L')
+        self.state = array('B')
+
+
+    def __len__(self):
+        return len(self.state)
+
+
+    def add(self, proposal):
+        """Add a proposal object as a row.
+
+        :param proposal: Proposal
+        :type proposal: evm_tokenvote.Proposal
+        :rtype: int
+        :returns: Row index
+        """
+        serial = proposal.serial
+        if serial == None:
+            serial = -1
+        self.serial.append(serial)
+        self.description_digest += bytes.fromhex(strip_0x(proposal.description_digest))
+        self.proposer += bytes.fromhex(strip_0x(proposal.proposer))
+        self.supply += proposal.supply.to_bytes(32, 'big')
+        self.total += proposal.total.to_bytes(32, 'big')
+        self.cancel_votes += proposal.cancel_votes.to_bytes(32, 'big')
+        self.block_deadline.append(proposal.block_deadline)
+        self.target_vote_ppm.append(proposal.target_vote_ppm)
+        self.state.append(proposal.state)
+        return len(self.state) - 1
+
+
+    def add_response(self, v, serial=None):
+        """Add a row directly from a getProposal response, without creating a proposal object.
+
+        :param v: Response data, as hex or bytes
+        :type v: str, bytes or memoryview
+        :param serial: Proposal index
+        :type serial: int
+        :rtype: int
+        :returns: Row index
+        """
+        b = to_buffer(v)
+        base = word(b, 0)
+        if serial == None:
+            serial = -1
+        self.serial.append(serial)
+        self.description_digest += b[base:base+32]
+        self.cancel_votes += b[base+96:base+128]
+        self.supply += b[base+128:base+160]
+        self.total += b[base+160:base+192]
+        self.block_deadline.append(word(b, base + 192))
+        self.target_vote_ppm.append(word(b, base + 224))
+        self.proposer += b[base+268:base+288]
+        self.state.append(b[base+319])
+        return len(self.state) - 1
+
+
+    def extend(self, proposals):
+        for proposal in proposals:
+            self.add(proposal)
+
+
+    def supply_at(self, i):
+        return int.from_bytes(self.supply[i*32:(i+1)*32], 'big')
+
+
+    def total_at(self, i):
+        return int.from_bytes(self.total[i*32:(i+1)*32], 'big')
+
+
+    def cancel_votes_at(self, i):
+        return int.from_bytes(self.cancel_votes[i*32:(i+1)*32], 'big')
+
+
+    def get(self, i):
+        """Build a proposal object from a row.
+
+        :param i: Row index
+        :type i: int
+        :rtype: evm_tokenvote.Proposal
+        :returns: Proposal
+        """
+        serial = self.serial[i]
+        if serial < 0:
+            serial = None
+        return Proposal(self.description_digest[i*32:(i+1)*32].hex(),
+                        cancel_votes=self.cancel_votes_at(i),
+                        supply=self.supply_at(i),
+                        total=self.total_at(i),
+                        block_deadline=self.block_deadline[i],
+                        target_vote_ppm=self.target_vote_ppm[i],
+                        proposer=checksum_address(self.proposer[i*20:(i+1)*20].hex()),
+                        state=self.state[i],
+                        serial=serial,
+                        )
+
+
+    def __getitem__(self, i):
+        return self.get(i)
+
+
+    def select(self, rows):
+        """Generate proposal objects for the given rows.
+
+        :param rows: Row indices
+        :type rows: iterable of int
+        :rtype: generator of evm_tokenvote.Proposal
+        """
+        for i in rows:
+            yield self.get(i)
+
+
+    def with_state(self, flags, rows=None, match_all=True):
+        """Filter rows by proposal state.
+
+        :param flags: State flags to match
+        :type flags: evm_tokenvote.ProposalState
+        :param rows: Only consider these rows
+        :type rows: iterable of int
+        :param match_all: If set, all flags must be set. Otherwise at least one must be set.
+        :type match_all: bool
+        :rtype: array.array
+        :returns: Matching row indices
+        """
+        flags = int(flags)
+        state = self.state
+        if rows == None:
+            rows = range(len(state))
+        if match_all:
+            return array('L', [i for i in rows if state[i] & flags == flags])
+        return array('L', [i for i in rows if state[i] & flags > 0])
+
+
+    def without_state(self, flags, rows=None):
+        """Filter rows where none of the given state flags are set.
+        """
+        flags = int(flags)
+        state = self.state
+        if rows == None:
+            rows = range(len(state))
+        return array('L', [i for i in rows if state[i] & flags == 0])
+
+
+    def deadline_between(self, start, end, rows=None):
+        """Filter rows by block deadline.
+
+        :param start: Lowest block deadline to include
+        :type start: int
+        :param end: Block deadline to include up to, but not including
+        :type end: int
+        :rtype: array.array
+        :returns: Matching row indices
+        """
+        block_deadline = self.block_deadline
+        if rows == None:
+            rows = range(len(block_deadline))
+        return array('L', [i for i in rows if block_deadline[i] >= start and block_deadline[i] < end])
@@ -16,6 +16,8 @@ from eth_accounts_index.registry import AccountRegistry
 
 # local imports
 from evm_tokenvote import Voter
+from evm_tokenvote.permit import PermitToken
+from .rpc import VoterTestRPCConnection
 
 logg = logging.getLogger(__name__)
 
@@ -30,6 +32,7 @@ class TestEvmVoteAccounts(TestGiftableToken):
 
     def setUp(self):
         super(TestEvmVoteAccounts, self).setUp()
+        self.rpc = VoterTestRPCConnection(None, self.helper, self.signer)
 
         self.alice = self.accounts[1]
         self.bob = self.accounts[2]
@@ -124,3 +127,36 @@ class TestEvmVoteRegistry(TestEvmVoteAccounts):
         self.assertEqual(r['status'], 1)
         self.voter_address = to_checksum_address(r['contract_address'])
         logg.debug('published voter on address {} with hash {}'.format(self.voter_address, tx_hash))
+
+
+class TestEvmVotePermit(TestEvmVoteAccounts):
+    """Publishes a Voter contract on a token implementing EIP-2612 permit.
+
+    The token address replaces the default token in self.token_address, and its EIP-712 domain separator is in self.domain_separator.
+    """
+
+    def setUp(self):
+        super(TestEvmVotePermit, self).setUp()
+
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = PermitToken(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.constructor(self.accounts[0], self.initial_supply)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.token_address = to_checksum_address(r['contract_address'])
+        logg.debug('published permit token on address {} with hash {}'.format(self.token_address, tx_hash))
+
+        o = c.domain_separator(self.token_address, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.domain_separator = c.parse_domain_separator(r)
+
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.constructor(self.accounts[0], self.token_address)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.voter_address = to_checksum_address(r['contract_address'])
+        logg.debug('published voter on address {} with hash {}'.format(self.voter_address, tx_hash))
@@ -0,0 +1,81 @@
+# ABI encoders for contract call results, used to serve Voter responses without a contract.
+
+some_address = '185cbce7650ff7ad3b587e26b2877d95568805e3'
+
+# number of words in the static part of an ABI encoded Proposal struct, one per struct field.
+PROPOSAL_HEAD_WORDS = 12
+
+
+def encode_word(v):
+    """ABI encode an integer, or a hex value, as a single word.
+
+    :param v: Value
+    :type v: int or str
+    :rtype: str
+    :returns: Hex encoded word, without 0x prefix
+    """
+    if isinstance(v, int):
+        return v.to_bytes(32, 'big').hex()
+    return v.rjust(64, '0')
+
+
+def encode_proposal_struct(description, options=[], option_votes=[], cancel_votes=0, supply=0, total=0, block_deadline=0, target_vote_ppm=0, proposer=some_address, state=0, lead=0, internals=False):
+    """ABI encode a Proposal struct, in the field order of the contract.
+
+    :rtype: str
+    :returns: Hex encoded struct, without 0x prefix
+    """
+    head = [
+        description,
+        PROPOSAL_HEAD_WORDS * 32,
+        (PROPOSAL_HEAD_WORDS + 1 + len(options)) * 32,
+        cancel_votes,
+        supply,
+        total,
+        block_deadline,
+        target_vote_ppm,
+        proposer,
+        state,
+        lead,
+        int(internals),
+            ]
+    tail = [len(options)] + options + [len(option_votes)] + option_votes
+    return ''.join([encode_word(v) for v in head + tail])
+
+
+def encode_proposal(description, **kwargs):
+    """ABI encode a Proposal struct as returned by getProposal and getCurrentProposal.
+
+    Keyword arguments are the same as for encode_proposal_struct.
+
+    :rtype: str
+    :returns: Hex encoded response
+    """
+    return '0x' + encode_word(32) + encode_proposal_struct(description, **kwargs)
+
+
+def encode_proposal_page(structs):
+    """ABI encode a list of Proposal structs as returned by getProposals.
+
+    :param structs: Structs encoded with encode_proposal_struct
+    :type structs: list of str
+    :rtype: str
+    :returns: Hex encoded response
+    """
+    offsets = []
+    offset = len(structs) * 32
+    for v in structs:
+        offsets.append(encode_word(offset))
+        offset += int(len(v) / 2)
+    return '0x' + encode_word(32) + encode_word(len(structs)) + ''.join(offsets) + ''.join(structs)
+
+
+def encode_word_array(vs):
+    """ABI encode a dynamic array of words, e.g. as returned by getOptions and voteCounts.
+
+    :param vs: Values
+    :type vs: list of int or str
+    :rtype: str
+    :returns: Hex encoded response
+    """
+    return '0x' + encode_word(32) + encode_word(len(vs)) + ''.join([encode_word(v) for v in vs])
@@ -0,0 +1,292 @@
+# standard imports
+import logging
+import json
+
+# external imports
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.eth.tx import (
+    receipt,
+    TxFormat,
+)
+from chainlib.eth.gas import Gas
+from chainlib.eth.address import to_checksum_address
+from eth_erc20 import ERC20
+from eth_accounts_index.registry import AccountRegistry
+from hexathon import add_0x
+
+# local imports
+from evm_tokenvote import Voter
+from .base import (
+    TestEvmVoteAccounts,
+    hash_of_foo,
+    hash_of_bar,
+)
+
+logg = logging.getLogger(__name__)
+
+
+class GasRecord:
+
+    __slots__ = ('operation', 'gas', 'params')
+
+    def __init__(self, operation, gas, params):
+        self.operation = operation
+        self.gas = gas
+        self.params = params
+
+
+    def __str__(self):
+        return '{} {} gas {}'.format(self.operation, ' '.join(['{}={}'.format(k, v) for (k, v) in self.params.items()]), self.gas)
+
+
+class GasProfile:
+    """Collects gas usage of contract operations, along with the scale parameters they were executed at.
+
+    :param budgets: Maximum gas allowed per operation, keyed by operation name
+    :type budgets: dict
+    """
+    def __init__(self, budgets=None):
+        if budgets == None:
+            budgets = {}
+        self.budgets = budgets
+        self.records = []
+
+
+    def record(self, operation, gas, **kwargs):
+        o = GasRecord(operation, gas, kwargs)
+        self.records.append(o)
+        logg.debug('gas {}'.format(o))
+        return o
+
+
+    def operations(self):
+        r = []
+        for v in self.records:
+            if v.operation not in r:
+                r.append(v.operation)
+        return r
+
+
+    def over_budget(self):
+        """Get all records exceeding the budget of their operation.
+
+        :rtype: list of evm_tokenvote.unittest.gas.GasRecord
+        """
+        r = []
+        for v in self.records:
+            budget = self.budgets.get(v.operation)
+            if budget != None and v.gas > budget:
+                r.append(v)
+        return r
+
+
+    def curve(self, operation, param, **kwargs):
+        """Get the highest gas usage of an operation for each value of a scale parameter.
+
+        :param operation: Operation name
+        :type operation: str
+        :param param: Scale parameter
+        :type param: str
+        :param kwargs: Only include records matching these parameter values
+        :rtype: list of tuple
+        :returns: Parameter value and gas, ordered by parameter value
+        """
+        r = {}
+        for v in self.records:
+            if v.operation != operation or param not in v.params:
+                continue
+            match = True
+            for (k, kv) in kwargs.items():
+                if v.params.get(k) != kv:
+                    match = False
+                    break
+            if not match:
+                continue
+            x = v.params[param]
+            r[x] = max(r.get(x, 0), v.gas)
+        return sorted(r.items())
+
+
+    def to_json(self):
+        return json.dumps({
+            'budgets': self.budgets,
+            'records': [dict(operation=v.operation, gas=v.gas, **v.params) for v in self.records],
+                })
+
+
+    def to_csv(self):
+        keys = []
+        for v in self.records:
+            for k in v.params.keys():
+                if k not in keys:
+                    keys.append(k)
+        s = ','.join(['operation', 'gas'] + keys) + '\n'
+        for v in self.records:
+            s += ','.join([v.operation, str(v.gas)] + [str(v.params.get(k, '')) for k in keys]) + '\n'
+        return s
+
+
+class TestEvmVoteGas(TestEvmVoteAccounts):
+    """Runs complete proposal rounds at varying scale, recording gas usage of each contract operation in self.gas_profile.
+
+    Each round is executed on a newly published Voter contract.
+
+    A vote on a proposal without options is recorded as vote, and a vote on an option as voteOption.
+    """
+    budgets = None
+
+    def setUp(self):
+        super(TestEvmVoteGas, self).setUp()
+        self.gas_profile = GasProfile(budgets=self.budgets)
+        self.voter_registry_address = None
+        self.proposer_registry_address = None
+        self.voters = []
+        self.registered = []
+
+
+    def transact(self, operation, tx, **kwargs):
+        (tx_hash, o) = tx
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1, '{} failed'.format(operation))
+        if operation != None:
+            self.gas_profile.record(operation, r['gas_used'], **kwargs)
+        return r
+
+
+    def publish_registries(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = AccountRegistry(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        r = self.transact(None, c.constructor(self.accounts[0]))
+        self.voter_registry_address = r['contract_address']
+        self.transact(None, c.add_writer(self.voter_registry_address, self.accounts[0], self.accounts[0]))
+        r = self.transact(None, c.constructor(self.accounts[0]))
+        self.proposer_registry_address = r['contract_address']
+        self.transact(None, c.add_writer(self.proposer_registry_address, self.accounts[0], self.accounts[0]))
+        self.transact(None, c.add(self.proposer_registry_address, self.accounts[0], self.ivan))
+
+
+    def publish_voter(self, registry=False):
+        if registry and self.voter_registry_address == None:
+            self.publish_registries()
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        if registry:
+            tx = c.constructor(self.accounts[0], self.address, voter_registry=self.voter_registry_address, proposer_registry=self.proposer_registry_address)
+        else:
+            tx = c.constructor(self.accounts[0], self.address)
+        r = self.transact(None, tx)
+        return to_checksum_address(r['contract_address'])
+
+
+    def ensure_voters(self, count, value, registry=False):
+        """Provide accounts holding at least value tokens, creating and funding new accounts as needed.
+
+        :rtype: list of str
+        :returns: Voter accounts
+        """
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        gas = Gas(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        token = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        while len(self.voters) < count:
+            address = add_0x(to_checksum_address(self.keystore.new()))
+            self.transact(None, gas.create(self.accounts[0], address, 10**18, tx_format=TxFormat.JSONRPC))
+            self.voters.append(address)
+
+        for v in self.voters[:count]:
+            o = token.balance_of(self.address, v, sender_address=self.accounts[0])
+            balance = int(self.rpc.do(o), 16)
+            if balance < value:
+                self.transact(None, token.transfer(self.address, self.accounts[0], v, value - balance))
+
+        if registry:
+            c = AccountRegistry(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+            for v in self.voters[:count]:
+                if v in self.registered:
+                    continue
+                self.transact(None, c.add(self.voter_registry_address, self.accounts[0], v))
+                self.registered.append(v)
+        return self.voters[:count]
+
+
+    def profile_round(self, option_count=0, voter_count=1, registry=False, value=1000, multi=False):
+        """Execute and profile a complete proposal round: propose, add options, vote, scan, finalize and withdraw.
+
+        :param option_count: Number of options in proposal
+        :type option_count: int
+        :param voter_count: Number of voting accounts
+        :type voter_count: int
+        :param registry: Use voter and proposer registries
+        :type registry: bool
+        :param value: Token value each voter votes with
+        :type value: int
+        :param multi: Create proposal with options in a single proposeMulti transaction, instead of one addOption transaction per option
+        :type multi: bool
+        """
+        voter_address = self.publish_voter(registry=registry)
+        voters = self.ensure_voters(voter_count, value, registry=registry)
+        params = {
+            'options': option_count,
+            'voters': voter_count,
+            'registry': registry,
+                }
+
+        # every transaction of the round before the deadline is mined in a block of its own.
+        block_wait = option_count + (voter_count * 2) + 1
+
+        nonce_oracle = RPCNonceOracle(self.ivan, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        if multi and option_count > 0:
+            self.transact('proposeMulti', c.propose(voter_address, self.ivan, hash_of_foo, block_wait, options=[hash_of_bar] * option_count), **params)
+        else:
+            self.transact('propose', c.propose(voter_address, self.ivan, hash_of_foo, block_wait), **params)
+            for i in range(option_count):
+                self.transact('addOption', c.add_option(voter_address, self.ivan, 0, hash_of_bar), option=i, **params)
+
+        for i, v in enumerate(voters):
+            nonce_oracle = RPCNonceOracle(v, conn=self.conn)
+            token = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+            self.transact(None, token.approve(self.address, v, voter_address, value))
+            voter = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+            operation = 'vote'
+            option = None
+            if option_count > 0:
+                operation = 'voteOption'
+                option = i % option_count
+            self.transact(operation, voter.vote(voter_address, v, value, option=option), voter=i, **params)
+
+        self.backend.mine_blocks(block_wait)
+
+        self.transact('scan', c.scan(voter_address, self.ivan, 0, option_count), **params)
+        self.transact('finalize', c.finalize_vote(voter_address, self.ivan), **params)
+
+        for i, v in enumerate(voters):
+            nonce_oracle = RPCNonceOracle(v, conn=self.conn)
+            voter = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+            self.transact('withdraw', voter.withdraw(voter_address, v), voter=i, **params)
+
+
+    def profile_sweep(self, option_counts=None, voter_counts=None, registry=None, multi=False):
+        """Profile proposal rounds for every combination of the given scale parameters.
+
+        :param option_counts: Numbers of options, default a single round without options
+        :type option_counts: list of int
+        :param voter_counts: Numbers of voters, default one voter
+        :type voter_counts: list of int
+        :param registry: Whether to use registries, default without
+        :type registry: list of bool
+        :rtype: evm_tokenvote.unittest.gas.GasProfile
+        :returns: Gas profile
+        """
+        if option_counts == None:
+            option_counts = [0]
+        if voter_counts == None:
+            voter_counts = [1]
+        if registry == None:
+            registry = [False]
+        for use_registry in registry:
+            for option_count in option_counts:
+                for voter_count in voter_counts:
+                    self.profile_round(option_count=option_count, voter_count=voter_count, registry=use_registry, multi=multi)
+        return self.gas_profile
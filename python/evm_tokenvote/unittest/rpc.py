@@ -0,0 +1,75 @@
+# standard imports
+import logging
+import threading
+
+# external imports
+from chainlib.eth.unittest.base import TestRPCConnection
+from chainlib.eth.address import to_checksum_address
+from hexathon import (
+    add_0x,
+    strip_0x,
+)
+
+logg = logging.getLogger(__name__)
+
+
+def to_ethtester_block(v):
+    if v == None or v in ['latest', 'earliest', 'pending']:
+        return v
+    return int(strip_0x(v), 16)
+
+
+class VoterTestRPCConnection(TestRPCConnection):
+    """Adds the log filter and gas estimation JSON-RPC methods to the eth_tester connection.
+
+    If log_limit is set, eth_getLogs fails when a query would return more than that number of results, as rpc providers commonly do.
+
+    Log queries are serialized, so that the connection can be shared by concurrent readers.
+    """
+    log_limit = 0
+    log_lock = threading.Lock()
+
+    def eth_getLogs(self, p):
+        f = p[0]
+        address = f.get('address')
+        if address != None:
+            address = add_0x(to_checksum_address(strip_0x(address)))
+        with self.log_lock:
+            filter_id = self.backend.create_log_filter(
+                from_block=to_ethtester_block(f.get('fromBlock')),
+                to_block=to_ethtester_block(f.get('toBlock')),
+                address=address,
+                topics=f.get('topics'),
+                )
+            r = self.backend.get_all_filter_logs(filter_id)
+            self.backend.delete_filter(filter_id)
+        if self.log_limit > 0 and len(r) > self.log_limit:
+            raise ValueError('query returned more than {} results'.format(self.log_limit))
+        logs = []
+        for v in r:
+            logs.append({
+                'address': v['address'],
+                'topics': list(v['topics']),
+                'data': v['data'],
+                'blockNumber': hex(v['block_number']),
+                'blockHash': v['block_hash'],
+                'transactionHash': v['transaction_hash'],
+                'transactionIndex': hex(v['transaction_index']),
+                'logIndex': hex(v['log_index']),
+                'removed': False,
+                })
+        return logs
+
+
+
+    def eth_estimateGas(self, p):
+        tx = p[0]
+        o = {
+            'from': tx['from'],
+            'to': tx['to'],
+            'data': tx['data'],
+            }
+        if tx.get('gas') != None:
+            o['gas'] = int(strip_0x(tx['gas']), 16)
+        r = self.backend.estimate_gas(o)
+        return hex(r)
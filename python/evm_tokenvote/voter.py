@@ -1,7 +1,5 @@
 # standard imports
 import logging
-import os
-import enum
 
 # external imports
 from chainlib.eth.constant import ZERO_ADDRESS
@@ -23,48 +21,23 @@ from hexathon import (
     add_0x,
     strip_0x,
 )
-from chainlib.eth.cli.encode import CLIEncoder
 
 # local imports
-from evm_tokenvote.data import data_dir
+from evm_tokenvote.data import (
+    abi as data_abi,
+    bytecode as data_bytecode,
+)
+from evm_tokenvote.calldata import encode
+from evm_tokenvote.proposal import (
+    Proposal,
+    ProposalState,
+)
 
 logg = logging.getLogger()
 
 
-class ProposalState(enum.IntEnum):
-    INIT = 1
-    FINAL = 2
-    SCANNED = 4
-    INSUFFICIENT = 8
-    TIED = 16
-    SUPPLYCHANGE = 32
-    IMMEDIATE = 64
-    CANCELLED = 128
-
-
-class Proposal:
-   
-    def __init__(self, description_digest, *args, **kwargs):
-        self.description_digest = description_digest
-        self.supply = kwargs.get('supply')
-        self.total = kwargs.get('total')
-        self.block_deadline = kwargs.get('block_deadline')
-        self.target_vote_ppm = kwargs.get('target_vote_ppm')
-        self.cancel_votes = kwargs.get('cancel_votes')
-        self.proposer = kwargs.get('proposer')
-        self.state = kwargs.get('state')
-        self.serial = kwargs.get('serial')
-
-
-    def __str__(self):
-        return "proposal description {} total {} supply {}".format(self.description_digest, self.total, self.supply)
-
-
 class Voter(TxFactory):
 
-    __abi = None
-    __bytecode = None
-
     def constructor(self, sender_address, token_address, protect_supply=False, voter_registry=None, proposer_registry=None, tx_format=TxFormat.JSONRPC, version=None):
         code = self.cargs(token_address, protect_supply=protect_supply, voter_registry=voter_registry, proposer_registry=proposer_registry, version=version)
         tx = self.template(sender_address, None, use_nonce=True)
@@ -99,32 +72,19 @@ class Voter(TxFactory):
 
     @staticmethod
     def abi():
-        if Voter.__abi == None:
-            f = open(os.path.join(data_dir, 'Voter.json'), 'r')
-            Voter.__abi = json.load(f)
-            f.close()
-        return Voter.__abi
+        return data_abi()
 
 
     @staticmethod
     def bytecode(version=None):
-        if Voter.__bytecode == None:
-            f = open(os.path.join(data_dir, 'Voter.bin'))
-            Voter.__bytecode = f.read()
-            f.close()
-        return Voter.__bytecode
+        return data_bytecode(version=version)
 
 
-    def propose(self, contract_address, sender_address, description, block_deadline, target_vote_ppm=500000, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
-        enc.method('propose')
-        enc.typ(ABIContractType.BYTES32)
-        enc.typ(ABIContractType.UINT256)
-        enc.typ_literal('uint24')
-        enc.bytes32(description)
-        enc.uint256(block_deadline)
-        enc.uintn(target_vote_ppm, 24)
-        data = add_0x(enc.get())
+    def propose(self, contract_address, sender_address, description, block_deadline, target_vote_ppm=500000, options=None, tx_format=TxFormat.JSONRPC, id_generator=None):
+        if options == None or len(options) == 0:
+            data = '0x' + encode('propose(bytes32,uint256,uint24)', description, block_deadline, target_vote_ppm)
+        else:
+            data = '0x' + encode('proposeMulti(bytes32,bytes32[],uint256,uint24)', description, options, block_deadline, target_vote_ppm)
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
@@ -132,18 +92,8 @@ class Voter(TxFactory):
 
     
     def propose_blockwait(self, contract_address, sender_address, blockwait, block_deadline, target_vote_ppm=500000, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
-        enc.method('proposeInternal')
-        enc.typ(ABIContractType.BYTES32)
-        enc.typ(ABIContractType.BYTES32)
-        enc.typ(ABIContractType.UINT256)
-        enc.typ_literal('uint24')
-        enc.bytes32('67ca084db32598c571e2ad2dc8b95679c3fa14c63213935dfd8f0a158ff65c57')
         blockwait_bytes = blockwait.to_bytes(length=32, byteorder='big')
-        enc.bytes32(blockwait_bytes)
-        enc.uint256(block_deadline)
-        enc.uintn(target_vote_ppm, 24)
-        data = add_0x(enc.get())
+        data = '0x' + encode('proposeInternal(bytes32,bytes32,uint256,uint24)', '67ca084db32598c571e2ad2dc8b95679c3fa14c63213935dfd8f0a158ff65c57', blockwait_bytes, block_deadline, target_vote_ppm)
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
@@ -151,59 +101,47 @@ class Voter(TxFactory):
 
 
     def add_option(self, contract_address, sender_address, proposal_idx, description, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
-        enc.method('addOption')
-        enc.typ(ABIContractType.UINT256)
-        enc.typ(ABIContractType.BYTES32)
-        enc.uint256(proposal_idx)
-        enc.bytes32(description)
-        data = add_0x(enc.get())
+        data = '0x' + encode('addOption(uint256,bytes32)', proposal_idx, description)
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
         return tx
 
 
-#    def propose(self, contract_address, sender_address, description, block_deadline, target_vote_ppm=500000, options=[], tx_format=TxFormat.JSONRPC, id_generator=None):
-#        enc = ABIContractEncoder()
-#        if len(options) == 0: 
-#            enc.method('propose')
-#        else:
-#            enc.method('proposeMulti')
-#        enc.typ(ABIContractType.BYTES32)
-#        if len(options) > 0: 
-#            enc.typ_literal('bytes32[]')
-#        enc.typ(ABIContractType.UINT256)
-#        enc.typ_literal('uint24')
-#        enc.bytes32(description)
-#        if len(options) > 0: 
-#            enc.uint256(32*4)
-#        enc.uint256(block_deadline)
-#        enc.uintn(target_vote_ppm, 24)
-#        if len(options) > 0: 
-#            enc.uint256(len(options))
-#            for v in options:
-#                enc.bytes32(v)
-#        data = add_0x(enc.get())
-#        tx = self.template(sender_address, contract_address, use_nonce=True)
-#        tx = self.set_code(tx, data)
-#        tx = self.finalize(tx, tx_format, id_generator=id_generator)
-#        return tx
+    def add_options(self, contract_address, sender_address, proposal_idx, descriptions, tx_format=TxFormat.JSONRPC, id_generator=None):
+        data = '0x' + encode('addOptions(uint256,bytes32[])', proposal_idx, descriptions)
+        tx = self.template(sender_address, contract_address, use_nonce=True)
+        tx = self.set_code(tx, data)
+        tx = self.finalize(tx, tx_format, id_generator=id_generator)
+        return tx
 
 
     def vote(self, contract_address, sender_address, value, option=None, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
         if option == None:
-            enc.method('vote')
-            enc.typ(ABIContractType.UINT256)
+            data = '0x' + encode('vote(uint256)', value)
+        else:
+            data = '0x' + encode('voteOption(uint256,uint256)', option, value)
+        tx = self.template(sender_address, contract_address, use_nonce=True)
+        tx = self.set_code(tx, data)
+        tx = self.finalize(tx, tx_format, id_generator=id_generator)
+        return tx
+
+
+    def vote_with_permit(self, contract_address, sender_address, permit, option=None, tx_format=TxFormat.JSONRPC, id_generator=None):
+        if option == None:
+            data = '0x' + encode('voteWithPermit(uint256,uint256,uint8,bytes32,bytes32)', permit.value, permit.deadline, permit.v, permit.r, permit.s)
         else:
-            enc.method('voteOption')
-            enc.typ(ABIContractType.UINT256)
-            enc.typ(ABIContractType.UINT256)
-        if option != None:
-            enc.uint256(option)
-        enc.uint256(value)
-        data = add_0x(enc.get())
+            data = '0x' + encode('voteOptionWithPermit(uint256,uint256,uint256,uint8,bytes32,bytes32)', option, permit.value, permit.deadline, permit.v, permit.r, permit.s)
+        tx = self.template(sender_address, contract_address, use_nonce=True)
+        tx = self.set_code(tx, data)
+        tx = self.finalize(tx, tx_format, id_generator=id_generator)
+        return tx
+
+
+    def vote_options(self, contract_address, sender_address, options, values, tx_format=TxFormat.JSONRPC, id_generator=None):
+        if len(options) != len(values):
+            raise ValueError('options and values must have same length')
+        data = '0x' + encode('voteOptions(uint256[],uint256[])', options, values)
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
@@ -211,25 +149,16 @@ class Voter(TxFactory):
 
 
     def vote_cancel(self, contract_address, sender_address, value, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
-        enc.method('voteCancel')
-        enc.typ(ABIContractType.UINT256)
-        enc.uint256(value)
-        data = add_0x(enc.get())
+        data = '0x' + encode('voteCancel(uint256)', value)
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
         return tx
 
 
-    def scan(self, contract_address, sender_address, proposal_index, count, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
-        enc.method('scan')
-        enc.typ(ABIContractType.UINT256)
-        enc.typ(ABIContractType.UINT8)
-        enc.uint256(proposal_index)
-        enc.uintn(count, 8)
-        data = add_0x(enc.get())
+    def scan(self, contract_address, sender_address, proposal_index, count=0, tx_format=TxFormat.JSONRPC, id_generator=None):
+        # the count is deprecated and ignored by the contract, but must still fit its uint8 parameter.
+        data = '0x' + encode('scan(uint256,uint8)', proposal_index, min(count, 255))
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
@@ -237,9 +166,53 @@ class Voter(TxFactory):
 
 
     def finalize_vote(self, contract_address, sender_address, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
-        enc.method('finalize')
-        data = add_0x(enc.get())
+        data = '0x' + encode('finalize()')
+        tx = self.template(sender_address, contract_address, use_nonce=True)
+        tx = self.set_code(tx, data)
+        tx = self.finalize(tx, tx_format, id_generator=id_generator)
+        return tx
+
+
+    def finalize_many(self, contract_address, sender_address, count, tx_format=TxFormat.JSONRPC, id_generator=None):
+        data = '0x' + encode('finalizeMany(uint256)', count)
+        tx = self.template(sender_address, contract_address, use_nonce=True)
+        tx = self.set_code(tx, data)
+        tx = self.finalize(tx, tx_format, id_generator=id_generator)
+        return tx
+
+
+    def estimate_gas(self, tx, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_estimateGas'
+        tx = self.normalize(tx)
+        # leave the gas limit to the node, the template default only covers a value transfer.
+        del tx['gas']
+        o['params'].append(tx)
+        o = j.finalize(o)
+        return o
+
+
+    def estimate_finalize_many(self, contract_address, sender_address, count, id_generator=None):
+        data = '0x' + encode('finalizeMany(uint256)', count)
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        return self.estimate_gas(tx, id_generator=id_generator)
+
+
+    def rollover(self, contract_address, sender_address, tx_format=TxFormat.JSONRPC, id_generator=None):
+        data = '0x' + encode('rollover()')
+        tx = self.template(sender_address, contract_address, use_nonce=True)
+        tx = self.set_code(tx, data)
+        tx = self.finalize(tx, tx_format, id_generator=id_generator)
+        return tx
+
+
+    def vote_rollover(self, contract_address, sender_address, value, option=None, tx_format=TxFormat.JSONRPC, id_generator=None):
+        if option == None:
+            data = '0x' + encode('voteRollover(uint256)', value)
+        else:
+            data = '0x' + encode('voteOptionRollover(uint256,uint256)', option, value)
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
@@ -247,113 +220,152 @@ class Voter(TxFactory):
 
 
     def withdraw(self, contract_address, sender_address, tx_format=TxFormat.JSONRPC, id_generator=None):
-        enc = ABIContractEncoder()
-        enc.method('withdraw')
-        data = add_0x(enc.get())
+        data = '0x' + encode('withdraw()')
         tx = self.template(sender_address, contract_address, use_nonce=True)
         tx = self.set_code(tx, data)
         tx = self.finalize(tx, tx_format, id_generator=id_generator)
         return tx
 
 
-    def get_proposal(self, contract_address, proposal_idx, sender_address=ZERO_ADDRESS, id_generator=None):
+    def get_proposal(self, contract_address, proposal_idx, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
         j = JSONRPCRequest(id_generator)
         o = j.template()
         o['method'] = 'eth_call'
-        enc = ABIContractEncoder()
-        enc.method('getProposal')
-        enc.typ(ABIContractType.UINT256)
-        enc.uint256(proposal_idx)
-        data = add_0x(enc.get())
+        data = '0x' + encode('getProposal(uint256)', proposal_idx)
         tx = self.template(sender_address, contract_address)
         tx = self.set_code(tx, data)
         o['params'].append(self.normalize(tx))
-        o['params'].append('latest')
+        o['params'].append(to_blockheight_param(height))
         o = j.finalize(o)
         return o
 
 
-    def get_option(self, contract_address, proposal_idx, option_idx, sender_address=ZERO_ADDRESS, id_generator=None):
+    def get_proposals(self, contract_address, start, count, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
         j = JSONRPCRequest(id_generator)
         o = j.template()
         o['method'] = 'eth_call'
-        enc = ABIContractEncoder()
-        enc.method('getOption')
-        enc.typ(ABIContractType.UINT256)
-        enc.typ(ABIContractType.UINT256)
-        enc.uint256(proposal_idx)
-        enc.uint256(option_idx)
-        data = add_0x(enc.get())
+        data = '0x' + encode('getProposals(uint256,uint256)', start, count)
         tx = self.template(sender_address, contract_address)
         tx = self.set_code(tx, data)
         o['params'].append(self.normalize(tx))
-        o['params'].append('latest')
+        o['params'].append(to_blockheight_param(height))
         o = j.finalize(o)
         return o
 
 
-    def option_count(self, contract_address, proposal_idx, sender_address=ZERO_ADDRESS, id_generator=None):
+    def proposal_count(self, contract_address, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
         j = JSONRPCRequest(id_generator)
         o = j.template()
         o['method'] = 'eth_call'
-        enc = ABIContractEncoder()
-        enc.method('optionCount')
-        enc.typ(ABIContractType.UINT256)
-        enc.uint256(proposal_idx)
-        data = add_0x(enc.get())
+        data = '0x' + encode('proposalCount()')
         tx = self.template(sender_address, contract_address)
         tx = self.set_code(tx, data)
         o['params'].append(self.normalize(tx))
-        o['params'].append('latest')
+        o['params'].append(to_blockheight_param(height))
         o = j.finalize(o)
         return o
 
 
-    def vote_count(self, contract_address, proposal_idx, option_idx=0, sender_address=ZERO_ADDRESS, id_generator=None):
+    def get_option(self, contract_address, proposal_idx, option_idx, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
         j = JSONRPCRequest(id_generator)
         o = j.template()
         o['method'] = 'eth_call'
-        enc = ABIContractEncoder()
-        enc.method('voteCount')
-        enc.typ(ABIContractType.UINT256)
-        enc.typ(ABIContractType.UINT256)
-        enc.uint256(proposal_idx)
-        enc.uint256(option_idx)
-        data = add_0x(enc.get())
+        data = '0x' + encode('getOption(uint256,uint256)', proposal_idx, option_idx)
         tx = self.template(sender_address, contract_address)
         tx = self.set_code(tx, data)
         o['params'].append(self.normalize(tx))
-        o['params'].append('latest')
+        o['params'].append(to_blockheight_param(height))
         o = j.finalize(o)
         return o
 
 
-    def block_wait_limit(self, contract_address, sender_address=ZERO_ADDRESS, id_generator=None):
+    def get_options(self, contract_address, proposal_idx, start, count, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
         j = JSONRPCRequest(id_generator)
         o = j.template()
         o['method'] = 'eth_call'
-        enc = ABIContractEncoder()
-        enc.method('blockWaitLimit')
-        data = add_0x(enc.get())
+        data = '0x' + encode('getOptions(uint256,uint256,uint256)', proposal_idx, start, count)
         tx = self.template(sender_address, contract_address)
         tx = self.set_code(tx, data)
         o['params'].append(self.normalize(tx))
-        o['params'].append('latest')
+        o['params'].append(to_blockheight_param(height))
         o = j.finalize(o)
         return o
 
 
-    def current_proposal(self, contract_address, sender_address=ZERO_ADDRESS, id_generator=None):
+    def option_count(self, contract_address, proposal_idx, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
         j = JSONRPCRequest(id_generator)
         o = j.template()
         o['method'] = 'eth_call'
-        enc = ABIContractEncoder()
-        enc.method('getCurrentProposal')
-        data = add_0x(enc.get())
+        data = '0x' + encode('optionCount(uint256)', proposal_idx)
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        o['params'].append(self.normalize(tx))
+        o['params'].append(to_blockheight_param(height))
+        o = j.finalize(o)
+        return o
+
+
+    def vote_count(self, contract_address, proposal_idx, option_idx=0, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_call'
+        data = '0x' + encode('voteCount(uint256,uint256)', proposal_idx, option_idx)
         tx = self.template(sender_address, contract_address)
         tx = self.set_code(tx, data)
         o['params'].append(self.normalize(tx))
-        o['params'].append('latest')
+        o['params'].append(to_blockheight_param(height))
+        o = j.finalize(o)
+        return o
+
+
+    def vote_counts(self, contract_address, proposal_idx, start, count, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_call'
+        data = '0x' + encode('voteCounts(uint256,uint256,uint256)', proposal_idx, start, count)
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        o['params'].append(self.normalize(tx))
+        o['params'].append(to_blockheight_param(height))
+        o = j.finalize(o)
+        return o
+
+
+    def rollover_balance(self, contract_address, voter_address, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_call'
+        data = '0x' + encode('rolloverBalance(address)', voter_address)
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        o['params'].append(self.normalize(tx))
+        o['params'].append(to_blockheight_param(height))
+        o = j.finalize(o)
+        return o
+
+
+    def block_wait_limit(self, contract_address, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_call'
+        data = '0x' + encode('blockWaitLimit()')
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        o['params'].append(self.normalize(tx))
+        o['params'].append(to_blockheight_param(height))
+        o = j.finalize(o)
+        return o
+
+
+    def current_proposal(self, contract_address, sender_address=ZERO_ADDRESS, height=BlockSpec.LATEST, id_generator=None):
+        j = JSONRPCRequest(id_generator)
+        o = j.template()
+        o['method'] = 'eth_call'
+        data = '0x' + encode('getCurrentProposal()')
+        tx = self.template(sender_address, contract_address)
+        tx = self.set_code(tx, data)
+        o['params'].append(self.normalize(tx))
+        o['params'].append(to_blockheight_param(height))
         o = j.finalize(o)
         return o
 
@@ -364,20 +376,24 @@ class Voter(TxFactory):
         v = strip_0x(v)
         logg.debug("proposal {}".format(v))
 
-        cursor = 64
+        base = 64
+        cursor = base
         dec = ABIContractDecoder()
         dec.typ(ABIContractType.BYTES32)
-        dec.typ(ABIContractType.UINT256)
-        dec.typ(ABIContractType.UINT256)
-        dec.typ(ABIContractType.UINT256)
-        dec.typ(ABIContractType.UINT256)
+        dec.typ(ABIContractType.UINT256) # actually uint128
+        dec.typ(ABIContractType.UINT256) # actually uint128
+        dec.typ(ABIContractType.UINT256) # actually uint128
+        dec.typ(ABIContractType.UINT256) # actually uint64
         dec.typ(ABIContractType.UINT256) # actually uint24
         dec.typ(ABIContractType.ADDRESS)
         dec.typ(ABIContractType.UINT8)
+        dec.typ(ABIContractType.UINT256) # actually uint16
 
         dec.val(v[cursor:cursor+64]) # description
         cursor += 64 # options pos
+        options_cursor = base + int(v[cursor:cursor+64], 16) * 2
         cursor += 64 # optionsvotes pos
+        option_votes_cursor = base + int(v[cursor:cursor+64], 16) * 2
         cursor += 64
         dec.val(v[cursor:cursor+64])
         cursor += 64
@@ -393,17 +409,34 @@ class Voter(TxFactory):
         cursor += 64
         dec.val(v[cursor:cursor+64])
         cursor += 64
+        dec.val(v[cursor:cursor+64])
+        cursor += 64
+
+        options = []
+        count = int(v[options_cursor:options_cursor+64], 16)
+        for i in range(count):
+            options_cursor += 64
+            options.append(v[options_cursor:options_cursor+64])
+
+        option_votes = []
+        count = int(v[option_votes_cursor:option_votes_cursor+64], 16)
+        for i in range(count):
+            option_votes_cursor += 64
+            option_votes.append(int(v[option_votes_cursor:option_votes_cursor+64], 16))
 
         r = dec.get()
         o = Proposal(r[0],
-                     cancelVotes=r[1],
+                     cancel_votes=r[1],
                      supply=r[2],
                      total=r[3],
                      block_deadline=r[4],
                      target_vote_ppm=r[5],
                      proposer=r[6],
                      state=r[7],
+                     lead=r[8],
                      serial=serial,
+                     options=options,
+                     option_votes=option_votes,
                      )
         return o
 
@@ -413,6 +446,7 @@ def bytecode(**kwargs):
 
 
 def create(**kwargs):
+    from chainlib.eth.cli.encode import CLIEncoder
     enc = CLIEncoder()
     (typ, token_address) = enc.translate('a', strip_0x(kwargs['token_address']))
     voter_registry = kwargs.get('voter_registry')
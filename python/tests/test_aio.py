@@ -0,0 +1,195 @@
+# standard imports
+import unittest
+import logging
+import json
+import asyncio
+import threading
+
+# external imports
+from chainlib.chain import ChainSpec
+from chainlib.jsonrpc import (
+    jsonrpc_response,
+    jsonrpc_error,
+)
+from chainlib.error import JSONRPCException
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.calldata import template
+from evm_tokenvote.aio import (
+    AsyncJSONRPCHTTPConnection,
+    AsyncVoter,
+)
+from evm_tokenvote.unittest.encode import (
+    encode_word,
+    encode_proposal,
+)
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+hash_of_bar = 'fcde2b2edba56bf408601fb721fe9b5c338d10ee429ea04fae5511b68fbf8fb9'
+some_address = '185cbce7650ff7ad3b587e26b2877d95568805e3'
+contract_address = '0x' + some_address
+
+
+class StandInServer:
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.selectors = {
+            template('getProposal(uint256)').selector: self.get_proposal,
+            template('optionCount(uint256)').selector: lambda v: encode_word(2),
+            template('getCurrentProposal()').selector: None,
+                }
+
+
+    def get_proposal(self, v):
+        idx = int(v[8:72], 16)
+        return encode_proposal(hash_of_foo, options=[hash_of_bar], option_votes=[idx], supply=1000, total=idx * 3, block_deadline=100, target_vote_ppm=500000, state=1)
+
+
+    def respond(self, o):
+        data = strip_0x(o['params'][0]['data'])
+        m = self.selectors.get(data[:8])
+        if m == None:
+            return jsonrpc_error(o['id'], message='execution reverted')
+        return jsonrpc_response(o['id'], m(data))
+
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            v = await reader.readline()
+            if len(v) == 0:
+                break
+            l = 0
+            while True:
+                v = await reader.readline()
+                if v == b'\r\n':
+                    break
+                (k, v) = v.decode('ascii').split(':', 1)
+                if k.lower() == 'content-length':
+                    l = int(v)
+            o = json.loads(await reader.readexactly(l))
+
+            self.requests += 1
+            if isinstance(o, list):
+                self.calls += len(o)
+            else:
+                self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.in_flight, self.max_in_flight)
+            await asyncio.sleep(self.delay)
+            self.in_flight -= 1
+
+            if isinstance(o, list):
+                r = [self.respond(v) for v in o]
+            else:
+                r = self.respond(o)
+            b = json.dumps(r).encode('utf-8')
+            writer.write('HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n'.format(len(b)).encode('ascii') + b)
+            await writer.drain()
+        writer.close()
+
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+
+class TestAsyncVoter(unittest.TestCase):
+
+    def setUp(self):
+        self.chain_spec = ChainSpec('evm', 'foochain', 42)
+        self.server = StandInServer()
+
+
+    def run_with_server(self, f, concurrency=4, batch_size=100):
+        async def run():
+            port = await self.server.start()
+            async with AsyncJSONRPCHTTPConnection('http://127.0.0.1:{}'.format(port), concurrency=concurrency, batch_size=batch_size) as conn:
+                r = await f(AsyncVoter(self.chain_spec, conn))
+            self.server.server.close()
+            await self.server.server.wait_closed()
+            return (r, conn,)
+        return asyncio.run(run())
+
+
+    def test_get_proposals(self):
+        async def f(c):
+            return await c.get_proposals(contract_address, range(20))
+        (r, conn) = self.run_with_server(f, concurrency=4, batch_size=1)
+        self.assertEqual(len(r), 20)
+        for i in range(20):
+            self.assertEqual(r[i].serial, i)
+            self.assertEqual(r[i].total, i * 3)
+            self.assertEqual(r[i].option_votes, [i])
+        self.assertEqual(self.server.requests, 20)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+        self.assertLessEqual(self.server.connections, 4)
+        self.assertEqual(conn.opened, self.server.connections)
+
+
+    def test_get_proposals_batched(self):
+        async def f(c):
+            return await c.get_proposals(contract_address, range(20))
+        (r, conn) = self.run_with_server(f, concurrency=2, batch_size=8)
+        self.assertEqual([v.total for v in r], [i * 3 for i in range(20)])
+        self.assertEqual(self.server.calls, 20)
+        self.assertEqual(self.server.requests, 3)
+        self.assertLessEqual(self.server.max_in_flight, 2)
+
+
+    def test_event_loops(self):
+        loop = asyncio.new_event_loop()
+        port = loop.run_until_complete(self.server.start())
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+
+        conn = AsyncJSONRPCHTTPConnection('http://127.0.0.1:{}'.format(port), concurrency=2)
+        c = AsyncVoter(self.chain_spec, conn)
+        try:
+            # each asyncio.run has its own event loop.
+            for i in range(2):
+                r = asyncio.run(c.get_proposals(contract_address, range(4)))
+                self.assertEqual([v.total for v in r], [0, 3, 6, 9])
+            asyncio.run(conn.close())
+        finally:
+            async def stop():
+                self.server.server.close()
+                # the connections of the first loop were dropped, not closed.
+                for v in asyncio.all_tasks():
+                    if v != asyncio.current_task():
+                        v.cancel()
+            asyncio.run_coroutine_threadsafe(stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(conn.opened, 2)
+
+
+    def test_mixed(self):
+        async def f(c):
+            return await asyncio.gather(
+                c.get_proposal(contract_address, 3),
+                c.option_count(contract_address, 3),
+                c.current_proposal(contract_address),
+                return_exceptions=True,
+                )
+        (r, conn) = self.run_with_server(f)
+        self.assertEqual(r[0].total, 9)
+        self.assertEqual(r[1], 2)
+        self.assertIsInstance(r[2], JSONRPCException)
+
+
+if __name__ == '__main__':
+    unittest.main()
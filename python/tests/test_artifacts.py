@@ -0,0 +1,61 @@
+# standard imports
+import unittest
+import logging
+import os
+import json
+
+# external imports
+from chainlib.hash import keccak256
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote.data import data_dir
+from evm_tokenvote.data import abi as data_abi
+from evm_tokenvote.calldata import generate_selectors
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+source_dir = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', '..', 'solidity'))
+
+
+class TestArtifacts(unittest.TestCase):
+    """Checks that the contract artifacts in evm_tokenvote/data were built from the contract sources, with make -C solidity install.
+    """
+
+    def assert_built_from_source(self, name):
+        source_path = os.path.join(source_dir, name + '.sol')
+        if not os.path.exists(source_path):
+            self.skipTest('no contract source at {}'.format(source_path))
+        f = open(source_path, 'rb')
+        digest = keccak256(f.read()).hex()
+        f.close()
+
+        metadata_path = os.path.join(data_dir, name + '.metadata.json')
+        self.assertTrue(os.path.exists(metadata_path), '{}.metadata.json is missing from evm_tokenvote/data, run make -C solidity install'.format(name))
+        f = open(metadata_path, 'r')
+        metadata = json.load(f)
+        f.close()
+        built = strip_0x(metadata['sources'][name + '.sol']['keccak256'])
+        self.assertEqual(built, digest, '{}.sol has changed since evm_tokenvote/data was built, run make -C solidity install'.format(name))
+
+
+    def test_voter_built_from_source(self):
+        self.assert_built_from_source('Voter')
+
+
+    def test_permit_token_built_from_source(self):
+        for v in ['PermitToken.bin', 'PermitToken.json']:
+            self.assertTrue(os.path.exists(os.path.join(data_dir, v)), '{} is missing from evm_tokenvote/data, run make -C solidity install'.format(v))
+        self.assert_built_from_source('PermitToken')
+
+
+    def test_selectors_generated_from_abi(self):
+        f = open(os.path.join(data_dir, 'selectors.py'), 'r')
+        v = f.read()
+        f.close()
+        self.assertEqual(v, generate_selectors(data_abi()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,8 @@ from evm_tokenvote.unittest import TestEvmVoteProposal
 from evm_tokenvote.unittest.base import hash_of_foo
 from evm_tokenvote import Voter
 from evm_tokenvote import ProposalState
+from evm_tokenvote.decode import decode_proposal_page
+from evm_tokenvote.stream import iterate_proposals
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -270,5 +272,35 @@ class TestVoteBase(TestEvmVoteProposal):
         self.assertEqual(proposal.state & ProposalState.CANCELLED, 0)
 
 
+    def test_proposals_page(self):
+        nonce_oracle = RPCNonceOracle(self.ivan, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for i in range(2):
+            (tx_hash, o) = c.propose(self.voter_address, self.ivan, hash_of_foo, 200 + i)
+            self.rpc.do(o)
+            o = receipt(tx_hash)
+            r = self.rpc.do(o)
+            self.assertEqual(r['status'], 1)
+
+        o = c.proposal_count(self.voter_address, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), 3)
+
+        o = c.get_proposals(self.voter_address, 1, 10, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposals = decode_proposal_page(r, serial=1)
+        self.assertEqual(len(proposals), 2)
+        self.assertEqual(proposals[0].serial, 1)
+        self.assertEqual(proposals[1].block_deadline - proposals[0].block_deadline, 2)
+
+        proposals = list(iterate_proposals(self.rpc, self.chain_spec, self.voter_address, page_size=1, prefetch=2))
+        self.assertEqual([v.serial for v in proposals], [0, 1, 2])
+        self.assertTrue(same_hex(proposals[2].proposer, self.ivan))
+
+        o = c.get_proposals(self.voter_address, 3, 10, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(decode_proposal_page(r), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,145 @@
+# standard imports
+import unittest
+import logging
+import os
+import tempfile
+import shutil
+
+# external imports
+from chainlib.chain import ChainSpec
+from chainlib.jsonrpc import (
+    jsonrpc_response,
+    jsonrpc_result,
+)
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote import Voter
+from evm_tokenvote import ProposalState
+from evm_tokenvote.cache import (
+    ReadCache,
+    CachedRPCConnection,
+)
+from evm_tokenvote.unittest.encode import encode_proposal
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+some_address = '185cbce7650ff7ad3b587e26b2877d95568805e3'
+contract_address = '0x' + some_address
+
+
+class CountingConnection:
+
+    def __init__(self):
+        self.height = 100
+        self.calls = 0
+        self.states = {}
+
+
+    def do(self, o):
+        if o['method'] == 'eth_blockNumber':
+            return self.height
+        self.calls += 1
+        data = strip_0x(o['params'][0]['data'])
+        idx = int(data[8:72], 16)
+        r = jsonrpc_response(o['id'], encode_proposal(hash_of_foo, supply=1000, total=idx, block_deadline=100, target_vote_ppm=500000, state=self.states.get(idx, ProposalState.INIT)))
+        return jsonrpc_result(r, None)
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.chain_spec = ChainSpec('evm', 'foochain', 42)
+        self.d = tempfile.mkdtemp()
+
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+
+    def test_lru(self):
+        cache = ReadCache(size=2)
+        cache.put(contract_address, '0xaa', 'foo', height=1)
+        cache.put(contract_address, '0xbb', 'bar', height=1)
+        self.assertEqual(cache.get(contract_address, 'aa', height=1), 'foo')
+        cache.put(contract_address, '0xcc', 'baz', height=1)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(contract_address, 'bb', height=1))
+        self.assertEqual(cache.get(contract_address, 'aa', height=1), 'foo')
+        self.assertIsNone(cache.get(contract_address, 'aa', height=2))
+
+        cache.put(contract_address, '0xdd', 'xyzzy', since=10)
+        self.assertEqual(cache.get(contract_address, 'dd'), 'xyzzy')
+        self.assertEqual(cache.get(contract_address, 'dd', height=10), 'xyzzy')
+        self.assertIsNone(cache.get(contract_address, 'dd', height=9))
+
+
+    def test_final(self):
+        conn = CountingConnection()
+        conn.states[1] = ProposalState.INIT | ProposalState.FINAL | ProposalState.SCANNED
+        conn.states[2] = ProposalState.INIT | ProposalState.FINAL
+        cached = CachedRPCConnection(conn, confirmations=10)
+        c = Voter(self.chain_spec)
+
+        for i in range(3):
+            for j in range(3):
+                r = cached.do(c.get_proposal(contract_address, j))
+                self.assertEqual(c.parse_proposal(r).total, j)
+        self.assertEqual(conn.calls, 1 + 3 + 3)
+
+        # pinned below confirmation depth
+        for i in range(3):
+            cached.do(c.get_proposal(contract_address, 0, height=90))
+        self.assertEqual(conn.calls, 7 + 1)
+
+        # pinned within confirmation depth
+        for i in range(3):
+            cached.do(c.get_proposal(contract_address, 0, height=95))
+        self.assertEqual(conn.calls, 8 + 3)
+
+        # finalized proposal read at a block before it was seen as final
+        cached.do(c.get_proposal(contract_address, 1, height=90))
+        self.assertEqual(conn.calls, 12)
+
+
+    def test_block_tag(self):
+        conn = CountingConnection()
+        conn.states[1] = ProposalState.INIT | ProposalState.FINAL | ProposalState.SCANNED
+        cached = CachedRPCConnection(conn)
+        c = Voter(self.chain_spec)
+
+        cached.do(c.get_proposal(contract_address, 1))
+        self.assertEqual(conn.calls, 1)
+        for v in ['earliest', 'pending', 'safe', 'finalized']:
+            o = c.get_proposal(contract_address, 1)
+            o['params'][1] = v
+            cached.do(o)
+        self.assertEqual(conn.calls, 5)
+        cached.do(c.get_proposal(contract_address, 1))
+        self.assertEqual(conn.calls, 5)
+
+
+    def test_persist(self):
+        path = os.path.join(self.d, 'cache.sqlite')
+        conn = CountingConnection()
+        conn.states[1] = ProposalState.INIT | ProposalState.FINAL | ProposalState.SCANNED
+        c = Voter(self.chain_spec)
+
+        cache = ReadCache(path=path)
+        cached = CachedRPCConnection(conn, cache=cache)
+        cached.do(c.get_proposal(contract_address, 1))
+        cache.close()
+        self.assertEqual(conn.calls, 1)
+
+        cache = ReadCache(path=path)
+        cached = CachedRPCConnection(conn, cache=cache)
+        r = cached.do(c.get_proposal(contract_address, 1))
+        self.assertEqual(conn.calls, 1)
+        self.assertEqual(c.parse_proposal(r).total, 1)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
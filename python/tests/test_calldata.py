@@ -0,0 +1,125 @@
+# standard imports
+import unittest
+import logging
+
+# external imports
+from chainlib.eth.contract import (
+    ABIContractEncoder,
+    ABIContractType,
+)
+
+# local imports
+from evm_tokenvote.calldata import (
+    encode,
+    template,
+    templates,
+    abi_signatures,
+    CalldataTemplate,
+)
+from evm_tokenvote.data import abi
+from evm_tokenvote.data.selectors import selectors
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+hash_of_bar = 'fcde2b2edba56bf408601fb721fe9b5c338d10ee429ea04fae5511b68fbf8fb9'
+some_address = '0x185Cbce7650FF7Ad3B587E26B2877D95568805E3'
+
+
+class TestCalldata(unittest.TestCase):
+
+    def test_abi_templates(self):
+        r = templates()
+        self.assertIn('propose(bytes32,uint256,uint24)', r)
+        self.assertIn('withdraw()', r)
+        self.assertIn('withdraw(uint256)', r)
+        self.assertEqual(r['vote(uint256)'].selector, '0121b93f')
+
+
+    def test_selector_table(self):
+        signatures = abi_signatures(abi())
+        self.assertEqual(len(signatures), len(selectors))
+        for (name, types) in signatures:
+            o = CalldataTemplate(name, list(types))
+            self.assertEqual(selectors[o.signature], (name, types, o.selector))
+
+
+    def test_static(self):
+        enc = ABIContractEncoder()
+        enc.method('propose')
+        enc.typ(ABIContractType.BYTES32)
+        enc.typ(ABIContractType.UINT256)
+        enc.typ_literal('uint24')
+        enc.bytes32(hash_of_foo)
+        enc.uint256(100)
+        enc.uintn(500000, 24)
+        self.assertEqual(encode('propose(bytes32,uint256,uint24)', hash_of_foo, 100, 500000), enc.get())
+
+        enc = ABIContractEncoder()
+        enc.method('proposeInternal')
+        enc.typ(ABIContractType.BYTES32)
+        enc.typ(ABIContractType.BYTES32)
+        enc.typ(ABIContractType.UINT256)
+        enc.typ_literal('uint24')
+        enc.bytes32(hash_of_foo)
+        enc.bytes32((42).to_bytes(length=32, byteorder='big'))
+        enc.uint256(100)
+        enc.uintn(500000, 24)
+        self.assertEqual(encode('proposeInternal(bytes32,bytes32,uint256,uint24)', hash_of_foo, (42).to_bytes(length=32, byteorder='big'), 100, 500000), enc.get())
+
+        enc = ABIContractEncoder()
+        enc.method('scan')
+        enc.typ(ABIContractType.UINT256)
+        enc.typ(ABIContractType.UINT8)
+        enc.uint256(13)
+        enc.uintn(3, 8)
+        self.assertEqual(encode('scan(uint256,uint8)', 13, 3), enc.get())
+
+        enc = ABIContractEncoder()
+        enc.method('balanceOf')
+        enc.typ(ABIContractType.ADDRESS)
+        enc.address(some_address)
+        self.assertEqual(encode('balanceOf(address)', some_address), enc.get())
+
+        enc = ABIContractEncoder()
+        enc.method('finalize')
+        self.assertEqual(encode('finalize()'), enc.get())
+
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            encode('vote(uint256)', 1, 2)
+        with self.assertRaises(ValueError):
+            encode('addOption(uint256,bytes32)', 0, hash_of_foo + '00')
+        with self.assertRaises(OverflowError):
+            encode('vote(uint256)', -1)
+
+
+    def test_dynamic(self):
+        o = template('proposeMulti(bytes32,bytes32[],uint256,uint24)')
+        r = o.encode(hash_of_foo, [hash_of_bar, hash_of_foo], 100, 500000)
+        expect = o.selector
+        expect += hash_of_foo
+        expect += (32 * 4).to_bytes(32, 'big').hex()
+        expect += (100).to_bytes(32, 'big').hex()
+        expect += (500000).to_bytes(32, 'big').hex()
+        expect += (2).to_bytes(32, 'big').hex()
+        expect += hash_of_bar
+        expect += hash_of_foo
+        self.assertEqual(r, expect)
+
+
+
+    def test_dynamic_multiple(self):
+        o = template('voteOptions(uint256[],uint256[])')
+        r = o.encode([0, 2], [42, 13])
+        expect = o.selector
+        expect += (32 * 2).to_bytes(32, 'big').hex()
+        expect += (32 * 5).to_bytes(32, 'big').hex()
+        for v in [2, 0, 2, 2, 42, 13]:
+            expect += v.to_bytes(32, 'big').hex()
+        self.assertEqual(r, expect)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -70,6 +70,7 @@ class TestVoteBase(TestEvmVoteProposal):
         self.assertEqual(proposal.state & ProposalState.SCANNED, ProposalState.SCANNED)
         self.assertEqual(proposal.state & ProposalState.IMMEDIATE, ProposalState.IMMEDIATE)
         self.assertEqual(proposal.state & ProposalState.CANCELLED, ProposalState.CANCELLED)
+        self.assertEqual(proposal.cancel_votes, half_supply)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,98 @@
+# standard imports
+import unittest
+import logging
+
+# local imports
+from evm_tokenvote import Voter
+from evm_tokenvote.decode import (
+    decode_proposal,
+    decode_proposals,
+)
+from evm_tokenvote.data import abi
+from evm_tokenvote.unittest.encode import (
+    encode_proposal,
+    PROPOSAL_HEAD_WORDS,
+)
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+hash_of_bar = 'fcde2b2edba56bf408601fb721fe9b5c338d10ee429ea04fae5511b68fbf8fb9'
+hash_of_baz = 'baa5a0964d3320fbc0c6a922140453c8513ea24ab8fd0577034804a967248096'
+
+
+class TestDecode(unittest.TestCase):
+
+    def assert_same_proposal(self, a, b):
+        for k in [
+            'description_digest',
+            'supply',
+            'total',
+            'block_deadline',
+            'target_vote_ppm',
+            'cancel_votes',
+            'proposer',
+            'state',
+            'lead',
+            'serial',
+            'options',
+            'option_votes',
+                ]:
+            self.assertEqual(getattr(a, k), getattr(b, k))
+
+
+    def test_decode_proposal(self):
+        v = encode_proposal(hash_of_foo, options=[hash_of_bar, hash_of_baz], option_votes=[13, 42], cancel_votes=2, supply=1000, total=57, block_deadline=100, target_vote_ppm=500000, state=5, lead=1)
+        a = Voter.parse_proposal(v, serial=3)
+        b = decode_proposal(v, serial=3)
+        self.assert_same_proposal(a, b)
+        self.assertEqual(b.options, [hash_of_bar, hash_of_baz])
+        self.assertEqual(b.option_votes, [13, 42])
+        self.assertEqual(b.lead, 1)
+        self.assertEqual(b.total, 57)
+
+        c = decode_proposal(bytes.fromhex(v[2:]), serial=3)
+        self.assert_same_proposal(a, c)
+
+
+    def test_decode_proposal_no_options(self):
+        v = encode_proposal(hash_of_foo, supply=1000, total=1, state=1)
+        a = Voter.parse_proposal(v)
+        b = decode_proposal(memoryview(bytes.fromhex(v[2:])))
+        self.assert_same_proposal(a, b)
+        self.assertEqual(b.options, [])
+
+
+    def test_decode_proposal_packed_limits(self):
+        v = encode_proposal(hash_of_foo, cancel_votes=(1 << 128) - 1, supply=(1 << 128) - 1, total=(1 << 128) - 1, block_deadline=(1 << 64) - 1, target_vote_ppm=(1 << 24) - 1, state=255, lead=(1 << 16) - 1)
+        a = Voter.parse_proposal(v)
+        b = decode_proposal(v)
+        self.assert_same_proposal(a, b)
+        self.assertEqual(b.total, (1 << 128) - 1)
+        self.assertEqual(b.block_deadline, (1 << 64) - 1)
+        self.assertEqual(b.lead, (1 << 16) - 1)
+
+
+    def test_proposal_head_matches_abi(self):
+        components = None
+        for v in abi():
+            if v.get('name') == 'getProposal':
+                components = v['outputs'][0]['components']
+        self.assertEqual(len(components), PROPOSAL_HEAD_WORDS)
+
+
+    def test_decode_batch(self):
+        vs = []
+        for i in range(3):
+            vs.append(encode_proposal(hash_of_foo, options=[hash_of_bar] * i, option_votes=[i] * i, total=i))
+        r = decode_proposals(vs, serial=10)
+        self.assertEqual(len(r), 3)
+        for i in range(3):
+            self.assertEqual(r[i].serial, 10 + i)
+            self.assertEqual(r[i].total, i)
+            self.assertEqual(r[i].option_votes, [i] * i)
+
+
+if __name__ == '__main__':
+    unittest.main()
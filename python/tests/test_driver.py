@@ -0,0 +1,74 @@
+# standard imports
+import unittest
+import logging
+
+# external imports
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.eth.block import block_latest
+
+# local imports
+from evm_tokenvote.unittest import TestEvmVote
+from evm_tokenvote.unittest.base import hash_of_foo
+from evm_tokenvote import Voter
+from evm_tokenvote import ProposalState
+from evm_tokenvote.driver import VoterDriver
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+
+class TestVoterDriver(TestEvmVote):
+
+    def setUp(self):
+        super(TestVoterDriver, self).setUp()
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 1000)
+        self.rpc.do(o)
+        o = block_latest()
+        self.proposal_block_height = self.rpc.do(o)
+
+
+    def test_add_options_scan(self):
+        options = [(i + 1).to_bytes(32, 'big').hex() for i in range(2000)]
+        driver = VoterDriver(self.chain_spec, self.rpc, self.signer, self.voter_address, self.accounts[0], gas_fraction=0.25, receipt_poll_interval=0)
+        r = driver.add_options(0, options)
+        self.assertGreater(r.txs, 1)
+        self.assertLess(r.txs, 100)
+        self.assertGreater(r.gas, 0)
+
+        c = Voter(self.chain_spec)
+        o = c.option_count(self.voter_address, 0, sender_address=self.accounts[0])
+        self.assertEqual(int(self.rpc.do(o), 16), 2000)
+        o = c.get_options(self.voter_address, 0, 1999, 1, sender_address=self.accounts[0])
+        self.assertEqual(self.rpc.do(o)[-64:], options[1999])
+
+        # scan is not allowed before deadline.
+        with self.assertRaises(Exception):
+            driver.scan(0, option_count=2000)
+
+        o = block_latest()
+        now_block_height = self.rpc.do(o)
+        self.backend.mine_blocks(self.proposal_block_height + 1000 - now_block_height + 1)
+
+        r = driver.scan(0, option_count=2000)
+        self.assertEqual(r.txs, 1)
+        self.assertGreater(r.gas, 0)
+
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        proposal = c.parse_proposal(self.rpc.do(o))
+        self.assertGreater(proposal.state & ProposalState.SCANNED, 0)
+
+        r = driver.scan(0)
+        self.assertEqual(r.txs, 0)
+        self.assertEqual(r.gas, 0)
+
+
+    def test_budget_too_small(self):
+        driver = VoterDriver(self.chain_spec, self.rpc, self.signer, self.voter_address, self.accounts[0], gas_fraction=0.001, receipt_poll_interval=0)
+        with self.assertRaises(ValueError):
+            driver.add_options(0, [hash_of_foo])
+
+
+if __name__ == '__main__':
+    unittest.main()
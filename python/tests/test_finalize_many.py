@@ -0,0 +1,99 @@
+# standard imports
+import unittest
+import logging
+
+# external imports
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.eth.gas import OverrideGasOracle
+from chainlib.eth.tx import receipt
+from chainlib.eth.block import block_latest
+
+# local imports
+from evm_tokenvote.unittest import TestEvmVoteProposal
+from evm_tokenvote.unittest.base import hash_of_bar
+from evm_tokenvote import Voter
+from evm_tokenvote import ProposalState
+from evm_tokenvote.finalize import finalize_many_count
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+
+class TestFinalizeMany(TestEvmVoteProposal):
+
+    def setUp(self):
+        super(TestFinalizeMany, self).setUp()
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for i in range(4):
+            (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_bar, 10)
+            self.rpc.do(o)
+        # one more proposal that is still open after the others expire.
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_bar, 1000)
+        self.rpc.do(o)
+
+        o = block_latest()
+        now_block_height = self.rpc.do(o)
+        need_blocks = self.proposal_block_height + 100 - now_block_height + 1
+        self.backend.mine_blocks(need_blocks)
+
+
+    def current_proposal(self):
+        c = Voter(self.chain_spec)
+        o = c.current_proposal(self.voter_address, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        return c.parse_proposal(r)
+
+
+    def test_finalize_many(self):
+        (count, gas) = finalize_many_count(self.chain_spec, self.rpc, self.voter_address, self.trent, 8000000)
+        self.assertGreater(count, 5)
+
+        gas_oracle = OverrideGasOracle(limit=gas, conn=self.conn)
+        nonce_oracle = RPCNonceOracle(self.trent, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle, gas_oracle=gas_oracle)
+        (tx_hash, o) = c.finalize_many(self.voter_address, self.trent, count)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        # one completed event per expired proposal, stopping at the open proposal.
+        self.assertEqual(len(r['logs']), 5)
+
+        proposal = self.current_proposal()
+        self.assertEqual(proposal.state & ProposalState.FINAL, 0)
+
+        # nothing left to finalize.
+        (tx_hash, o) = c.finalize_many(self.voter_address, self.trent, count)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.assertEqual(len(r['logs']), 0)
+
+
+    def test_finalize_many_gas_limit(self):
+        c = Voter(self.chain_spec)
+        o = c.estimate_finalize_many(self.voter_address, self.trent, 2)
+        gas_two = int(self.rpc.do(o), 16)
+
+        (count, gas) = finalize_many_count(self.chain_spec, self.rpc, self.voter_address, self.trent, gas_two)
+        self.assertEqual(count, 2)
+        self.assertLessEqual(gas, gas_two)
+
+        gas_oracle = OverrideGasOracle(limit=gas, conn=self.conn)
+        nonce_oracle = RPCNonceOracle(self.trent, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle, gas_oracle=gas_oracle)
+        (tx_hash, o) = c.finalize_many(self.voter_address, self.trent, count)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.assertEqual(len(r['logs']), 2)
+
+        (count, gas) = finalize_many_count(self.chain_spec, self.rpc, self.voter_address, self.trent, 21000)
+        self.assertEqual(count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# standard imports
+import unittest
+import logging
+
+# local imports
+from evm_tokenvote.unittest.gas import TestEvmVoteGas
+
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+class TestGasProfile(TestEvmVoteGas):
+
+    budgets = {
+        'addOption': 1,
+            }
+
+    def test_sweep(self):
+        profile = self.profile_sweep(option_counts=[0, 2], voter_counts=[1, 3], registry=[False, True])
+        for operation in ['propose', 'addOption', 'vote', 'voteOption', 'scan', 'finalize', 'withdraw']:
+            self.assertIn(operation, profile.operations())
+
+        curve = profile.curve('voteOption', 'voters', options=2, registry=False)
+        self.assertEqual([v[0] for v in curve], [1, 3])
+        curve = profile.curve('vote', 'options')
+        self.assertEqual([v[0] for v in curve], [0])
+
+        curve = profile.curve('scan', 'options', voters=1, registry=True)
+        self.assertEqual([v[0] for v in curve], [0, 2])
+        # scan does not depend on number of options.
+        self.assertEqual(curve[0][1], curve[1][1])
+
+        over = profile.over_budget()
+        self.assertEqual(len(over), 2 * 2 * 2)
+        for v in over:
+            self.assertEqual(v.operation, 'addOption')
+
+        s = profile.to_csv()
+        self.assertEqual(s.split('\n')[0], 'operation,gas,options,voters,registry,option,voter')
+
+
+
+    def test_sweep_multi(self):
+        profile = self.profile_sweep(option_counts=[0, 2], multi=True)
+        self.assertIn('proposeMulti', profile.operations())
+        self.assertNotIn('addOption', profile.operations())
+        curve = profile.curve('proposeMulti', 'options')
+        self.assertEqual([v[0] for v in curve], [2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+# standard imports
+import unittest
+import logging
+import os
+import tempfile
+import shutil
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.eth.tx import receipt
+from chainlib.eth.block import block_latest
+from hexathon import same as same_hex
+from eth_erc20 import ERC20
+
+# local imports
+from evm_tokenvote.unittest import TestEvmVote
+from evm_tokenvote.unittest.base import hash_of_foo
+from evm_tokenvote.unittest.base import hash_of_bar
+from evm_tokenvote import Voter
+from evm_tokenvote.indexer import (
+    ProposalStore,
+    ProposalIndexer,
+    ProposalBackfill,
+)
+
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+class TestVoteIndexer(TestEvmVote):
+
+    def setUp(self):
+        super(TestVoteIndexer, self).setUp()
+        self.d = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.d, 'index.sqlite')
+
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+
+    def propose_and_finalize(self, description, vote_value):
+        nonce_oracle = RPCNonceOracle(self.ivan, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.ivan, description, 100)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote(self.voter_address, self.alice, vote_value)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        self.backend.mine_blocks(100)
+
+        (tx_hash, o) = c.finalize_vote(self.voter_address, self.alice)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        # release the tokens locked to this proposal, so the next one can be voted on.
+        (tx_hash, o) = c.withdraw(self.voter_address, self.alice)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+
+    def test_index(self):
+        half_supply = int(self.initial_supply / 2)
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.transfer(self.address, self.accounts[0], self.alice, half_supply)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.approve(self.address, self.alice, self.voter_address, half_supply)
+        self.rpc.do(o)
+
+        self.propose_and_finalize(hash_of_foo, 42)
+
+        store = ProposalStore(self.db_path)
+        indexer = ProposalIndexer(self.rpc, store, self.voter_address, chunk_size=10)
+        c = indexer.sync()
+        self.assertEqual(c, 2)
+
+        added = store.added(self.voter_address)
+        self.assertEqual(len(added), 1)
+        self.assertEqual(added[0].proposal_idx, 0)
+        self.assertEqual(added[0].target_vote_ppm, 500000)
+        completed = store.completed(self.voter_address)
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0].proposal_idx, 0)
+        self.assertEqual(completed[0].total_vote, 42)
+        self.assertTrue(completed[0].insufficient)
+        self.assertFalse(completed[0].cancelled)
+
+        o = block_latest()
+        height = self.rpc.do(o)
+        self.assertEqual(store.checkpoint(self.voter_address), height)
+        store.close()
+
+        self.propose_and_finalize(hash_of_bar, 13)
+
+        store = ProposalStore(self.db_path)
+        indexer = ProposalIndexer(self.rpc, store, self.voter_address, reorg_depth=200)
+        indexer.sync()
+
+        added = store.added(self.voter_address)
+        self.assertEqual([v.proposal_idx for v in added], [0, 1])
+        completed = store.completed(self.voter_address)
+        self.assertEqual([v.total_vote for v in completed], [42, 13])
+        store.close()
+
+
+    def test_index_log_limit(self):
+        nonce_oracle = RPCNonceOracle(self.ivan, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for i in range(3):
+            (tx_hash, o) = c.propose(self.voter_address, self.ivan, hash_of_foo, 100)
+            self.rpc.do(o)
+            self.backend.mine_blocks(101)
+            (tx_hash, o) = c.finalize_vote(self.voter_address, self.ivan)
+            self.rpc.do(o)
+
+        self.rpc.log_limit = 2
+        store = ProposalStore(self.db_path)
+        indexer = ProposalIndexer(self.rpc, store, self.voter_address, chunk_size=10000)
+        c = indexer.sync()
+        self.assertEqual(c, 6)
+        self.assertLess(indexer.chunk_size, 10000)
+        self.assertEqual(len(store.added(self.voter_address)), 3)
+        self.assertEqual(len(store.completed(self.voter_address)), 3)
+
+
+    def test_backfill(self):
+        nonce_oracle = RPCNonceOracle(self.ivan, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for i in range(4):
+            (tx_hash, o) = c.propose(self.voter_address, self.ivan, hash_of_foo, 100)
+            self.rpc.do(o)
+            self.backend.mine_blocks(101)
+            (tx_hash, o) = c.finalize_vote(self.voter_address, self.ivan)
+            self.rpc.do(o)
+
+        o = block_latest()
+        height = self.rpc.do(o)
+
+        self.rpc.log_limit = 1
+        store = ProposalStore(self.db_path)
+        backfill = ProposalBackfill(self.rpc, store, self.voter_address, shard_size=50, workers=3)
+        stats = backfill.run(0)
+        self.assertEqual(stats.events, 8)
+        self.assertEqual(stats.blocks, height + 1)
+        self.assertGreater(stats.blocks_per_second(), 0)
+        self.assertEqual(store.checkpoint(self.voter_address), height)
+
+        added = store.added(self.voter_address)
+        self.assertEqual([v.proposal_idx for v in added], [0, 1, 2, 3])
+        completed = store.completed(self.voter_address)
+        self.assertEqual([v.proposal_idx for v in completed], [0, 1, 2, 3])
+
+        indexer = ProposalIndexer(self.rpc, store, self.voter_address)
+        indexer.sync()
+        self.assertEqual(len(store.added(self.voter_address)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
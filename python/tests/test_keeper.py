@@ -0,0 +1,151 @@
+# standard imports
+import unittest
+import logging
+
+# external imports
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.eth.tx import receipt
+from chainlib.eth.block import block_latest
+from chainlib.eth.address import to_checksum_address
+from eth_erc20 import ERC20
+
+# local imports
+from evm_tokenvote.unittest import TestEvmVoteProposal
+from evm_tokenvote.unittest.base import hash_of_bar
+from evm_tokenvote import Voter
+from evm_tokenvote import ProposalState
+from evm_tokenvote.keeper import Keeper
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+
+class TestKeeper(TestEvmVoteProposal):
+
+    def setUp(self):
+        super(TestKeeper, self).setUp()
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.constructor(self.accounts[0], self.address)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.other_voter_address = to_checksum_address(r['contract_address'])
+
+        (tx_hash, o) = c.propose(self.other_voter_address, self.accounts[0], hash_of_bar, 200)
+        self.rpc.do(o)
+        o = block_latest()
+        self.other_proposal_block_height = self.rpc.do(o)
+
+        self.keeper = Keeper(self.chain_spec, self.rpc, self.signer, self.trent, [self.voter_address, self.other_voter_address], recheck_blocks=50, receipt_poll_interval=0)
+
+
+    def state(self, voter_address, proposal_idx):
+        c = Voter(self.chain_spec)
+        o = c.get_proposal(voter_address, proposal_idx, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        return c.parse_proposal(r).state
+
+
+    def mine_to(self, height):
+        o = block_latest()
+        now_block_height = self.rpc.do(o)
+        self.backend.mine_blocks(height - now_block_height)
+
+
+    def test_keeper_schedule(self):
+        self.assertEqual(self.keeper.tick(), 0)
+        self.assertEqual(self.keeper.metrics.txs, 0)
+        # both contracts are next due at the recheck limit, before either deadline.
+        o = block_latest()
+        height = self.rpc.do(o)
+        self.assertEqual(self.keeper.next_wake(), height + 50)
+
+        # contracts not due are not checked.
+        self.assertEqual(self.keeper.tick(height=height + 1), 0)
+
+        self.mine_to(self.proposal_block_height + 100)
+        self.assertEqual(self.keeper.tick(), 1)
+        self.assertEqual(self.keeper.metrics.txs, 2)
+        self.assertGreater(self.state(self.voter_address, 0) & ProposalState.FINAL, 0)
+        self.assertGreater(self.state(self.voter_address, 0) & ProposalState.SCANNED, 0)
+        self.assertEqual(self.state(self.other_voter_address, 0) & ProposalState.FINAL, 0)
+        self.assertEqual(self.keeper.next_wake(), self.proposal_block_height + 100 + 50)
+
+        self.mine_to(self.other_proposal_block_height + 200)
+        self.assertEqual(self.keeper.tick(), 1)
+        self.assertGreater(self.state(self.other_voter_address, 0) & ProposalState.FINAL, 0)
+
+        self.assertEqual(self.keeper.metrics.finalized(), 2)
+        for v in self.keeper.metrics.latencies:
+            # scan and finalize are mined in consecutive blocks after the deadline.
+            self.assertLessEqual(v.blocks(), 2)
+        self.assertEqual(self.keeper.metrics.failed, 0)
+
+        # the local nonce matches the network.
+        nonce = self.keeper.nonce
+        self.keeper.sync_nonce()
+        self.assertEqual(self.keeper.nonce, nonce)
+        self.assertEqual(self.keeper.nonce, 4)
+
+
+    def test_keeper_queue(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for i in range(3):
+            (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_bar, 10)
+            self.rpc.do(o)
+
+        self.mine_to(self.proposal_block_height + 100)
+        self.assertEqual(self.keeper.tick(), 4)
+        for i in range(4):
+            self.assertGreater(self.state(self.voter_address, i) & ProposalState.FINAL, 0)
+        self.assertEqual(self.keeper.targets[0].cursor, 4)
+
+        # nothing left to do on the next check.
+        self.assertEqual(self.keeper.tick(height=self.keeper.next_wake()), 0)
+        self.assertEqual(self.keeper.metrics.txs, 8)
+
+
+    def test_keeper_cancelled_after_deadline(self):
+        half_supply = int(self.initial_supply / 2)
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.transfer(self.address, self.accounts[0], self.alice, half_supply)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.approve(self.address, self.alice, self.voter_address, half_supply)
+        self.rpc.do(o)
+
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote_cancel(self.voter_address, self.alice, half_supply)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        state = self.state(self.voter_address, 0)
+        self.assertGreater(state & ProposalState.CANCELLED, 0)
+        self.assertGreater(state & ProposalState.IMMEDIATE, 0)
+
+        # first seen after the deadline, when finalize can only revert.
+        self.mine_to(self.proposal_block_height + 101)
+        self.assertEqual(self.keeper.tick(), 0)
+        self.assertEqual(self.keeper.metrics.txs, 0)
+        self.assertEqual(self.keeper.metrics.stuck, 1)
+        self.assertEqual(self.keeper.targets[0].stuck, 0)
+        self.assertEqual(self.state(self.voter_address, 0) & ProposalState.FINAL, 0)
+
+        # the stuck contract is no longer scheduled, the other one still is.
+        self.assertEqual(self.keeper.next_wake(), self.keeper.targets[1].wake)
+        self.mine_to(self.other_proposal_block_height + 200)
+        self.assertEqual(self.keeper.tick(), 1)
+        self.assertEqual(self.keeper.metrics.txs, 2)
+        self.assertEqual(self.keeper.metrics.failed, 0)
+        self.assertEqual(self.keeper.metrics.stuck, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,8 @@ from evm_tokenvote.unittest.base import hash_of_bar
 from evm_tokenvote.unittest.base import hash_of_baz
 from evm_tokenvote import Voter
 from evm_tokenvote import ProposalState
+from evm_tokenvote.decode import decode_vote_counts
+from evm_tokenvote.stream import iterate_options
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -49,6 +51,10 @@ class TestVoteBase(TestEvmVote):
         o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
         r = self.rpc.do(o)
         proposal = c.parse_proposal(r)
+        self.assertEqual(len(proposal.options), 2)
+        self.assertTrue(same_hex(proposal.options[0], hash_of_bar))
+        self.assertTrue(same_hex(proposal.options[1], hash_of_baz))
+        self.assertEqual(proposal.option_votes, [0, 0])
 
         o = c.get_option(self.voter_address, 0, 0, sender_address=self.accounts[0])
         r = self.rpc.do(o)
@@ -74,6 +80,56 @@ class TestVoteBase(TestEvmVote):
         self.assertEqual(count, 0)
 
     
+    def test_propose_multi_single_tx(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100, options=[hash_of_bar, hash_of_baz])
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertTrue(same_hex(proposal.description_digest, hash_of_foo))
+        self.assertEqual(len(proposal.options), 2)
+        self.assertTrue(same_hex(proposal.options[0], hash_of_bar))
+        self.assertTrue(same_hex(proposal.options[1], hash_of_baz))
+        self.assertEqual(proposal.option_votes, [0, 0])
+
+        o = c.option_count(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), 2)
+
+
+    def test_add_options_paged(self):
+        options = [(i + 1).to_bytes(32, 'big').hex() for i in range(300)]
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100, options=options[:100])
+        self.rpc.do(o)
+        for i in range(100, 300, 100):
+            (tx_hash, o) = c.add_options(self.voter_address, self.accounts[0], 0, options[i:i+100])
+            self.rpc.do(o)
+            o = receipt(tx_hash)
+            r = self.rpc.do(o)
+            self.assertEqual(r['status'], 1)
+
+        o = c.option_count(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), 300)
+
+        r = list(iterate_options(self.rpc, self.chain_spec, self.voter_address, 0, page_size=128))
+        self.assertEqual(len(r), 300)
+        self.assertEqual([v[1] for v in r], options)
+        self.assertEqual([v[2] for v in r], [0] * 300)
+
+        o = c.vote_counts(self.voter_address, 0, 290, 100, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(decode_vote_counts(r), [0] * 10)
+
+
     def test_vote_multi(self):
         third_of_supply = int(self.initial_supply / 3)
         nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
@@ -154,6 +210,57 @@ class TestVoteBase(TestEvmVote):
         self.assertEqual(proposal.state & ProposalState.FINAL, ProposalState.FINAL)
         self.assertEqual(proposal.state & ProposalState.TIED, 0)
         self.assertEqual(proposal.state & ProposalState.INSUFFICIENT, 0)
+        self.assertEqual(proposal.option_votes, [third_of_supply, third_of_supply * 2])
+
+
+    def test_vote_options_split(self):
+        half_of_supply = int(self.initial_supply / 2)
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.transfer(self.address, self.accounts[0], self.alice, half_of_supply)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.approve(self.address, self.alice, self.voter_address, half_of_supply)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100, options=[hash_of_foo, hash_of_bar, hash_of_baz])
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote_options(self.voter_address, self.alice, [0, 2, 0], [10, 30, 5])
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        # invalid option index reverts the whole vote
+        (tx_hash, o) = c.vote_options(self.voter_address, self.alice, [1, 3], [1, 1])
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 0)
+
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.option_votes, [15, 0, 30])
+        self.assertEqual(proposal.total, 45)
+        self.assertEqual(proposal.lead, 2)
+
+        # a single token transfer for the sum of values.
+        c = ERC20(self.chain_spec)
+        o = c.balance_of(self.voter_address, self.alice, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), 45)
+
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        with self.assertRaises(ValueError):
+            c.vote_options(self.voter_address, self.alice, [0, 1], [1])
 
 
     def test_vote_unanimous_fail(self):
@@ -235,6 +342,7 @@ class TestVoteBase(TestEvmVote):
         self.assertEqual(proposal.state & ProposalState.FINAL, ProposalState.FINAL)
         self.assertEqual(proposal.state & ProposalState.TIED, 0)
         self.assertEqual(proposal.state & ProposalState.INSUFFICIENT, ProposalState.INSUFFICIENT)
+        self.assertEqual(proposal.lead, 1)
 
 
     def test_vote_tied(self):
@@ -312,6 +420,62 @@ class TestVoteBase(TestEvmVote):
         self.assertEqual(proposal.state & ProposalState.TIED, ProposalState.TIED)
         self.assertEqual(proposal.state & ProposalState.INSUFFICIENT, 0)
 
+        # on a tie, the option that first reached the leading vote count remains the lead.
+        self.assertEqual(proposal.lead, 1)
+
+
+    def test_vote_tied_zero_vote(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for v in [self.alice, self.bob, self.carol]:
+            (tx_hash, o) = c.transfer(self.address, self.accounts[0], v, 100)
+            self.rpc.do(o)
+
+        for v in [self.alice, self.bob, self.carol]:
+            nonce_oracle = RPCNonceOracle(v, conn=self.conn)
+            c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+            (tx_hash, o) = c.approve(self.address, v, self.voter_address, 100)
+            self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100)
+        self.rpc.do(o)
+
+        (tx_hash, o) = c.add_option(self.voter_address, self.accounts[0], 0, hash_of_bar)
+        self.rpc.do(o)
+
+        (tx_hash, o) = c.add_option(self.voter_address, self.accounts[0], 0, hash_of_baz)
+        self.rpc.do(o)
+
+        for (v, option) in [(self.alice, 1,), (self.bob, 0,)]:
+            nonce_oracle = RPCNonceOracle(v, conn=self.conn)
+            c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+            (tx_hash, o) = c.vote(self.voter_address, v, 100, option=option)
+            self.rpc.do(o)
+
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.state & ProposalState.TIED, ProposalState.TIED)
+        self.assertEqual(proposal.lead, 1)
+
+        # a zero vote on the lead does not change any count, and must not break the tie.
+        nonce_oracle = RPCNonceOracle(self.carol, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote(self.voter_address, self.carol, 0, option=1)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.state & ProposalState.TIED, ProposalState.TIED)
+        self.assertEqual(proposal.lead, 1)
+        self.assertEqual(proposal.option_votes, [100, 100])
+
 
 if __name__ == '__main__':
     unittest.main()
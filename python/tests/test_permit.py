@@ -0,0 +1,73 @@
+# standard imports
+import unittest
+import logging
+
+# external imports
+import coincurve
+from chainlib.chain import ChainSpec
+from chainlib.eth.nonce import OverrideNonceOracle
+from chainlib.eth.tx import TxFormat
+from funga.eth.keystore.dict import DictKeystore
+from funga.eth.signer import EIP155Signer
+from funga.eth.encoding import (
+    public_key_to_address,
+    to_checksum_address,
+)
+from hexathon import strip_0x
+
+# local imports
+from evm_tokenvote import Voter
+from evm_tokenvote.calldata import template
+from evm_tokenvote.permit import (
+    permit_digest,
+    sign_permit,
+)
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+some_address = '0x185Cbce7650FF7Ad3B587E26B2877D95568805E3'
+
+
+class TestPermit(unittest.TestCase):
+
+    def setUp(self):
+        self.keystore = DictKeystore()
+        self.signer = EIP155Signer(self.keystore)
+        self.owner = self.keystore.new()
+        self.domain_separator = bytes.fromhex(hash_of_foo)
+
+
+    def test_sign_recover(self):
+        o = sign_permit(self.signer, self.domain_separator, self.owner, some_address, 42, 3, 1000)
+        self.assertIn(o.v, [27, 28])
+        digest = permit_digest(self.domain_separator, self.owner, some_address, 42, 3, 1000)
+        pk = coincurve.PublicKey.from_signature_and_message(o.r + o.s + bytes([o.v - 27]), digest, hasher=None)
+        self.assertEqual(to_checksum_address(public_key_to_address(pk)), strip_0x(self.owner))
+
+        # any change of permit content changes the digest
+        self.assertNotEqual(digest, permit_digest(self.domain_separator, self.owner, some_address, 42, 4, 1000))
+        self.assertNotEqual(digest, permit_digest(bytes(32), self.owner, some_address, 42, 3, 1000))
+
+
+    def test_vote_with_permit_encode(self):
+        o = sign_permit(self.signer, self.domain_separator, self.owner, some_address, 42, 0, 1000)
+        c = Voter(ChainSpec('evm', 'foo', 42), signer=self.signer, nonce_oracle=OverrideNonceOracle(self.owner, 0))
+
+        tx = c.vote_with_permit(some_address, self.owner, o, tx_format=TxFormat.DICT)
+        data = strip_0x(tx['data'])
+        self.assertEqual(data[:8], template('voteWithPermit(uint256,uint256,uint8,bytes32,bytes32)').selector)
+        self.assertEqual(data[8:8+64], (42).to_bytes(32, 'big').hex())
+        self.assertEqual(data[8+128:8+192], o.v.to_bytes(32, 'big').hex())
+        self.assertEqual(data[8+192:8+256], o.r.hex())
+
+        tx = c.vote_with_permit(some_address, self.owner, o, option=2, tx_format=TxFormat.DICT)
+        data = strip_0x(tx['data'])
+        self.assertEqual(data[:8], template('voteOptionWithPermit(uint256,uint256,uint256,uint8,bytes32,bytes32)').selector)
+        self.assertEqual(data[8:8+64], (2).to_bytes(32, 'big').hex())
+        self.assertEqual(data[8+320:8+384], o.s.hex())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+# standard imports
+import unittest
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.error import RPCException
+from eth_erc20 import ERC20
+
+# local imports
+from evm_tokenvote.unittest import TestEvmVoteProposal
+from evm_tokenvote import Voter
+from evm_tokenvote.pipeline import (
+    VoteOrder,
+    VotePipeline,
+)
+
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+class RejectingConnection:
+
+    def __init__(self, conn, reject_at):
+        self.conn = conn
+        self.reject_at = reject_at
+        self.sends = 0
+
+
+    def do(self, o, **kwargs):
+        if o['method'] == 'eth_sendRawTransaction':
+            self.sends += 1
+            if self.sends == self.reject_at:
+                raise RPCException('rejected')
+        return self.conn.do(o, **kwargs)
+
+
+class HexStatusConnection:
+    """Returns receipt status as a hex string, like an HTTP node does.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+    def do(self, o, **kwargs):
+        r = self.conn.do(o, **kwargs)
+        if o['method'] == 'eth_getTransactionReceipt' and r != None:
+            r = dict(r)
+            r['status'] = hex(r['status'])
+        return r
+
+
+class TestVotePipeline(TestEvmVoteProposal):
+
+    def test_pipeline(self):
+        voters = [self.alice, self.bob, self.carol, self.dave]
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for v in voters:
+            (tx_hash, o) = c.transfer(self.address, self.accounts[0], v, 100)
+            self.rpc.do(o)
+
+        orders = []
+        for i, v in enumerate(voters):
+            orders.append(VoteOrder(v, i + 1))
+        orders.append(VoteOrder(self.alice, 10, approve=False))
+        # exceeds balance, vote transaction will revert.
+        orders.append(VoteOrder(self.mallory, 10))
+
+        pipeline = VotePipeline(self.chain_spec, self.rpc, self.signer, self.address, self.voter_address, batch_size=3, max_in_flight=4, receipt_poll_interval=0)
+        (results, stats) = pipeline.run(orders)
+
+        self.assertEqual(stats.stage['nonce'].count, 6)
+        self.assertEqual(stats.stage['nonce'].failed, 0)
+        self.assertEqual(stats.stage['sign'].count, 6)
+        self.assertEqual(stats.stage['send'].count, 11)
+        self.assertEqual(stats.stage['receipt'].count, 11)
+        self.assertEqual(stats.stage['receipt'].failed, 2)
+        self.assertEqual(stats.txs, 11)
+        self.assertGreater(stats.txs_per_second(), 0)
+
+        for i in range(4):
+            self.assertTrue(results[i].ok())
+        self.assertEqual(results[4].ok(), False)
+        self.assertEqual(results[4].stage, 'receipt')
+        self.assertEqual(results[5].ok(), False)
+        self.assertEqual(results[5].stage, 'receipt')
+
+        c = Voter(self.chain_spec)
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.total, 1 + 2 + 3 + 4)
+
+
+    def test_pipeline_hex_status(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.transfer(self.address, self.accounts[0], self.alice, 100)
+        self.rpc.do(o)
+
+        orders = [
+            VoteOrder(self.alice, 1),
+            # exceeds balance, vote transaction will revert.
+            VoteOrder(self.mallory, 10),
+                ]
+        pipeline = VotePipeline(self.chain_spec, HexStatusConnection(self.rpc), self.signer, self.address, self.voter_address, receipt_poll_interval=0)
+        (results, stats) = pipeline.run(orders)
+
+        self.assertTrue(results[0].ok())
+        self.assertFalse(results[1].ok())
+        self.assertEqual(results[1].stage, 'receipt')
+        self.assertEqual(stats.stage['receipt'].failed, 1)
+
+
+    def test_pipeline_nonce_gap(self):
+        voters = [self.alice, self.bob]
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for v in voters:
+            (tx_hash, o) = c.transfer(self.address, self.accounts[0], v, 100)
+            self.rpc.do(o)
+
+        orders = [
+            VoteOrder(self.alice, 1),
+            # cannot be encoded, so signing fails.
+            VoteOrder(self.alice, -1),
+            VoteOrder(self.bob, 2),
+            # would be signed with a nonce after the unused ones of the failed order.
+            VoteOrder(self.alice, 3, approve=False),
+                ]
+
+        executor = ProcessPoolExecutor(max_workers=2)
+        pipeline = VotePipeline(self.chain_spec, self.rpc, self.signer, self.address, self.voter_address, executor=executor, receipt_poll_interval=0)
+        (results, stats) = pipeline.run(orders)
+        executor.shutdown()
+
+        self.assertTrue(results[0].ok())
+        self.assertEqual(results[1].stage, 'sign')
+        self.assertTrue(results[2].ok())
+        self.assertEqual(results[3].stage, 'sign')
+        self.assertEqual(results[3].tx_hashes, [])
+        self.assertEqual(stats.stage['sign'].failed, 2)
+        self.assertEqual(stats.stage['send'].count, 4)
+        self.assertEqual(stats.stage['send'].failed, 0)
+
+        c = Voter(self.chain_spec)
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.total, 1 + 2)
+
+
+    def test_pipeline_send_gap(self):
+        voters = [self.alice, self.bob]
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for v in voters:
+            (tx_hash, o) = c.transfer(self.address, self.accounts[0], v, 100)
+            self.rpc.do(o)
+
+        orders = [
+            VoteOrder(self.alice, 1),
+            VoteOrder(self.alice, 2),
+            VoteOrder(self.bob, 3),
+                ]
+
+        # each round sends one transaction per account; the third send is the first vote of alice.
+        conn = RejectingConnection(self.rpc, 3)
+        pipeline = VotePipeline(self.chain_spec, conn, self.signer, self.address, self.voter_address, receipt_poll_interval=0)
+        (results, stats) = pipeline.run(orders)
+
+        self.assertEqual(results[0].stage, 'send')
+        self.assertEqual(len(results[0].tx_hashes), 1)
+        self.assertEqual(results[1].stage, 'send')
+        self.assertEqual(results[1].tx_hashes, [])
+        self.assertTrue(results[2].ok())
+        # approve and vote of bob, and the approve of alice before the rejected vote.
+        self.assertEqual(conn.sends, 4)
+        self.assertEqual(stats.stage['send'].count, 6)
+        self.assertEqual(stats.stage['send'].failed, 3)
+
+        c = Voter(self.chain_spec)
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.total, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
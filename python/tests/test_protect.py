@@ -35,6 +35,16 @@ class TestVoteProtect(TestEvmVoteAccounts):
         logg.debug('published protected voter on address {} with hash {}'.format(self.voter_address, tx_hash))
        
 
+    def assert_completed(self, logs, proposal_indices):
+        self.assertEqual(len(logs), len(proposal_indices))
+        for i, v in enumerate(logs):
+            self.assertEqual(int(v['topics'][1], 16), proposal_indices[i])
+            # cancelled
+            self.assertEqual(int(v['topics'][2], 16), 1)
+            # insufficient
+            self.assertEqual(int(v['topics'][3], 16), 0)
+
+
     def test_propose(self):
         nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
         c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
@@ -57,6 +67,7 @@ class TestVoteProtect(TestEvmVoteAccounts):
         o = receipt(tx_hash)
         r = self.rpc.do(o)
         self.assertEqual(r['status'], 1)
+        self.assert_completed(r['logs'], [0])
 
         o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
         r = self.rpc.do(o)
@@ -66,5 +77,29 @@ class TestVoteProtect(TestEvmVoteAccounts):
         self.assertEqual(proposal.state & ProposalState.CANCELLED, ProposalState.CANCELLED)
 
 
+    def test_finalize_many(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        for i in range(2):
+            (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100)
+            self.rpc.do(o)
+
+        c = GiftableToken(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.mint_to(self.address, self.accounts[0], self.alice, 1)
+        self.rpc.do(o)
+
+        self.backend.mine_blocks(100)
+
+        # both proposals were created before the supply change, and are cancelled by it.
+        nonce_oracle = RPCNonceOracle(self.trent, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.finalize_many(self.voter_address, self.trent, 2)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.assert_completed(r['logs'], [0, 1])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,158 @@
+# standard imports
+import unittest
+import logging
+
+# external imports
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.eth.tx import receipt
+from chainlib.eth.block import block_latest
+from eth_erc20 import ERC20
+
+# local imports
+from evm_tokenvote.unittest import TestEvmVoteProposal
+from evm_tokenvote.unittest.base import (
+    hash_of_foo,
+    hash_of_bar,
+    hash_of_baz,
+)
+from evm_tokenvote import Voter
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+
+class TestVoteRollover(TestEvmVoteProposal):
+
+    def setUp(self):
+        super(TestVoteRollover, self).setUp()
+        self.value = int(self.initial_supply / 2)
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.transfer(self.address, self.accounts[0], self.alice, self.value)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.approve(self.address, self.alice, self.voter_address, self.value)
+        self.rpc.do(o)
+
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote(self.voter_address, self.alice, self.value)
+        self.rpc.do(o)
+
+        o = block_latest()
+        now_block_height = self.rpc.do(o)
+        need_blocks = self.proposal_block_height + 100 - now_block_height + 1
+        self.backend.mine_blocks(need_blocks)
+
+        nonce_oracle = RPCNonceOracle(self.trent, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.scan(self.voter_address, self.trent, 0, 0)
+        self.rpc.do(o)
+        (tx_hash, o) = c.finalize_vote(self.voter_address, self.trent)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100, options=[hash_of_bar, hash_of_baz])
+        self.rpc.do(o)
+
+
+    def rollover_balance(self, voter_address):
+        c = Voter(self.chain_spec)
+        o = c.rollover_balance(self.voter_address, voter_address, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        return int(r, 16)
+
+
+    def test_vote_rollover(self):
+        half = int(self.value / 2)
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote_rollover(self.voter_address, self.alice, half, option=1)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.assertEqual(self.rollover_balance(self.alice), self.value - half)
+
+        # no tokens moved
+        c = ERC20(self.chain_spec)
+        o = c.balance_of(self.voter_address, self.alice, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), self.value)
+
+        # cannot vote more than the escrow
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote_rollover(self.voter_address, self.alice, self.value - half + 1, option=0)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 0)
+
+        (tx_hash, o) = c.vote_rollover(self.voter_address, self.alice, self.value - half, option=0)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.assertEqual(self.rollover_balance(self.alice), 0)
+
+        o = c.get_proposal(self.voter_address, 1, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.option_votes, [self.value - half, half])
+        self.assertEqual(proposal.total, self.value)
+
+        # escrow is locked to the new proposal
+        (tx_hash, o) = c.withdraw(self.voter_address, self.alice)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 0)
+
+
+    def test_rollover_withdraw(self):
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.rollover(self.voter_address, self.alice)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.assertEqual(self.rollover_balance(self.alice), self.value)
+
+        # voter without escrow cannot roll over
+        nonce_oracle = RPCNonceOracle(self.bob, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.rollover(self.voter_address, self.bob)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 0)
+
+        self.backend.mine_blocks(101)
+
+        nonce_oracle = RPCNonceOracle(self.trent, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.scan(self.voter_address, self.trent, 0, 0)
+        self.rpc.do(o)
+        (tx_hash, o) = c.finalize_vote(self.voter_address, self.trent)
+        self.rpc.do(o)
+
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.withdraw(self.voter_address, self.alice)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+        self.assertEqual(self.rollover_balance(self.alice), 0)
+
+        c = ERC20(self.chain_spec)
+        o = c.balance_of(self.address, self.alice, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), self.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
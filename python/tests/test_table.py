@@ -0,0 +1,102 @@
+# standard imports
+import unittest
+import logging
+
+# local imports
+from evm_tokenvote import (
+    Voter,
+    ProposalState,
+    ProposalTable,
+)
+from evm_tokenvote.unittest.encode import encode_proposal
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+hash_of_foo = '2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae'
+
+
+class TestTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = ProposalTable()
+        states = [
+            ProposalState.INIT,
+            ProposalState.INIT | ProposalState.FINAL,
+            ProposalState.INIT | ProposalState.FINAL | ProposalState.CANCELLED,
+            ProposalState.INIT | ProposalState.FINAL | ProposalState.CANCELLED | ProposalState.SUPPLYCHANGE,
+            ProposalState.INIT | ProposalState.FINAL | ProposalState.SUPPLYCHANGE,
+                ]
+        for i in range(len(states)):
+            v = encode_proposal(hash_of_foo, supply=10**24, total=i * 10**21, block_deadline=100 * (i + 1), target_vote_ppm=500000, state=states[i])
+            self.table.add_response(v, serial=i)
+
+
+    def test_add(self):
+        self.assertEqual(len(self.table), 5)
+        v = encode_proposal(hash_of_foo, cancel_votes=3, supply=10**24, total=42, block_deadline=1000, target_vote_ppm=333333, state=ProposalState.INIT)
+        a = Voter.parse_proposal(v, serial=5)
+        i = self.table.add(a)
+        self.assertEqual(i, 5)
+        b = self.table.get(i)
+        self.assertFalse(hasattr(b, '__dict__'))
+        self.assertEqual(b.description_digest, a.description_digest)
+        self.assertEqual(b.proposer, a.proposer)
+        self.assertEqual(b.supply, a.supply)
+        self.assertEqual(b.total, a.total)
+        self.assertEqual(b.cancel_votes, 3)
+        self.assertEqual(b.block_deadline, 1000)
+        self.assertEqual(b.target_vote_ppm, 333333)
+        self.assertEqual(b.state, ProposalState.INIT)
+        self.assertEqual(b.serial, 5)
+
+
+    def test_add_prefixed(self):
+        v = encode_proposal(hash_of_foo, supply=10**24, state=ProposalState.INIT)
+        a = Voter.parse_proposal(v)
+        proposer = a.proposer
+        a.description_digest = '0x' + a.description_digest
+        a.proposer = '0x' + a.proposer
+        b = self.table.get(self.table.add(a))
+        self.assertEqual(b.description_digest, hash_of_foo)
+        self.assertEqual(b.proposer, proposer)
+
+
+    def test_add_response(self):
+        v = encode_proposal(hash_of_foo, cancel_votes=3, supply=10**24, total=42, block_deadline=1000, target_vote_ppm=333333, state=ProposalState.INIT)
+        a = Voter.parse_proposal(v)
+        i = self.table.add_response(v)
+        b = self.table[i]
+        self.assertEqual(b.description_digest, a.description_digest)
+        self.assertEqual(b.proposer, a.proposer)
+        self.assertEqual(b.cancel_votes, a.cancel_votes)
+        self.assertEqual(b.supply, a.supply)
+        self.assertEqual(b.state, a.state)
+        self.assertIsNone(b.serial)
+
+
+    def test_filter_state(self):
+        r = self.table.with_state(ProposalState.CANCELLED | ProposalState.SUPPLYCHANGE)
+        self.assertEqual(list(r), [3])
+
+        r = self.table.with_state(ProposalState.CANCELLED | ProposalState.SUPPLYCHANGE, match_all=False)
+        self.assertEqual(list(r), [2, 3, 4])
+
+        r = self.table.without_state(ProposalState.FINAL)
+        self.assertEqual(list(r), [0])
+
+
+    def test_filter_deadline(self):
+        r = self.table.deadline_between(200, 400)
+        self.assertEqual(list(r), [1, 2])
+
+        r = self.table.with_state(ProposalState.SUPPLYCHANGE, rows=r)
+        self.assertEqual(list(r), [])
+
+        r = self.table.deadline_between(200, 1000)
+        r = self.table.with_state(ProposalState.CANCELLED, rows=r)
+        self.assertEqual([p.total for p in self.table.select(r)], [2 * 10**21, 3 * 10**21])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# standard imports
+import unittest
+import logging
+
+# external imports
+from chainlib.eth.nonce import RPCNonceOracle
+from chainlib.eth.tx import receipt
+from eth_erc20 import ERC20
+
+# local imports
+from evm_tokenvote.unittest import TestEvmVotePermit
+from evm_tokenvote.unittest.base import (
+    hash_of_foo,
+    hash_of_bar,
+    hash_of_baz,
+)
+from evm_tokenvote import Voter
+from evm_tokenvote.permit import (
+    PermitToken,
+    sign_permit,
+)
+
+logging.basicConfig(level=logging.DEBUG)
+logg = logging.getLogger()
+
+deadline = 1 << 64
+
+
+class TestVotePermit(TestEvmVotePermit):
+
+    def setUp(self):
+        super(TestVotePermit, self).setUp()
+        self.value = int(self.initial_supply / 4)
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = ERC20(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.transfer(self.token_address, self.accounts[0], self.alice, self.value)
+        self.rpc.do(o)
+
+
+    def permit(self, owner, value):
+        c = PermitToken(self.chain_spec)
+        o = c.nonces(self.token_address, owner, sender_address=owner)
+        r = self.rpc.do(o)
+        nonce = c.parse_nonces(r)
+        return sign_permit(self.signer, self.domain_separator, owner, self.voter_address, value, nonce, deadline)
+
+
+    def test_vote_with_permit(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100)
+        self.rpc.do(o)
+
+        permit = self.permit(self.alice, self.value)
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote_with_permit(self.voter_address, self.alice, permit)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        c = ERC20(self.chain_spec)
+        o = c.balance_of(self.voter_address, self.alice, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), self.value)
+
+        c = PermitToken(self.chain_spec)
+        o = c.nonces(self.token_address, self.alice, sender_address=self.alice)
+        r = self.rpc.do(o)
+        self.assertEqual(c.parse_nonces(r), 1)
+
+
+    def test_vote_with_submitted_permit(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100)
+        self.rpc.do(o)
+
+        # someone else submits the permit before the vote.
+        permit = self.permit(self.alice, self.value)
+        nonce_oracle = RPCNonceOracle(self.bob, conn=self.conn)
+        c = PermitToken(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.permit(self.token_address, self.bob, permit)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        # the permit fails in the vote, which uses the allowance it gave.
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote_with_permit(self.voter_address, self.alice, permit)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        c = ERC20(self.chain_spec)
+        o = c.balance_of(self.voter_address, self.alice, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        self.assertEqual(int(r, 16), self.value)
+
+
+    def test_vote_option_with_permit(self):
+        nonce_oracle = RPCNonceOracle(self.accounts[0], conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.propose(self.voter_address, self.accounts[0], hash_of_foo, 100, options=[hash_of_bar, hash_of_baz])
+        self.rpc.do(o)
+
+        half = int(self.value / 2)
+        permit = self.permit(self.alice, half)
+        nonce_oracle = RPCNonceOracle(self.alice, conn=self.conn)
+        c = Voter(self.chain_spec, signer=self.signer, nonce_oracle=nonce_oracle)
+        (tx_hash, o) = c.vote_with_permit(self.voter_address, self.alice, permit, option=1)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 1)
+
+        # a used permit cannot be replayed.
+        (tx_hash, o) = c.vote_with_permit(self.voter_address, self.alice, permit, option=1)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 0)
+
+        # a permit signed for another value does not authorize the vote.
+        permit = self.permit(self.alice, half)
+        permit.value = half + 1
+        (tx_hash, o) = c.vote_with_permit(self.voter_address, self.alice, permit, option=0)
+        self.rpc.do(o)
+        o = receipt(tx_hash)
+        r = self.rpc.do(o)
+        self.assertEqual(r['status'], 0)
+
+        o = c.get_proposal(self.voter_address, 0, sender_address=self.accounts[0])
+        r = self.rpc.do(o)
+        proposal = c.parse_proposal(r)
+        self.assertEqual(proposal.option_votes, [0, half])
+
+
+if __name__ == '__main__':
+    unittest.main()
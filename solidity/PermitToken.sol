@@ -0,0 +1,82 @@
+pragma solidity ^0.8.0;
+
+// SPDX-License-Identifier: AGPL-3.0-or-later
+// File-Version: 1
+// Minimal ERC20 token with EIP-2612 permit, used to test permit votes.
+// The chain id is passed to the constructor, since the contract is built for an evm version without the chainid opcode.
+
+contract PermitToken {
+	string public constant name = "Permit Token";
+	string public constant symbol = "PRMT";
+	uint8 public constant decimals = 6;
+	uint256 public totalSupply;
+
+	mapping ( address => uint256 ) public balanceOf;
+	mapping ( address => mapping ( address => uint256 ) ) public allowance;
+
+	// EIP-2612 permit nonce per owner.
+	mapping ( address => uint256 ) public nonces;
+
+	// EIP-712 domain of the permit signatures.
+	bytes32 public DOMAIN_SEPARATOR;
+
+	bytes32 constant PERMIT_TYPEHASH = keccak256("Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)");
+
+	event Transfer(address indexed _from, address indexed _to, uint256 _value);
+	event Approval(address indexed _owner, address indexed _spender, uint256 _value);
+
+	constructor(uint256 _supply, uint256 _chainId) {
+		totalSupply = _supply;
+		balanceOf[msg.sender] = _supply;
+		DOMAIN_SEPARATOR = keccak256(abi.encode(
+			keccak256("EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"),
+			keccak256(bytes(name)),
+			keccak256(bytes("1")),
+			_chainId,
+			address(this)
+		));
+		emit Transfer(address(0), msg.sender, _supply);
+	}
+
+	function transfer(address _to, uint256 _value) public returns (bool) {
+		require(balanceOf[msg.sender] >= _value, "ERR_BALANCE");
+		balanceOf[msg.sender] -= _value;
+		balanceOf[_to] += _value;
+		emit Transfer(msg.sender, _to, _value);
+		return true;
+	}
+
+	function transferFrom(address _from, address _to, uint256 _value) public returns (bool) {
+		require(allowance[_from][msg.sender] >= _value, "ERR_ALLOWANCE");
+		require(balanceOf[_from] >= _value, "ERR_BALANCE");
+		allowance[_from][msg.sender] -= _value;
+		balanceOf[_from] -= _value;
+		balanceOf[_to] += _value;
+		emit Transfer(_from, _to, _value);
+		return true;
+	}
+
+	function approve(address _spender, uint256 _value) public returns (bool) {
+		allowance[msg.sender][_spender] = _value;
+		emit Approval(msg.sender, _spender, _value);
+		return true;
+	}
+
+	// EIP-2612
+	function permit(address _owner, address _spender, uint256 _value, uint256 _deadline, uint8 _v, bytes32 _r, bytes32 _s) public {
+		bytes32 l_digest;
+		address l_signer;
+
+		require(_deadline >= block.timestamp, "ERR_EXPIRED");
+		l_digest = keccak256(abi.encodePacked(
+			"\x19\x01",
+			DOMAIN_SEPARATOR,
+			keccak256(abi.encode(PERMIT_TYPEHASH, _owner, _spender, _value, nonces[_owner], _deadline))
+		));
+		l_signer = ecrecover(l_digest, _v, _r, _s);
+		require(l_signer != address(0) && l_signer == _owner, "ERR_SIGNATURE");
+		nonces[_owner] += 1;
+		allowance[_owner][_spender] = _value;
+		emit Approval(_owner, _spender, _value);
+	}
+}
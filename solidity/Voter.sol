@@ -8,9 +8,9 @@ pragma solidity ^0.8.0;
 contract ERC20Vote {
 	uint8 constant STATE_INIT = 1; // proposal has been initiated.
 	uint8 constant STATE_FINAL = 2; // proposal has been finalized.
-	uint8 constant STATE_SCANNED = 4; // proposal votes have been scanned (this can be done after finalization).
+	uint8 constant STATE_SCANNED = 4; // proposal results have been marked as visible by scan (this can be done after finalization).
 	uint8 constant STATE_INSUFFICIENT = 8; // proposal did not attract minimum participation before deadline.
-	uint8 constant STATE_TIED = 16; // two or more proposal options have the same amount of votes.
+	uint8 constant STATE_TIED = 16; // two or more proposal options have the same, leading amount of votes. updated as votes are cast.
 	uint8 constant STATE_SUPPLYCHANGE = 32; // supply changed while voting was underway.
 	uint8 constant STATE_IMMEDIATE = 64; // minimum participation was attained before deadline.
 	uint8 constant STATE_CANCELLED = 128; // vote to cancel the proposal has the majority.
@@ -18,20 +18,26 @@ contract ERC20Vote {
 
 	bytes32 constant INTERNALS_BLOCK_WAIT_LIMIT = 0x67ca084db32598c571e2ad2dc8b95679c3fa14c63213935dfd8f0a158ff65c57;
 
+	// maximum number of options in a proposal, so that every option index fits in the uint16 lead field.
+	uint256 constant OPTIONS_MAX = uint256(type(uint16).max) + 1;
+
 	address public token;
 
+	// the order of fields is significant, as they are packed into storage slots in order of declaration.
+	// cancelVotes and supply share a slot. total, blockDeadline and targetVotePpm share a slot, so that a vote only writes to one of them.
+	// the remaining fields share a slot, which a vote only reads, except when the lead changes.
 	struct Proposal {
 		bytes32 description;
 		bytes32 []options;
 		uint256 []optionVotes;
-		uint256 cancelVotes;
-		uint256 supply;
-		uint256 total;
-		uint256 blockDeadline;
+		uint128 cancelVotes;
+		uint128 supply;
+		uint128 total;
+		uint64 blockDeadline;
 		uint24 targetVotePpm;
 		address proposer;
 		uint8 state;
-		uint8 scanCursor;
+		uint16 lead; // index of the option with the most votes. on a tie, the option that first reached the vote count.
 		bool internals; // vote to govern internal mechanics of the contract. May not contain options.
 	}
 
@@ -62,11 +68,15 @@ contract ERC20Vote {
 
 	// links escow to specific proposal, controls whether tokens can be withdrawn.
 	mapping ( address => uint256 ) proposalIdxLock;
+
+	// part of escrow rolled over from a finalized proposal, that has not yet been committed to votes on the current proposal.
+	mapping ( address => uint256 ) public rolloverBalance;
 	
 	// a new proposal has been added to the proposals index.
 	event ProposalAdded(uint256 indexed _blockDeadline, uint256 indexed voteTargetPpm, uint256 indexed _proposalIdx);
 
 	// the current proposal has been finalized; whether successful, cancelled or insufficient vote.
+	// also emitted when a supply change cancels the current proposal of a contract that protects supply, whichever method noticed the change.
 	event ProposalCompleted(uint256 indexed _proposalIdx, bool indexed _cancelled, bool indexed _insufficient, uint256 _totalVote);
 
 	// token must be specified. it is the caller's responsibility to ensure that the token has a value interface.
@@ -86,6 +96,16 @@ contract ERC20Vote {
 		return proposeCore(_description, _blockWait, _targetVotePpm, false);
 	}
 
+	// create new proposal with options in a single transaction.
+	// equivalent to propose() followed by addOption() for each option, in order.
+	function proposeMulti(bytes32 _description, bytes32[] calldata _options, uint256 _blockWait, uint24 _targetVotePpm) public returns (uint256) {
+		uint256 l_proposalIndex;
+
+		l_proposalIndex = proposeCore(_description, _blockWait, _targetVotePpm, false);
+		addOptionsCore(proposals[l_proposalIndex + 1], _options);
+		return l_proposalIndex;
+	}
+
 	// create new proposal to change internal settings in contract
 	function proposeInternal(bytes32 _description, bytes32 _option, uint256 _blockWait, uint24 _targetVotePpm) public returns (uint256) {
 		bool l_descriptionValid;
@@ -116,11 +136,11 @@ contract ERC20Vote {
 		l_proposal.description = _description;
 		l_proposal.targetVotePpm = _targetVotePpm;
 		l_blockDeadline = block.number + _blockWait;
-		l_proposal.blockDeadline = l_blockDeadline;
+		l_proposal.blockDeadline = toUint64(l_blockDeadline);
 		l_proposal.state = STATE_INIT;
 		l_proposal.internals = _internals;
 		proposals.push(l_proposal);
-		l_proposal.supply = checkSupply(proposals[l_proposalIndex + 1]);
+		checkSupply(proposals[l_proposalIndex + 1]);
 
 		emit ProposalAdded(l_blockDeadline, _targetVotePpm, l_proposalIndex);
 		return l_proposalIndex;
@@ -131,15 +151,64 @@ contract ERC20Vote {
 		Proposal storage l_proposal;
 
 		l_proposal = proposals[_proposalIdx + 1];
+		mustFitOptions(l_proposal, 1);
 		l_proposal.options.push(_optionDescription);
 		l_proposal.optionVotes.push(0);
 	}
 
+	// Add several voting options to proposal, in order.
+	// Options sets too large for a single transaction, like proposeMulti, can be added in chunks.
+	function addOptions(uint256 _proposalIdx, bytes32[] calldata _optionDescriptions) public {
+		addOptionsCore(proposals[_proposalIdx + 1], _optionDescriptions);
+	}
+
+	// common code for adding several options, used by proposeMulti and addOptions.
+	function addOptionsCore(Proposal storage proposal, bytes32[] calldata _optionDescriptions) private {
+		uint256 i;
+
+		mustFitOptions(proposal, _optionDescriptions.length);
+		for (i = 0; i < _optionDescriptions.length; i++) {
+			proposal.options.push(_optionDescriptions[i]);
+			proposal.optionVotes.push(0);
+		}
+	}
+
+	// reverts if adding _count options would take the proposal past OPTIONS_MAX options.
+	function mustFitOptions(Proposal storage proposal, uint256 _count) private view {
+		require(proposal.options.length + _count <= OPTIONS_MAX, "ERR_OPTIONS_FULL");
+	}
+
 	// get proposal by index
 	function getProposal(uint256 _proposalIdx) public view returns(Proposal memory) {
 		return proposals[_proposalIdx + 1];
 	}
 
+	// get a page of proposals by index, starting at _start.
+	// returns fewer than _count proposals if the end of the index is reached.
+	function getProposals(uint256 _start, uint256 _count) public view returns(Proposal[] memory) {
+		Proposal[] memory l_proposals;
+		uint256 l_total;
+		uint256 i;
+
+		l_total = proposals.length - 1;
+		if (_start >= l_total) {
+			return l_proposals;
+		}
+		if (_count > l_total - _start) {
+			_count = l_total - _start;
+		}
+		l_proposals = new Proposal[](_count);
+		for (i = 0; i < _count; i++) {
+			l_proposals[i] = proposals[_start + i + 1];
+		}
+		return l_proposals;
+	}
+
+	// number of proposals added
+	function proposalCount() public view returns(uint256) {
+		return proposals.length - 1;
+	}
+
 	// get currently active proposal
 	function getCurrentProposal() public view returns(Proposal memory) {
 		Proposal storage proposal;
@@ -165,6 +234,53 @@ contract ERC20Vote {
 		return proposal.options.length;
 	}
 
+	// get a page of option descriptions of a proposal, starting at option index _start.
+	// returns fewer than _count descriptions if the end of the options is reached.
+	function getOptions(uint256 _proposalIdx, uint256 _start, uint256 _count) public view returns (bytes32[] memory) {
+		Proposal storage proposal;
+		bytes32[] memory l_options;
+		uint256 l_total;
+		uint256 i;
+
+		proposal = proposals[_proposalIdx + 1];
+		l_total = proposal.options.length;
+		if (_start >= l_total) {
+			return l_options;
+		}
+		if (_count > l_total - _start) {
+			_count = l_total - _start;
+		}
+		l_options = new bytes32[](_count);
+		for (i = 0; i < _count; i++) {
+			l_options[i] = proposal.options[_start + i];
+		}
+		return l_options;
+	}
+
+	// get a page of option vote counts of a proposal, starting at option index _start.
+	// returns fewer than _count vote counts if the end of the options is reached.
+	// unlike voteCount, a proposal without options has no vote counts; use the proposal total instead.
+	function voteCounts(uint256 _proposalIdx, uint256 _start, uint256 _count) public view returns (uint256[] memory) {
+		Proposal storage proposal;
+		uint256[] memory l_votes;
+		uint256 l_total;
+		uint256 i;
+
+		proposal = proposals[_proposalIdx + 1];
+		l_total = proposal.optionVotes.length;
+		if (_start >= l_total) {
+			return l_votes;
+		}
+		if (_count > l_total - _start) {
+			_count = l_total - _start;
+		}
+		l_votes = new uint256[](_count);
+		for (i = 0; i < _count; i++) {
+			l_votes[i] = proposal.optionVotes[_start + i];
+		}
+		return l_votes;
+	}
+
 	// total number of votes (across all options)
 	function voteCount(uint256 _proposalIdx, uint256 _optionIdx) public view returns(uint256) {
 		Proposal storage proposal;
@@ -196,38 +312,116 @@ contract ERC20Vote {
 	// Votes may be divided on several options as long as balance is sufficient.
 	// If false is returned, proposal has been invalidated.
 	function voteOption(uint256 _optionIndex, uint256 _value) public returns (bool) {
-		Proposal storage proposal;
+		mustAccount(msg.sender, voterRegistry);
+		return voteOptionCore(proposals[currentProposal], _optionIndex, _value, false);
+	}
 
+	// Cast votes on an option using escrow from a finalized proposal, instead of transferring tokens.
+	// The escrow is rolled over to the current proposal first, if necessary.
+	// If false is returned, proposal has been invalidated.
+	function voteOptionRollover(uint256 _optionIndex, uint256 _value) public returns (bool) {
 		mustAccount(msg.sender, voterRegistry);
-		proposal = proposals[currentProposal];
+		rolloverCore();
+		return voteOptionCore(proposals[currentProposal], _optionIndex, _value, true);
+	}
+
+	// common code for option votes, after the voter has been checked against the registry.
+	function voteOptionCore(Proposal storage proposal, uint256 _optionIndex, uint256 _value, bool _rollover) private returns (bool) {
 		if (!voteable(proposal)) {
 			return false;
 		}
 		if (proposal.options.length > 0) {
 			require(_optionIndex < proposal.options.length, "ERR_OPTION_INVALID");
 		}
-		voteCore(proposal, _value);
+		voteCore(proposal, _value, _rollover);
 		if (proposal.options.length > 0) {
 			proposal.optionVotes[_optionIndex] += _value;
+			updateLead(proposal, _optionIndex, _value);
+		}
+		return true;
+	}
+
+	// Cast votes on several options in one call, with a single token transfer for the sum of the values.
+	// Has the same effect as calling voteOption() for each pair of option index and value, in order.
+	// If false is returned, proposal has been invalidated.
+	function voteOptions(uint256[] calldata _optionIndex, uint256[] calldata _value) public returns (bool) {
+		Proposal storage proposal;
+		uint256 l_optionCount;
+		uint256 l_total;
+		uint256 i;
+
+		require(_optionIndex.length == _value.length, "ERR_LENGTH");
+		mustAccount(msg.sender, voterRegistry);
+		proposal = proposals[currentProposal];
+		if (!voteable(proposal)) {
+			return false;
+		}
+		l_optionCount = proposal.options.length;
+		require(l_optionCount > 0, "ERR_NO_OPTIONS");
+		for (i = 0; i < _optionIndex.length; i++) {
+			require(_optionIndex[i] < l_optionCount, "ERR_OPTION_INVALID");
+			l_total += _value[i];
+		}
+		voteCore(proposal, l_total, false);
+		for (i = 0; i < _optionIndex.length; i++) {
+			proposal.optionVotes[_optionIndex[i]] += _value[i];
+			updateLead(proposal, _optionIndex[i], _value[i]);
 		}
 		return true;
 	}
 
+	// keep the leading option and tie state up to date after votes on an option have increased.
+	// only the voted option can overtake or tie the current lead, so no iteration is needed.
+	// a vote of zero changes no count, and so leaves the lead and tie state as they are.
+	function updateLead(Proposal storage proposal, uint256 _optionIndex, uint256 _value) private {
+		uint256 l_lead;
+		uint256 l_score;
+		uint256 l_hi;
+
+		if (_value == 0) {
+			return;
+		}
+		l_lead = proposal.lead;
+		if (_optionIndex == l_lead) {
+			// the lead increased, so any tie with it is broken.
+			if (proposal.state & STATE_TIED > 0) {
+				proposal.state &= ~STATE_TIED;
+			}
+			return;
+		}
+		l_score = proposal.optionVotes[_optionIndex];
+		l_hi = proposal.optionVotes[l_lead];
+		if (l_score > l_hi) {
+			proposal.lead = uint16(_optionIndex);
+			proposal.state &= ~STATE_TIED;
+		} else if (l_score > 0 && l_score == l_hi) {
+			proposal.state |= STATE_TIED;
+		}
+	}
+
 	// common code for all vote methods
 	// executes the token transfer, updates total and sets immediate flag if target vote has been met
-	function voteCore(Proposal storage proposal, uint256 _value) private {
+	// on rollover, the value is taken from the rolled over escrow instead of the token transfer.
+	function voteCore(Proposal storage proposal, uint256 _value, bool _rollover) private {
 		bool r;
 		bytes memory v;
-
-		(r, v) = token.call(abi.encodeWithSignature('transferFrom(address,address,uint256)', msg.sender, this, _value));
-		require(r, "ERR_TOKEN");
-		r = abi.decode(v, (bool));
-		require(r, "ERR_TRANSFER");
+		uint256 l_total;
+
+		if (_rollover) {
+			require(rolloverBalance[msg.sender] >= _value, "ERR_ROLLOVER_BALANCE");
+			rolloverBalance[msg.sender] -= _value;
+		} else {
+			(r, v) = token.call(abi.encodeWithSignature('transferFrom(address,address,uint256)', msg.sender, this, _value));
+			require(r, "ERR_TOKEN");
+			r = abi.decode(v, (bool));
+			require(r, "ERR_TRANSFER");
+			balanceOf[msg.sender] += _value;
+		}
 
 		proposalIdxLock[msg.sender] = currentProposal;
-		balanceOf[msg.sender] += _value;
-		proposal.total += _value;
-		if (haveQuotaFor(proposal, proposal.total)) {
+		l_total = proposal.total + _value;
+		proposal.total = toUint128(l_total);
+		if (haveQuotaFor(proposal, l_total)) {
 			if (haveQuotaFor(proposal, proposal.cancelVotes)) {
 				proposal.state |= STATE_CANCELLED | STATE_IMMEDIATE;
 			}
@@ -247,7 +441,72 @@ contract ERC20Vote {
 		mustAccount(msg.sender, voterRegistry);
 		proposal = proposals[currentProposal];
 		require(proposal.options.length < 2); // allow both no options and single option.
-		return voteOption(0, _value);
+		return voteOptionCore(proposal, 0, _value, false);
+	}
+
+	// Cast vote for a proposal without options using escrow from a finalized proposal, instead of transferring tokens.
+	// If false is returned, proposal has been invalidated.
+	function voteRollover(uint256 _value) public returns (bool) {
+		Proposal storage proposal;
+
+		mustAccount(msg.sender, voterRegistry);
+		rolloverCore();
+		proposal = proposals[currentProposal];
+		require(proposal.options.length < 2); // allow both no options and single option.
+		return voteOptionCore(proposal, 0, _value, true);
+	}
+
+	// Recommit escrow from a finalized proposal to the current proposal, without withdrawing and transferring the tokens again.
+	// The escrow can then be used with the rollover vote methods, and can only be withdrawn after the current proposal has been finalized.
+	// Returns the escrow available for rollover votes.
+	function rollover() public returns (uint256) {
+		mustAccount(msg.sender, voterRegistry);
+		return rolloverCore();
+	}
+
+	function rolloverCore() private returns (uint256) {
+		uint256 l_value;
+
+		if (proposalIdxLock[msg.sender] == currentProposal) {
+			return rolloverBalance[msg.sender];
+		}
+		// a lock on any earlier proposal means that proposal has been finalized.
+		require(currentProposal < proposals.length, "ERR_NO_CURRENT_PROPOSAL");
+		l_value = balanceOf[msg.sender];
+		require(l_value > 0, "ERR_NO_ESCROW");
+		proposalIdxLock[msg.sender] = currentProposal;
+		rolloverBalance[msg.sender] = l_value;
+		return l_value;
+	}
+
+	// Cast vote for a proposal without options, authorizing the token transfer with an EIP-2612 permit signed by the voter.
+	// This replaces the approve transaction otherwise needed before the vote.
+	function voteWithPermit(uint256 _value, uint256 _deadline, uint8 _v, bytes32 _r, bytes32 _s) public returns (bool) {
+		permit(_value, _deadline, _v, _r, _s);
+		return vote(_value);
+	}
+
+	// Cast votes on an option, authorizing the token transfer with an EIP-2612 permit signed by the voter.
+	function voteOptionWithPermit(uint256 _optionIndex, uint256 _value, uint256 _deadline, uint8 _v, bytes32 _r, bytes32 _s) public returns (bool) {
+		permit(_value, _deadline, _v, _r, _s);
+		return voteOption(_optionIndex, _value);
+	}
+
+	// submit an EIP-2612 permit for the vote value from the sender to this contract.
+	// a failed permit may already have been submitted by someone else, so the allowance is checked instead. if it does not cover the vote value, the vote reverts here, rather than in the token transfer.
+	function permit(uint256 _value, uint256 _deadline, uint8 _v, bytes32 _r, bytes32 _s) private {
+		bool r;
+		bytes memory v;
+		uint256 l_allowance;
+
+		(r, ) = token.call(abi.encodeWithSignature('permit(address,address,uint256,uint256,uint8,bytes32,bytes32)', msg.sender, this, _value, _deadline, _v, _r, _s));
+		if (r) {
+			return;
+		}
+		(r, v) = token.call(abi.encodeWithSignature('allowance(address,address)', msg.sender, this));
+		require(r, "ERR_TOKEN");
+		l_allowance = abi.decode(v, (uint256));
+		require(l_allowance >= _value, "ERR_PERMIT");
 	}
 
 	// cast vote to cancel proposal
@@ -260,8 +519,8 @@ contract ERC20Vote {
 		if (!voteable(proposal)) {
 			return false;
 		}
-		proposal.cancelVotes += _value;
-		voteCore(proposal, _value);
+		proposal.cancelVotes = toUint128(proposal.cancelVotes + _value);
+		voteCore(proposal, _value, false);
 
 		return true;
 	}
@@ -284,15 +543,11 @@ contract ERC20Vote {
 
 
 	// Optionally scan the results for a proposal to make result visible.
-	// Returns false as long as there are more options to scan.
-	function scan(uint256 _proposalIndex, uint8 _count) public returns (bool) {
+	// The leading option and tie state are maintained as votes are cast, so this completes in a single call.
+	// Deprecated: the second parameter was used to limit the number of options scanned per call. It is ignored, and only kept so that the method selector and existing callers stay the same.
+	// Returns false if the proposal has already been scanned.
+	function scan(uint256 _proposalIndex, uint8) public returns (bool) {
 		Proposal storage proposal;
-		uint8 i;
-		uint16 lead;
-		uint256 hi;
-		uint256 score;
-		uint8 c;
-		uint8 state;
 
 		proposal = proposals[_proposalIndex + 1];
 		if (proposal.state & STATE_IMMEDIATE == 0) {
@@ -301,43 +556,14 @@ contract ERC20Vote {
 		if (proposal.state & STATE_SCANNED > 0) {
 			return false;
 		}
-
-		if (proposal.options.length == 0) {
-			proposal.state |= STATE_SCANNED;
-			return true;
-		}
-
-		c = proposal.scanCursor;
-		if (c + _count > proposal.options.length) {
-			_count = uint8(proposal.options.length) - c;
-		}
-
-		_count += c;
-		state = proposal.state;
-		for (i = c; i < _count; i++) {
-			score = proposal.optionVotes[i];
-			if (score > 0 && score == hi) {
-				state |= STATE_TIED;
-			} else if (score > hi) {
-				hi = score;
-				lead = i;
-				state &= ~STATE_TIED;
-			}
-			c += 1;
-		}
-		proposal.scanCursor = c;
-		proposal.state = state;
-		if (proposal.scanCursor >= proposal.options.length) {
-			proposal.state |= STATE_SCANNED;
-		}
-		return proposal.state & STATE_SCANNED > 0;
+		proposal.state |= STATE_SCANNED;
+		return true;
 	}
 
 	// finalize the results after scanning for winning result.
 	// will record and return whether voting participation was insufficient.
 	function finalize() public returns (bool) {
 		Proposal storage proposal;
-		bool r;
 
 		proposal = proposals[currentProposal];
 		require(proposal.state & STATE_FINAL == 0, "ERR_ALREADY_STATE_FINAL");
@@ -347,6 +573,46 @@ contract ERC20Vote {
 		if (block.number > proposal.blockDeadline) {
 			require(proposal.state & STATE_CANCELLED == 0, "ERR_PREMATURE");
 		}
+		return finalizeCore(proposal);
+	}
+
+	// finalize up to _max proposals in sequence, e.g. to clear a queue of proposals that expired without votes.
+	// stops at the first proposal that is still open for votes, or that finalize() would reject.
+	// the loop is bounded by _max only, so that gas estimation for a given _max is exact. Use a gas estimate to choose _max.
+	// returns the number of proposals processed.
+	function finalizeMany(uint256 _max) public returns (uint256) {
+		Proposal storage proposal;
+		uint256 i;
+
+		for (i = 0; i < _max; i++) {
+			if (currentProposal >= proposals.length) {
+				break;
+			}
+			proposal = proposals[currentProposal];
+			if (proposal.state & STATE_FINAL > 0) {
+				break;
+			}
+			if (proposal.state & STATE_IMMEDIATE == 0) {
+				if (block.number <= proposal.blockDeadline) {
+					break;
+				}
+			} else if (block.number > proposal.blockDeadline && proposal.state & STATE_CANCELLED > 0) {
+				break;
+			}
+			// a supply change cancelled the proposal, completed it and moved on to the next.
+			if (checkSupply(proposal) == 0) {
+				continue;
+			}
+			finalizeCore(proposal);
+		}
+		return i;
+	}
+
+	// common code for finalization, after the proposal has been checked.
+	// records insufficient participation, executes internals proposals, and moves on to the next proposal.
+	function finalizeCore(Proposal storage proposal) private returns (bool) {
+		bool r;
+
 		if (!haveQuotaFor(proposal, proposal.total)) {
 			proposal.state |= STATE_INSUFFICIENT;
 			r = true;
@@ -369,6 +635,17 @@ contract ERC20Vote {
 		}
 	}
 
+	// narrowing conversions for packed proposal fields, reverting instead of truncating.
+	function toUint128(uint256 _value) private pure returns (uint128) {
+		require(_value <= type(uint128).max, "ERR_OVERFLOW");
+		return uint128(_value);
+	}
+
+	function toUint64(uint256 _value) private pure returns (uint64) {
+		require(_value <= type(uint64).max, "ERR_OVERFLOW");
+		return uint64(_value);
+	}
+
 	// check if target vote count has been met
 	function haveQuotaFor(Proposal storage proposal, uint256 _value) private view returns (bool) {
 		uint256 l_total_m;
@@ -376,7 +653,9 @@ contract ERC20Vote {
 		return l_total_m / proposal.supply >= proposal.targetVotePpm;
 	}
 
-	// should be checked for proposal creation, each recorded vote and finalization.	
+	// should be checked for proposal creation, each recorded vote and finalization.
+	// the token supply can change in any earlier transaction, even in the same block, so the check is never skipped.
+	// only ever called with the current proposal, or with a new proposal whose supply is not yet set.
 	function checkSupply(Proposal storage proposal) private returns (uint256) {
 		bool r;
 		bytes memory v;
@@ -388,13 +667,14 @@ contract ERC20Vote {
 
 		require(l_supply > 0, "ERR_ZERO_SUPPLY");
 		if (proposal.supply == 0) {
-			proposal.supply = l_supply;
+			proposal.supply = toUint128(l_supply);
 		} else if (l_supply != proposal.supply) {
 			proposal.state |= STATE_SUPPLYCHANGE;
 			proposal.state |= STATE_FINAL;
 			if (protectSupply) {
-				currentProposal += 1;
 				proposal.state |= STATE_CANCELLED;
+				emit ProposalCompleted(currentProposal - 1, true, false, proposal.total);
+				currentProposal += 1;
 				return 0;
 			}
 		}
@@ -424,6 +704,7 @@ contract ERC20Vote {
 		}
 
 		balanceOf[msg.sender] = 0;
+		rolloverBalance[msg.sender] = 0;
 		proposalIdxLock[msg.sender] = 0;
 		(r, v) = token.call(abi.encodeWithSignature('transfer(address,uint256)', msg.sender, l_value));
 		require(r, "ERR_TOKEN");